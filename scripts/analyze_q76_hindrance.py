@@ -1,16 +1,19 @@
+import async_queries
 import pandas as pd
-import sqlite3
+import profiling
+import questions
 import sys
 import re
 
 sys.stdout.reconfigure(encoding='utf-8')
 
 # Connect to database
-conn = sqlite3.connect('PMIK_2025.db')
+conn = profiling.connect(readonly=True)
 
 print("=" * 80)
 print("Q76 문항 분석: 업무 몰입 저해 요인")
 print("=" * 80)
+profiling.step("Q76 문항 분석: 업무 몰입 저해 요인")
 
 # Get Q76 question text
 query_question = """
@@ -24,23 +27,18 @@ question_text = pd.read_sql_query(query_question, conn).iloc[0]['문항']
 print(f"\n[문항]")
 print(f"{question_text}")
 
-# Get all Q76 options
-query_options = """
-SELECT 비고 as option_number, "선택(보기)" as option_text
-FROM pmik_eos
-WHERE "No." = 76.0
-ORDER BY CAST(비고 AS INTEGER)
-"""
-df_options = pd.read_sql_query(query_options, conn)
+# Q76 options (question bank: O(1) lookups by option id)
+bank = questions.bank(conn)
 
 print(f"\n[선택지] (12개 중 3개 선택)")
-for _, row in df_options.iterrows():
-    print(f"  {row['option_number']:2s}. {row['option_text']}")
+for number, text in bank.option_list(76).items():
+    print(f"  {str(number):2s}. {text}")
 
 # Get response statistics
 print("\n" + "=" * 80)
 print("전체 응답 현황")
 print("=" * 80)
+profiling.step("전체 응답 현황")
 
 query_response_count = """
 SELECT
@@ -64,6 +62,7 @@ print(f"  미응답: {no_resp}명 ({no_resp/total_resp*100:.1f}%)")
 print("\n" + "=" * 80)
 print("선택지별 빈도 분석")
 print("=" * 80)
+profiling.step("선택지별 빈도 분석")
 
 query_frequency = """
 SELECT
@@ -101,6 +100,7 @@ for idx, row in df_frequency.iterrows():
 print("\n" + "=" * 80)
 print("Top 5 저해 요인")
 print("=" * 80)
+profiling.step("Top 5 저해 요인")
 
 top5 = df_frequency.head(5)
 for idx, row in top5.iterrows():
@@ -110,6 +110,7 @@ for idx, row in top5.iterrows():
 print("\n" + "=" * 80)
 print("Bottom 5 저해 요인")
 print("=" * 80)
+profiling.step("Bottom 5 저해 요인")
 
 bottom5 = df_frequency.tail(5).sort_values('selection_count')
 for idx, row in bottom5.iterrows():
@@ -156,6 +157,7 @@ def categorize_tenure(years):
 print("\n" + "=" * 80)
 print("근속기간별 Top 3 저해 요인")
 print("=" * 80)
+profiling.step("근속기간별 Top 3 저해 요인")
 
 # Get responses with tenure
 query_tenure = """
@@ -192,17 +194,24 @@ for tenure_cat in tenure_order:
 
     print(f"\n[{tenure_cat}] ({len(tenure_data)}명)")
     for idx, (opt_num, count) in enumerate(sorted_options, 1):
-        opt_text = df_options[df_options['option_number'] == opt_num]['option_text'].values
-        if len(opt_text) > 0:
-            print(f"  {idx}. {opt_text[0]} ({count}명)")
+        opt_text = bank.option_text(76, opt_num)
+        if opt_text:
+            print(f"  {idx}. {opt_text} ({count}명)")
 
 # Analysis by department
 print("\n" + "=" * 80)
 print("사업부별 Top 3 저해 요인")
 print("=" * 80)
+profiling.step("사업부별 Top 3 저해 요인")
+
+# The per-business-unit and per-rank Top 3 queries are independent: run them
+# together on pooled read-only connections and print the results in order
+BIZ_UNITS = ['A&R', 'O&F', 'Sales']
+RANKS = ['E1', 'E2', 'S2', 'S3', 'B1', 'B2', 'B3']
+
 
-for biz_unit in ['A&R', 'O&F', 'Sales']:
-    query_biz = f"""
+def top3_query(column):
+    return f"""
     SELECT
         e.비고 as option_number,
         e."선택(보기)" as option_text,
@@ -210,51 +219,44 @@ for biz_unit in ['A&R', 'O&F', 'Sales']:
     FROM pmik_raw_data r, pmik_eos e
     WHERE r.completed = 1
         AND r.r076 IS NOT NULL
-        AND r.etc1 = '{biz_unit}'
+        AND r.{column} = ?
         AND e."No." = 76.0
         AND (',' || REPLACE(r.r076, ' ', ',') || ',') LIKE ('%,' || e.비고 || ',%')
     GROUP BY e.비고, e."선택(보기)"
     ORDER BY selection_count DESC
     LIMIT 3
     """
-    df_biz = pd.read_sql_query(query_biz, conn)
 
+
+top3 = async_queries.run_queries({
+    **{('etc1', biz_unit): (top3_query('etc1'), (biz_unit,)) for biz_unit in BIZ_UNITS},
+    **{('rank', rank): (top3_query('rank'), (rank,)) for rank in RANKS},
+})
+
+for biz_unit in BIZ_UNITS:
     print(f"\n[{biz_unit}]")
-    for idx, row in df_biz.iterrows():
+    for idx, row in enumerate(top3[('etc1', biz_unit)]):
         print(f"  {idx+1}. {row['option_text']} ({int(row['selection_count'])}명)")
 
 # Analysis by rank
 print("\n" + "=" * 80)
 print("직급별 Top 3 저해 요인")
 print("=" * 80)
+profiling.step("직급별 Top 3 저해 요인")
 
-for rank in ['E1', 'E2', 'S2', 'S3', 'B1', 'B2', 'B3']:
-    query_rank = f"""
-    SELECT
-        e.비고 as option_number,
-        e."선택(보기)" as option_text,
-        COUNT(*) as selection_count
-    FROM pmik_raw_data r, pmik_eos e
-    WHERE r.completed = 1
-        AND r.r076 IS NOT NULL
-        AND r.rank = '{rank}'
-        AND e."No." = 76.0
-        AND (',' || REPLACE(r.r076, ' ', ',') || ',') LIKE ('%,' || e.비고 || ',%')
-    GROUP BY e.비고, e."선택(보기)"
-    ORDER BY selection_count DESC
-    LIMIT 3
-    """
-    df_rank = pd.read_sql_query(query_rank, conn)
+for rank in RANKS:
+    rows = top3[('rank', rank)]
 
-    if len(df_rank) > 0:
+    if len(rows) > 0:
         print(f"\n[{rank}]")
-        for idx, row in df_rank.iterrows():
+        for idx, row in enumerate(rows):
             print(f"  {idx+1}. {row['option_text']} ({int(row['selection_count'])}명)")
 
 # Combination analysis
 print("\n" + "=" * 80)
 print("가장 많이 선택된 조합 (Top 10)")
 print("=" * 80)
+profiling.step("가장 많이 선택된 조합 (Top 10)")
 
 query_combinations = """
 SELECT
@@ -280,9 +282,9 @@ for idx, row in df_combinations.iterrows():
     option_numbers = combination.split()
     option_texts = []
     for num in option_numbers:
-        text = df_options[df_options['option_number'] == num]['option_text'].values
-        if len(text) > 0:
-            option_texts.append(text[0])
+        text = bank.option_text(76, num)
+        if text:
+            option_texts.append(text)
 
     options_display = ", ".join(option_texts)
 
@@ -292,6 +294,7 @@ for idx, row in df_combinations.iterrows():
 print("\n" + "=" * 80)
 print("주요 인사이트")
 print("=" * 80)
+profiling.step("주요 인사이트")
 
 top1 = df_frequency.iloc[0]
 top2 = df_frequency.iloc[1]
@@ -334,7 +337,7 @@ if len(new_emp_data) > 0:
         for opt in options:
             new_emp_counts[opt] = new_emp_counts.get(opt, 0) + 1
     top_new_emp = max(new_emp_counts.items(), key=lambda x: x[1])
-    opt_text = df_options[df_options['option_number'] == top_new_emp[0]]['option_text'].values[0]
+    opt_text = bank.option_text(76, top_new_emp[0])
     print(f"  • 신입(1년 미만) 최대 고민: {opt_text}")
 
 # Find most mentioned issue by senior employees (5-10 years)
@@ -346,7 +349,7 @@ if len(senior_emp_data) > 0:
         for opt in options:
             senior_emp_counts[opt] = senior_emp_counts.get(opt, 0) + 1
     top_senior_emp = max(senior_emp_counts.items(), key=lambda x: x[1])
-    opt_text = df_options[df_options['option_number'] == top_senior_emp[0]]['option_text'].values[0]
+    opt_text = bank.option_text(76, top_senior_emp[0])
     print(f"  • 고경력(5-10년) 최대 고민: {opt_text}")
 
 conn.close()
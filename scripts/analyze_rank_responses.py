@@ -1,15 +1,18 @@
 import pandas as pd
-import sqlite3
+import profiling
 import sys
 
+from respondent_index import RespondentIndex
+
 sys.stdout.reconfigure(encoding='utf-8')
 
 # Connect to database
-conn = sqlite3.connect('PMIK_2025.db')
+conn = profiling.connect(readonly=True)
 
 print("=" * 80)
 print("직급별 EOS 응답률 분석")
 print("=" * 80)
+profiling.step("직급별 EOS 응답률 분석")
 
 # Get response status by job title (rank)
 query = """
@@ -53,6 +56,7 @@ print(f"  미응답: {no_response_total}명 ({no_response_total/total*100:.1f}%)
 print("\n" + "=" * 80)
 print("직급별 응답률")
 print("=" * 80)
+profiling.step("직급별 응답률")
 
 # Define rank hierarchy
 rank_names = {
@@ -87,6 +91,7 @@ for _, row in df.iterrows():
 print("\n" + "=" * 80)
 print("직급별 상세 통계")
 print("=" * 80)
+profiling.step("직급별 상세 통계")
 
 print("\n{:<15} {:>8} {:>8} {:>8} {:>8} {:>10}".format(
     "직급", "대상", "완료", "미완료", "미응답", "완료율"
@@ -111,11 +116,14 @@ for _, row in df.iterrows():
 print("\n" + "=" * 80)
 print("직급 그룹별 분석")
 print("=" * 80)
+profiling.step("직급 그룹별 분석")
 
-# Group by rank level
-executive = df[df['job_title'].str.startswith('E')]
-senior = df[df['job_title'].str.startswith('S')]
-basic = df[df['job_title'].str.startswith('B')]
+# Group by rank level (first letter of the job title -> row positions)
+df['rank_group'] = df['job_title'].str[0]
+groups = RespondentIndex.from_frame(df, ['rank_group'])
+executive = df.iloc[groups.positions(rank_group='E')]
+senior = df.iloc[groups.positions(rank_group='S')]
+basic = df.iloc[groups.positions(rank_group='B')]
 
 print("\n[임원급 (E)]")
 if len(executive) > 0:
@@ -154,6 +162,7 @@ else:
 print("\n" + "=" * 80)
 print("미완료/미응답자 직급별 분포")
 print("=" * 80)
+profiling.step("미완료/미응답자 직급별 분포")
 
 query_non_complete = """
 SELECT
@@ -188,8 +197,10 @@ df_non_complete = pd.read_sql_query(query_non_complete, conn)
 if len(df_non_complete) > 0:
     print(f"\n총 {len(df_non_complete)}명:")
 
+    # Rank -> sorted row positions, one lookup per rank instead of a frame scan
+    non_complete_index = RespondentIndex.from_frame(df_non_complete, ['job_title'])
     for rank in ['E1', 'E2', 'S3', 'S2', 'B3', 'B2', 'B1']:
-        rank_data = df_non_complete[df_non_complete['job_title'] == rank]
+        rank_data = df_non_complete.iloc[non_complete_index.positions(job_title=rank)]
         if len(rank_data) > 0:
             print(f"\n[{rank_names.get(rank, rank)}] ({len(rank_data)}명)")
             for _, row in rank_data.iterrows():
@@ -204,6 +215,7 @@ else:
 print("\n" + "=" * 80)
 print("인사이트")
 print("=" * 80)
+profiling.step("인사이트")
 
 # Find highest and lowest completion rates
 highest = df.loc[df['completion_rate'].idxmax()]
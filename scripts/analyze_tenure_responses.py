@@ -1,16 +1,19 @@
 import pandas as pd
-import sqlite3
+import profiling
 import sys
 import re
 
+from respondent_index import RespondentIndex
+
 sys.stdout.reconfigure(encoding='utf-8')
 
 # Connect to database
-conn = sqlite3.connect('PMIK_2025.db')
+conn = profiling.connect(readonly=True)
 
 print("=" * 80)
 print("근속기간별 EOS 응답률 분석")
 print("=" * 80)
+profiling.step("근속기간별 EOS 응답률 분석")
 
 # Get member data with response status
 query = """
@@ -73,12 +76,17 @@ def categorize_tenure(years):
 
 df['tenure_category'] = df['tenure_years'].apply(categorize_tenure)
 
+# Category/status -> sorted row positions: the counts and lists below are index
+# lookups instead of a boolean scan of the whole frame per category
+index = RespondentIndex.from_frame(df, ['tenure_category', 'response_status'])
+not_completed_status = ['미완료', '미응답']
+
 # Overall statistics
 print("\n[전체 현황]")
 total = len(df)
-completed = len(df[df['response_status'] == '완료'])
-incomplete = len(df[df['response_status'] == '미완료'])
-no_response = len(df[df['response_status'] == '미응답'])
+completed = index.count(response_status='완료')
+incomplete = index.count(response_status='미완료')
+no_response = index.count(response_status='미응답')
 
 print(f"총 대상자: {total}명")
 print(f"  완료: {completed}명 ({completed/total*100:.1f}%)")
@@ -89,19 +97,21 @@ print(f"  미응답: {no_response}명 ({no_response/total*100:.1f}%)")
 print("\n" + "=" * 80)
 print("근속기간 구간별 응답률")
 print("=" * 80)
+profiling.step("근속기간 구간별 응답률")
 
 tenure_order = ['1년 미만', '1-3년', '3-5년', '5-10년', '10년 이상']
 
 for category in tenure_order:
-    category_data = df[df['tenure_category'] == category]
+    positions = index.positions(tenure_category=category)
 
-    if len(category_data) == 0:
+    if len(positions) == 0:
         continue
 
-    total_cat = len(category_data)
-    completed_cat = len(category_data[category_data['response_status'] == '완료'])
-    incomplete_cat = len(category_data[category_data['response_status'] == '미완료'])
-    no_response_cat = len(category_data[category_data['response_status'] == '미응답'])
+    category_data = df.iloc[positions]
+    total_cat = len(positions)
+    completed_cat = index.count(tenure_category=category, response_status='완료')
+    incomplete_cat = index.count(tenure_category=category, response_status='미완료')
+    no_response_cat = index.count(tenure_category=category, response_status='미응답')
 
     completion_rate = (completed_cat / total_cat * 100) if total_cat > 0 else 0
 
@@ -121,6 +131,7 @@ for category in tenure_order:
 print("\n" + "=" * 80)
 print("상세 통계")
 print("=" * 80)
+profiling.step("상세 통계")
 
 # Group by tenure category and response status
 summary = df.groupby(['tenure_category', 'response_status']).size().reset_index(name='count')
@@ -135,10 +146,9 @@ print(pivot.to_string())
 # Calculate completion rate by tenure category
 print("\n\n근속기간별 완료율:")
 for category in tenure_order:
-    category_data = df[df['tenure_category'] == category]
-    if len(category_data) > 0:
-        total_cat = len(category_data)
-        completed_cat = len(category_data[category_data['response_status'] == '완료'])
+    total_cat = index.count(tenure_category=category)
+    if total_cat > 0:
+        completed_cat = index.count(tenure_category=category, response_status='완료')
         rate = (completed_cat / total_cat * 100)
         print(f"  {category:12s}: {rate:5.1f}% ({completed_cat}/{total_cat}명)")
 
@@ -146,9 +156,10 @@ for category in tenure_order:
 print("\n" + "=" * 80)
 print("상관관계 분석")
 print("=" * 80)
+profiling.step("상관관계 분석")
 
-completed_df = df[df['response_status'] == '완료']
-not_completed_df = df[df['response_status'].isin(['미완료', '미응답'])]
+completed_df = df.iloc[index.positions(response_status='완료')]
+not_completed_df = df.iloc[index.positions(response_status=not_completed_status)]
 
 if len(completed_df) > 0 and len(not_completed_df) > 0:
     avg_tenure_completed = completed_df['tenure_years'].mean()
@@ -168,8 +179,9 @@ if len(completed_df) > 0 and len(not_completed_df) > 0:
 print("\n" + "=" * 80)
 print("미완료/미응답자 상세")
 print("=" * 80)
+profiling.step("미완료/미응답자 상세")
 
-not_completed_detail = df[df['response_status'].isin(['미완료', '미응답'])].sort_values('tenure_years', ascending=False)
+not_completed_detail = not_completed_df.sort_values('tenure_years', ascending=False)
 
 print(f"\n총 {len(not_completed_detail)}명:")
 for _, row in not_completed_detail.iterrows():
@@ -0,0 +1,61 @@
+import sys
+
+from waves import WaveStore
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+store = WaveStore()
+
+print("=" * 80)
+print("연도별 EOS 추이 분석")
+print("=" * 80)
+
+print(f"\n[웨이브]")
+for year in store.years:
+    print(f"  - {year}: {store[year].path.name}")
+
+if len(store.years) < 2:
+    print("\n비교할 웨이브가 2개 이상 필요합니다. (PMIK_<연도>.db 파일 추가)")
+    store.close()
+    sys.exit(0)
+
+df_trend = store.trend()
+df_changes = df_trend.dropna(subset=['delta'])
+
+latest = store.years[-1]
+previous = store.years[-2]
+
+# Company-level changes
+print("\n" + "=" * 80)
+print(f"전체 문항 변화 ({previous} → {latest})")
+print("=" * 80)
+
+total = df_changes[(df_changes['segment'] == '전체') & (df_changes['year'] == latest)]
+total = total.reindex(total['delta'].abs().sort_values(ascending=False).index)
+
+print(f"\n{'문항':<10} {previous:>10} {latest:>10} {'변화':>10}")
+print("-" * 80)
+for _, row in total.head(15).iterrows():
+    print(f"{row['item']:<10} {row['prev_mean']:>10.2f} {row['mean']:>10.2f} {row['delta']:>+10.2f}")
+
+# Largest segment movements
+print("\n" + "=" * 80)
+print("세그먼트별 최대 변화 (Top 10)")
+print("=" * 80)
+
+segments = df_changes[(df_changes['segment'] != '전체') & (df_changes['year'] == latest)]
+segments = segments.reindex(segments['delta'].abs().sort_values(ascending=False).index)
+
+for _, row in segments.head(10).iterrows():
+    print(f"  [{row['segment']}={row['value']}] {row['item']}: "
+          f"{row['prev_mean']:.2f} → {row['mean']:.2f} ({row['delta']:+.2f}, n={int(row['n'])})")
+
+# Respondents linked across waves
+panel = store.panel()
+print(f"\n📊 연속 응답자 (corporate_id 기준): {len(panel)}명")
+
+store.close()
+
+print("\n" + "=" * 80)
+print("✓ 분석 완료")
+print("=" * 80)
@@ -0,0 +1,164 @@
+# Concurrent execution of independent read queries. Each query runs in a worker
+# thread on that thread's read-only connection (connections.ConnectionPool);
+# sqlite3 releases the GIL while SQLite steps a statement, so queries on
+# different connections overlap. Report sections await a batch with gather().
+# A cancelled await stops its own statement (or skips it if it is still queued)
+# without touching other statements on the same pooled connection.
+import argparse
+import asyncio
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import connections
+from queries import MULTI_SELECT, OPTION_LIST_SQL, top_combinations_sql
+from sql_backend import SEGMENT_SQL, option_frequency_sql, segment_top_n_sql
+
+DEFAULT_WORKERS = 4
+
+# SQLite VM instructions between cancellation checks of a running statement
+PROGRESS_STEPS = 1000
+
+
+def response_count_sql(question):
+    """완료 응답 수 / 해당 문항 응답 수"""
+    column = MULTI_SELECT[question]
+    return f"""
+    SELECT COUNT(*) AS completed, COUNT(NULLIF(TRIM({column}), '')) AS answered
+    FROM pmik_raw_data
+    WHERE completed = 1
+    """
+
+
+class QueryRunner:
+    """읽기 전용 연결 풀 + 스레드 풀로 쿼리를 동시에 실행 (async/동기 모두 지원)
+
+    연결마다 임시 테이블이 따로이므로 가중치(temp.pmik_weights) 쿼리는 지원하지 않음
+    """
+
+    def __init__(self, database=None, workers=DEFAULT_WORKERS, immutable=False):
+        self.pool = connections.ConnectionPool(database, immutable)
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix='pmik-query')
+
+    def _execute(self, sql, params, cancelled):
+        if cancelled.is_set():
+            # Cancelled while still queued
+            return None
+        conn = self.pool.get()
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        # The handler is installed only while this statement runs, so it can abort this
+        # statement and no other (conn.interrupt() would hit whatever the connection runs)
+        conn.set_progress_handler(cancelled.is_set, PROGRESS_STEPS)
+        try:
+            return cursor.execute(sql, params).fetchall()
+        finally:
+            conn.set_progress_handler(None, 0)
+            cursor.close()
+
+    async def fetch(self, sql, params=()):
+        """쿼리 하나를 워커 스레드에서 실행 -> sqlite3.Row 목록"""
+        cancelled = threading.Event()
+        future = asyncio.get_running_loop().run_in_executor(self._executor, self._execute, sql, params, cancelled)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # The worker thread cannot be cancelled, but its statement can
+            cancelled.set()
+            raise
+
+    async def gather(self, queries):
+        """{이름: (sql, params)} 를 동시에 실행 -> {이름: 행 목록}"""
+        names = list(queries)
+        results = await asyncio.gather(*(self.fetch(*queries[name]) for name in names))
+        return dict(zip(names, results))
+
+    def run(self, queries):
+        """gather 의 동기 버전 (이벤트 루프 밖에서 호출)"""
+        return asyncio.run(self.gather(queries))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def question_queries(question, segments=tuple(SEGMENT_SQL), n=3, combinations=10):
+    """Q75/Q76 리포트 섹션의 독립 쿼리 묶음 {이름: (sql, params)}"""
+    queries = {
+        'options': (OPTION_LIST_SQL, (float(question),)),
+        'responses': (response_count_sql(question), ()),
+        'frequency': (option_frequency_sql(question), (float(question),)),
+        'combinations': (top_combinations_sql(question), (combinations,)),
+    }
+    for segment in segments:
+        queries[f'top_{segment}'] = (segment_top_n_sql(question, segment), (float(question), n))
+    return queries
+
+
+async def question_section(runner, question, segments=tuple(SEGMENT_SQL), n=3):
+    """Q75/Q76 섹션 결과 (쿼리를 한 번에 보내고 모두 기다림)"""
+    return await runner.gather(question_queries(question, segments, n))
+
+
+def run_queries(queries, database=None, workers=DEFAULT_WORKERS):
+    """독립 쿼리 묶음 {이름: (sql, params)} 을 동시에 실행 -> {이름: 행 목록} (분석 스크립트용)"""
+    with QueryRunner(database, workers) as runner:
+        return runner.run(queries)
+
+
+def run_sequential(database, queries):
+    """비교용: 같은 쿼리를 연결 하나에서 차례로 실행"""
+    conn = connections.connect(database, readonly=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        return {name: conn.execute(sql, params).fetchall() for name, (sql, params) in queries.items()}
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Q75/Q76 섹션 쿼리 동시 실행 (읽기 전용 연결 풀)')
+    parser.add_argument('--db', default=None, help='SQLite DB 경로 (기본: PMIK_DB 또는 PMIK_2025.db)')
+    parser.add_argument('--question', type=int, choices=list(MULTI_SELECT), default=76)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='쿼리 스레드 수')
+    parser.add_argument('--compare', action='store_true', help='순차 실행 시간도 측정')
+    args = parser.parse_args(argv)
+
+    queries = question_queries(args.question)
+    with QueryRunner(args.db, args.workers) as runner:
+        started = time.perf_counter()
+        results = asyncio.run(question_section(runner, args.question))
+        elapsed = time.perf_counter() - started
+
+    responses = results['responses'][0]
+    print(f"Q{args.question} 섹션 쿼리 {len(queries)}개 동시 실행 (스레드 {args.workers}개): {elapsed:.3f}초")
+    print(f"완료 응답 {responses['completed']}명 / 문항 응답 {responses['answered']}명\n")
+    for row in results['frequency'][:5]:
+        print(f"  [{row['option_number']:>2}] {row['option_text'] or '':35s} {row['selection_count']:>7}명 "
+              f"({row['percentage']:5.1f}%)")
+    for segment in SEGMENT_SQL:
+        leaders = [row for row in results[f'top_{segment}'] if row['rank'] == 1]
+        print(f"\n{segment}별 1위: " + ", ".join(f"{row['value']}={row['option_number']}" for row in leaders))
+
+    if args.compare:
+        started = time.perf_counter()
+        sequential = run_sequential(args.db, queries)
+        serial = time.perf_counter() - started
+        same = all([tuple(row) for row in sequential[name]] == [tuple(row) for row in results[name]]
+                   for name in queries)
+        print(f"\n순차 실행: {serial:.3f}초 (동시 실행 대비 {serial / elapsed:.2f}배, 결과 {'동일' if same else '다름'})")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,199 @@
+import argparse
+import multiprocessing
+import sqlite3
+import sys
+import time
+import traceback
+from pathlib import Path
+
+import pandas as pd
+
+import chunked
+from survey import load_responses, segment_item_table
+
+
+def _limit_memory(memory_mb):
+    """워커 프로세스 메모리 상한 설정 (POSIX 전용, 그 외 환경에서는 무시)"""
+    if not memory_mb:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def find_sources(source, company_column=None):
+    """(회사명, DB 경로, 회사 키) 목록 생성"""
+    source = Path(source)
+    if source.is_dir():
+        return [(path.stem, str(path), None) for path in sorted(source.glob('*.db'))]
+
+    # Single database holding several companies, split by a key column
+    conn = sqlite3.connect(source)
+    companies = [row[0] for row in conn.execute(
+        f'SELECT DISTINCT "{company_column}" FROM pmik_raw_data '
+        f'WHERE "{company_column}" IS NOT NULL ORDER BY 1'
+    )]
+    conn.close()
+    return [(str(company), str(source), company) for company in companies]
+
+
+def company_report(task):
+    """회사 하나에 대한 표준 리포트 계산 (워커 프로세스에서 실행)
+
+    실패하면 예외 대신 error 행을 돌려줌 (한 회사 때문에 나머지 회사 결과를 잃지 않도록)
+    """
+    started = time.perf_counter()
+    try:
+        return _company_report(task, started)
+    except Exception as exc:
+        # pandas wraps sqlite3 errors around the full SQL text; the cause is the readable part
+        cause = exc.__cause__ or exc
+        return {'company': task[0], 'error': f'{type(cause).__name__}: {cause}',
+                'traceback': traceback.format_exc(), 'elapsed_sec': time.perf_counter() - started}
+
+
+def _company_report(task, started):
+    name, path, company, company_column, out_dir, chunksize = task
+
+    conn = sqlite3.connect(path)
+    member_filter = ''
+    params = ()
+    if company is not None:
+        member_filter = f'AND m."{company_column}" = ?'
+        params = (company,)
+
+    completion = pd.read_sql_query(f"""
+    SELECT
+        COUNT(DISTINCT m."ID(new)") as total_members,
+        COUNT(DISTINCT CASE WHEN r.completed = 1 THEN r.corporate_id END) as completed
+    FROM pmik_member m
+    LEFT JOIN pmik_raw_data r ON m."ID(new)" = r.corporate_id
+    WHERE m."Biz Unit." IS NOT NULL {member_filter}
+    """, conn, params=params).iloc[0]
+
+    if chunksize:
+        table = chunked.aggregate(conn, chunksize=chunksize, company=company,
+                                  company_column=company_column or 'company').segment_item_table()
+    else:
+        table = segment_item_table(load_responses(conn, company=company, company_column=company_column or 'company'))
+    conn.close()
+
+    if out_dir:
+        table.to_csv(Path(out_dir) / f'{name}.csv', index=False, encoding='utf-8-sig')
+
+    total = int(completion['total_members'])
+    completed = int(completion['completed'])
+    row = {
+        'company': name,
+        'total_members': total,
+        'completed': completed,
+        'completion_rate': completed / total * 100 if total > 0 else 0.0,
+    }
+    overall = table[table['segment'] == '전체']
+    row.update(zip(overall['item'], overall['mean']))
+    row['elapsed_sec'] = time.perf_counter() - started
+    return row
+
+
+def benchmark_table(rows):
+    """회사별 지표 + 업계 기준(회사 평균) 대비 차이"""
+    df = pd.DataFrame(rows).set_index('company').sort_index()
+    metrics = [c for c in df.columns if c not in ('total_members', 'completed', 'elapsed_sec')]
+
+    norm = df[metrics].mean()
+    delta = df[metrics] - norm
+    delta.columns = [f'{c}_vs_norm' for c in metrics]
+
+    result = pd.concat([df, delta], axis=1)
+    result.loc['업계 평균', metrics] = norm
+    result[['total_members', 'completed']] = result[['total_members', 'completed']].astype('Int64')
+    return result
+
+
+def run_batch(source, out_dir, company_column=None, workers=None, memory_mb=None, chunksize=None):
+    """모든 회사에 대해 리포트를 병렬 실행하고 벤치마크 표 저장
+
+    실패한 회사는 업계 평균에서 빠지고 failures.csv 와 result.attrs['failures'] 에 기록
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    sources = find_sources(source, company_column)
+    tasks = [(name, path, company, company_column, str(out_dir), chunksize) for name, path, company in sources]
+
+    # maxtasksperchild recycles workers so one large company cannot grow memory for the rest
+    with multiprocessing.Pool(workers, initializer=_limit_memory, initargs=(memory_mb,),
+                              maxtasksperchild=20) as pool:
+        rows, failures = [], []
+        for idx, row in enumerate(pool.imap_unordered(company_report, tasks), 1):
+            if 'error' in row:
+                failures.append(row)
+                print(f"  [{idx}/{len(tasks)}] {row['company']}: 실패 - {row['error']}")
+                print(f"[{row['company']}] {row['traceback']}", file=sys.stderr)
+                continue
+            rows.append(row)
+            print(f"  [{idx}/{len(tasks)}] {row['company']}: "
+                  f"{row['completion_rate']:.1f}% ({row['elapsed_sec']:.2f}s)")
+
+    failures = pd.DataFrame(failures, columns=['company', 'error', 'elapsed_sec']).sort_values('company')
+    failures_path = out_dir / 'failures.csv'
+    if len(failures):
+        failures.to_csv(failures_path, index=False, encoding='utf-8-sig')
+    elif failures_path.exists():
+        # Left over from an earlier run
+        failures_path.unlink()
+    if not rows:
+        raise RuntimeError(f"모든 회사 처리 실패 ({len(failures)}개사): {failures_path}")
+
+    result = benchmark_table(rows)
+    result.to_csv(out_dir / 'benchmark.csv', encoding='utf-8-sig')
+    result.attrs['failures'] = failures
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='여러 회사 EOS 일괄 분석')
+    parser.add_argument('source', help='회사별 DB 디렉토리 또는 회사 키가 있는 단일 DB')
+    parser.add_argument('--company-column', default='company', help='단일 DB의 회사 키 열')
+    parser.add_argument('--out', default='batch_output', help='결과 디렉토리')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--memory-mb', type=int, default=None, help='워커당 메모리 상한(MB)')
+    parser.add_argument('--chunksize', type=int, default=None, help='응답을 N행씩 나눠 집계 (대용량 회사용)')
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("회사별 EOS 일괄 분석")
+    print("=" * 80)
+    print()
+
+    started = time.perf_counter()
+    try:
+        result = run_batch(args.source, args.out, args.company_column, args.workers, args.memory_mb,
+                           args.chunksize)
+    except RuntimeError as exc:
+        print(f"\n✗ {exc}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    companies = result.drop(index='업계 평균')
+    failures = result.attrs['failures']
+    print(f"\n총 {len(companies)}개사 처리: {elapsed:.1f}초")
+    print(f"업계 평균 완료율: {result.loc['업계 평균', 'completion_rate']:.1f}%")
+    print(f"결과: {Path(args.out) / 'benchmark.csv'}")
+    if len(failures):
+        print(f"\n⚠ 실패 {len(failures)}개사 (업계 평균에서 제외): {Path(args.out) / 'failures.csv'}")
+        for company, error in zip(failures['company'], failures['error']):
+            print(f"  - {company}: {error}")
+
+    print("\n" + "=" * 80)
+    print("✓ 분석 완료" if not len(failures) else "⚠ 분석 완료 (일부 회사 실패)")
+    print("=" * 80)
+    return 1 if len(failures) else 0
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import chunked
+import plan_audit
+import report
+import sql_backend
+import synth
+from survey import SEGMENTS, load_responses
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / 'bench_data'
+RESULTS_DIR = PROJECT_ROOT / 'bench_results'
+
+DEFAULT_SIZES = [1_000, 100_000]
+
+
+def _sections(conn):
+    """(섹션 이름, 실행 함수) 목록. load 결과는 segment_top_n 이 재사용"""
+    state = {}
+
+    def load():
+        state['df'] = load_responses(conn)
+
+    def completion():
+        for level in report.COMPLETION_LEVELS:
+            report.completion_by(conn, level)
+
+    def frequency(question):
+        return lambda: report.option_frequency(conn, question)
+
+    def top_n():
+        for question in (75, 76):
+            for segment in SEGMENTS:
+                report.segment_top_n(state['df'], question, segment)
+
+    return [
+        ('load', load),
+        ('completion_rollups', completion),
+        ('q75_frequency', frequency(75)),
+        ('q76_frequency', frequency(76)),
+        ('segment_top_n', top_n),
+    ]
+
+
+def _sql_sections(conn):
+    """pandas 없이 SQLite 안에서 집계하는 동일 섹션 (sql_backend)"""
+    def completion():
+        for level in report.COMPLETION_LEVELS:
+            list(sql_backend.completion_by(conn, level))
+
+    def frequency(question):
+        return lambda: list(sql_backend.option_frequency(conn, question))
+
+    def top_n():
+        for question in (75, 76):
+            for segment in SEGMENTS:
+                list(sql_backend.segment_top_n(conn, question, segment))
+
+    return [
+        ('completion_rollups', completion),
+        ('q75_frequency', frequency(75)),
+        ('q76_frequency', frequency(76)),
+        ('segment_top_n', top_n),
+    ]
+
+
+def _chunked_sections(conn, chunksize=50_000):
+    """load/segment_top_n 을 청크 단위 누적(chunked)으로 측정"""
+    state = {}
+    sections = dict(_sections(conn))
+
+    def load():
+        state['aggregate'] = chunked.aggregate(conn, chunksize=chunksize)
+
+    def top_n():
+        for question in (75, 76):
+            for segment in SEGMENTS:
+                state['aggregate'].segment_top_n(question, segment)
+
+    return [
+        ('load', load),
+        ('completion_rollups', sections['completion_rollups']),
+        ('q75_frequency', sections['q75_frequency']),
+        ('q76_frequency', sections['q76_frequency']),
+        ('segment_top_n', top_n),
+    ]
+
+
+BACKENDS = {'pandas': _sections, 'sql': _sql_sections, 'chunked': _chunked_sections}
+
+
+def _timed(func):
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def _db_path(size):
+    return DATA_DIR / f'synthetic_{size}.db'
+
+
+def run_size(size, repeat=3, reuse=False, seed=0, backend='pandas'):
+    """한 규모(size)에 대해 모든 섹션을 repeat 회 측정"""
+    DATA_DIR.mkdir(exist_ok=True)
+    path = _db_path(size)
+
+    timings = {}
+    if reuse and path.exists():
+        print(f"  [{size:,}] 기존 데이터 재사용: {path.name}")
+    else:
+        timings['ingest'] = [_timed(lambda: synth.generate(path, size, seed=seed))]
+
+    conn = sqlite3.connect(path)
+    for name, func in BACKENDS[backend](conn):
+        timings[name] = [_timed(func) for _ in range(repeat)]
+    conn.close()
+
+    results = []
+    for name, seconds in timings.items():
+        results.append({
+            'size': size,
+            'backend': backend,
+            'section': name,
+            'seconds': seconds,
+            'min': min(seconds),
+            'median': statistics.median(seconds),
+        })
+        print(f"  [{size:,}] {name:<20s} {statistics.median(seconds):>9.4f}s")
+    return results
+
+
+def audit_size(size, queries):
+    """합성 DB 에 대해 리포트 SQL 실행 계획 점검 결과 요약"""
+    findings = plan_audit.audit(_db_path(size), queries)
+    counts = {}
+    for finding in findings:
+        for issue in finding['issues']:
+            counts[issue['kind']] = counts.get(issue['kind'], 0) + 1
+    suggestions = list(dict.fromkeys(s for f in findings for s in f['suggestions']))
+
+    summary = ', '.join(f"{kind} {count}건" for kind, count in sorted(counts.items())) or '문제 없음'
+    print(f"  [{size:,}] 실행 계획 점검: 쿼리 {len(findings)}개 | {summary}")
+    return {'size': size, 'issue_counts': counts, 'suggestions': suggestions, 'findings': findings}
+
+
+def compare(results, baseline_path, threshold):
+    """기준 결과 대비 median 이 threshold 배 이상 느려진 섹션 목록"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding='utf-8'))
+    previous = {(r['size'], r.get('backend', 'pandas'), r['section']): r['median'] for r in baseline['results']}
+
+    regressions = []
+    for r in results:
+        before = previous.get((r['size'], r['backend'], r['section']))
+        if before and r['median'] > before * threshold:
+            regressions.append((r['size'], r['section'], before, r['median']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='EOS 리포트 섹션 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='응답자 규모 (예: 1000 100000 1000000)')
+    parser.add_argument('--repeat', type=int, default=3, help='섹션별 반복 횟수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reuse', action='store_true', help='bench_data 의 기존 합성 DB 재사용 (ingest 생략)')
+    parser.add_argument('--backend', choices=list(BACKENDS), default='pandas',
+                        help='집계 방식 (pandas: report.py, sql: sql_backend.py, chunked: chunked.py)')
+    parser.add_argument('--audit', action='store_true', help='리포트 SQL 실행 계획 점검(plan_audit) 포함')
+    parser.add_argument('--out', default=None, help='결과 JSON 경로 (기본: bench_results/<시각>.json)')
+    parser.add_argument('--baseline', default=None, help='비교할 기준 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=1.25, help='회귀 판정 배수')
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("EOS 리포트 벤치마크")
+    print("=" * 80)
+    print()
+
+    queries = plan_audit.collect_queries() if args.audit else None
+
+    results = []
+    audits = []
+    for size in args.sizes:
+        results.extend(run_size(size, args.repeat, args.reuse, args.seed, args.backend))
+        if queries is not None:
+            audits.append(audit_size(size, queries))
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'backend': args.backend,
+        'results': results,
+    }
+    if audits:
+        payload['plan_audit'] = audits
+    out.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"\n결과 저장: {out}")
+
+    status = 0
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ 성능 회귀 {len(regressions)}건 (기준 대비 {args.threshold:.2f}배 초과):")
+            for size, section, before, after in regressions:
+                print(f"  [{size:,}] {section}: {before:.4f}s → {after:.4f}s ({after / before:.2f}배)")
+            status = 1
+        else:
+            print("\n✓ 성능 회귀 없음")
+
+    print("\n" + "=" * 80)
+    print("✓ 벤치마크 완료")
+    print("=" * 80)
+    return status
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
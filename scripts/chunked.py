@@ -0,0 +1,172 @@
+# Out-of-core aggregation: responses are read chunk by chunk and folded into
+# mergeable aggregators, so memory is bounded by the chunk size rather than the
+# table size. Partial aggregates from different chunks, processes or waves can
+# be combined with merge() and give the same result as a single pass.
+import numpy as np
+import pandas as pd
+
+from queries import MULTI_SELECT
+from report import rank_options
+from survey import SEGMENTS, item_matrix, iter_responses
+
+TOTAL = '전체'
+
+
+class Moments:
+    """그룹 x 열별 응답 수 / 합 / 제곱합 (병합 가능)"""
+
+    def __init__(self):
+        self.count = None
+        self.total = None
+        self.squares = None
+
+    def update(self, frame, squares, keys, sign=1):
+        """sign=-1 이면 해당 행들의 기여분을 차감 (모든 값이 가산적)"""
+        grouped = frame.groupby(keys)
+        self._add(grouped.count() * sign, grouped.sum() * sign, squares.groupby(keys).sum() * sign)
+        return self
+
+    def merge(self, other):
+        if other.count is not None:
+            self._add(other.count, other.total, other.squares)
+        return self
+
+    def _add(self, count, total, squares):
+        if self.count is None:
+            self.count, self.total, self.squares = count, total, squares
+            return
+        self.count = self.count.add(count, fill_value=0)
+        self.total = self.total.add(total, fill_value=0)
+        self.squares = self.squares.add(squares, fill_value=0)
+
+    def mean(self):
+        return self.total / self.count.where(self.count > 0)
+
+    def var(self):
+        """표본 분산 (응답 2개 미만이면 NaN)"""
+        n = self.count.where(self.count > 1)
+        return (self.squares - self.total ** 2 / n) / (n - 1)
+
+
+class DistinctSketch:
+    """K-minimum-values 고유 개수 스케치 (고유 값이 k 개 미만이면 정확한 값)"""
+
+    def __init__(self, k=4096):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, values):
+        self._keep(pd.util.hash_array(np.asarray(values, dtype=object)))
+        return self
+
+    def merge(self, other):
+        self._keep(other.hashes)
+        return self
+
+    def _keep(self, hashes):
+        self.hashes = np.unique(np.concatenate([self.hashes, hashes]))[:self.k]
+
+    def estimate(self):
+        if len(self.hashes) < self.k:
+            return len(self.hashes)
+        # k-th smallest of uniformly distributed 64-bit hashes
+        return (self.k - 1) / (float(self.hashes[-1]) / 2.0 ** 64)
+
+
+class SegmentAggregate:
+    """세그먼트 값별 문항 Moments + 고유 응답자 스케치 (청크 단위 누적)"""
+
+    def __init__(self, segments=SEGMENTS, sketch_size=4096):
+        self.segments = list(segments)
+        self.sketch_size = sketch_size
+        self.items = None
+        self.rows = 0
+        self.moments = {name: Moments() for name in [TOTAL] + self.segments}
+        self.sketches = {name: {} for name in [TOTAL] + self.segments}
+
+    def update(self, chunk, sign=1):
+        """청크 누적. sign=-1 이면 이전에 누적한 행을 차감 (고유 응답자 스케치는 추가만 반영)"""
+        items = item_matrix(chunk)
+        if self.items is None:
+            self.items = list(items.columns)
+        # Row counter per group, so groups emptied by removals can be dropped
+        items['rows'] = 1.0
+        # Raw non-null answers: the Top-N tables count '' as a respondent, like report.segment_top_n
+        for question, column in MULTI_SELECT.items():
+            items[f'answered_q{question}'] = chunk[column].notna().astype(float)
+        squares = items ** 2
+
+        keys = {TOTAL: pd.Series(TOTAL, index=chunk.index)}
+        keys.update((segment, chunk[segment]) for segment in self.segments)
+        for name, key in keys.items():
+            self.moments[name].update(items, squares, key, sign)
+            if sign < 0:
+                continue
+            sketches = self.sketches[name]
+            for value, ids in chunk['corporate_id'].groupby(key):
+                sketches.setdefault(value, DistinctSketch(self.sketch_size)).update(ids.to_numpy())
+        self.rows += sign * len(chunk)
+        return self
+
+    def merge(self, other):
+        if self.items is None:
+            self.items = other.items
+        for name in self.moments:
+            self.moments[name].merge(other.moments[name])
+            sketches = self.sketches[name]
+            for value, sketch in other.sketches[name].items():
+                sketches.setdefault(value, DistinctSketch(self.sketch_size)).merge(sketch)
+        self.rows += other.rows
+        return self
+
+    def _groups(self, name):
+        """행이 남아 있는 그룹 값 (차감으로 비게 된 그룹 제외)"""
+        total = self.moments[name].total
+        return total.index[total['rows'] > 0.5].sort_values()
+
+    def _frames(self, name):
+        moments = self.moments[name]
+        groups = self._groups(name)
+        count = moments.count.loc[groups, self.items].astype('int64')
+        mean = moments.mean().loc[groups, self.items]
+        return count, mean
+
+    def segment_item_table(self):
+        """survey.segment_item_table 과 같은 형식 (segment, value, item, n, mean)"""
+        count, mean = self._frames(TOTAL)
+        frames = [pd.DataFrame({
+            'segment': TOTAL,
+            'value': TOTAL,
+            'item': self.items,
+            'n': count.iloc[0].to_numpy(),
+            'mean': mean.iloc[0].to_numpy(),
+        })]
+        for segment in self.segments:
+            count, mean = self._frames(segment)
+            frame = pd.DataFrame({'n': count.stack(), 'mean': mean.stack()}).reset_index()
+            frame.columns = ['value', 'item', 'n', 'mean']
+            frame.insert(0, 'segment', segment)
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+
+    def segment_top_n(self, question, segment, n=3):
+        """report.segment_top_n 과 같은 형식의 세그먼트별 Top N"""
+        total = self.moments[segment].total.loc[self._groups(segment)]
+        columns = [item for item in self.items if item.startswith(f'q{question}_')]
+        # Sums of 0/1 flags; round so float residue from removals cannot truncate a count
+        sizes = total[f'answered_q{question}'].round().astype('int64')
+        sizes = sizes[sizes > 0]
+        return rank_options(total.loc[sizes.index, columns].round(), sizes, n)
+
+    def distinct_respondents(self, segment=TOTAL):
+        """세그먼트 값별 고유 응답자 수 (추정치)"""
+        return pd.Series({value: sketch.estimate() for value, sketch in sorted(self.sketches[segment].items())},
+                         dtype='float64')
+
+
+def aggregate(conn, segments=SEGMENTS, chunksize=50_000, company=None, company_column='company'):
+    """완료 응답을 chunksize 행씩 읽어 SegmentAggregate 로 누적"""
+    result = SegmentAggregate(segments)
+    for chunk in iter_responses(conn, chunksize, company, company_column):
+        result.update(chunk)
+    return result
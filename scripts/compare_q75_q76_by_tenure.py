@@ -1,16 +1,18 @@
 import pandas as pd
-import sqlite3
+import profiling
+import questions
 import sys
 import re
 
 sys.stdout.reconfigure(encoding='utf-8')
 
 # Connect to database
-conn = sqlite3.connect('PMIK_2025.db')
+conn = profiling.connect(readonly=True)
 
 print("=" * 90)
 print("Q75(동기부여) vs Q76(저해요인) 근속연수별 비교 분석")
 print("=" * 90)
+profiling.step("Q75(동기부여) vs Q76(저해요인) 근속연수별 비교 분석")
 
 # Parse tenure function
 def parse_tenure_years(tenure_str):
@@ -48,23 +50,8 @@ def categorize_tenure(years):
     else:
         return '10년 이상'
 
-# Get Q75 options
-query_q75_options = """
-SELECT 비고 as option_number, "선택(보기)" as option_text
-FROM pmik_eos
-WHERE "No." = 75.0
-ORDER BY CAST(비고 AS INTEGER)
-"""
-df_q75_options = pd.read_sql_query(query_q75_options, conn)
-
-# Get Q76 options
-query_q76_options = """
-SELECT 비고 as option_number, "선택(보기)" as option_text
-FROM pmik_eos
-WHERE "No." = 76.0
-ORDER BY CAST(비고 AS INTEGER)
-"""
-df_q76_options = pd.read_sql_query(query_q76_options, conn)
+# Q75/Q76 option text (question bank: O(1) lookups by option id)
+bank = questions.bank(conn)
 
 # Get responses with tenure
 query_responses = """
@@ -93,6 +80,7 @@ tenure_order = ['1년 미만', '1-3년', '3-5년', '5-10년']
 print("\n" + "=" * 90)
 print("근속연수별 동기부여 요인 (Q75) Top 5")
 print("=" * 90)
+profiling.step("근속연수별 동기부여 요인 (Q75) Top 5")
 
 for tenure_cat in tenure_order:
     tenure_data = df_responses[df_responses['tenure_category'] == tenure_cat]
@@ -112,14 +100,15 @@ for tenure_cat in tenure_order:
 
     print(f"\n[{tenure_cat}] ({len(tenure_data)}명)")
     for idx, (opt_num, count) in enumerate(sorted_options, 1):
-        opt_text = df_q75_options[df_q75_options['option_number'] == opt_num]['option_text'].values
-        if len(opt_text) > 0:
+        opt_text = bank.option_text(75, opt_num)
+        if opt_text:
             percentage = count / len(tenure_data) * 100
-            print(f"  {idx}. {opt_text[0]:<30s} {count:>3}명 ({percentage:>5.1f}%)")
+            print(f"  {idx}. {opt_text:<30s} {count:>3}명 ({percentage:>5.1f}%)")
 
 print("\n" + "=" * 90)
 print("근속연수별 저해 요인 (Q76) Top 5")
 print("=" * 90)
+profiling.step("근속연수별 저해 요인 (Q76) Top 5")
 
 for tenure_cat in tenure_order:
     tenure_data = df_responses[df_responses['tenure_category'] == tenure_cat]
@@ -139,15 +128,16 @@ for tenure_cat in tenure_order:
 
     print(f"\n[{tenure_cat}] ({len(tenure_data)}명)")
     for idx, (opt_num, count) in enumerate(sorted_options, 1):
-        opt_text = df_q76_options[df_q76_options['option_number'] == opt_num]['option_text'].values
-        if len(opt_text) > 0:
+        opt_text = bank.option_text(76, opt_num)
+        if opt_text:
             percentage = count / len(tenure_data) * 100
-            print(f"  {idx}. {opt_text[0]:<35s} {count:>3}명 ({percentage:>5.1f}%)")
+            print(f"  {idx}. {opt_text:<35s} {count:>3}명 ({percentage:>5.1f}%)")
 
 # Comparative analysis
 print("\n" + "=" * 90)
 print("근속연수별 Q75 vs Q76 주요 차이점")
 print("=" * 90)
+profiling.step("근속연수별 Q75 vs Q76 주요 차이점")
 
 for tenure_cat in tenure_order:
     tenure_data = df_responses[df_responses['tenure_category'] == tenure_cat]
@@ -176,22 +166,23 @@ for tenure_cat in tenure_order:
     print(f"\n[{tenure_cat}] ({len(tenure_data)}명)")
     print(f"\n  💚 동기부여 Top 3:")
     for idx, (opt_num, count) in enumerate(top3_q75, 1):
-        opt_text = df_q75_options[df_q75_options['option_number'] == opt_num]['option_text'].values
-        if len(opt_text) > 0:
+        opt_text = bank.option_text(75, opt_num)
+        if opt_text:
             percentage = count / len(tenure_data) * 100
-            print(f"    {idx}. {opt_text[0]} ({percentage:.1f}%)")
+            print(f"    {idx}. {opt_text} ({percentage:.1f}%)")
 
     print(f"\n  ❌ 저해요인 Top 3:")
     for idx, (opt_num, count) in enumerate(top3_q76, 1):
-        opt_text = df_q76_options[df_q76_options['option_number'] == opt_num]['option_text'].values
-        if len(opt_text) > 0:
+        opt_text = bank.option_text(76, opt_num)
+        if opt_text:
             percentage = count / len(tenure_data) * 100
-            print(f"    {idx}. {opt_text[0]} ({percentage:.1f}%)")
+            print(f"    {idx}. {opt_text} ({percentage:.1f}%)")
 
 # Key trends across tenure
 print("\n" + "=" * 90)
 print("근속연수에 따른 변화 추이")
 print("=" * 90)
+profiling.step("근속연수에 따른 변화 추이")
 
 # Track specific themes across tenure
 themes = {
@@ -258,6 +249,7 @@ for theme_name, theme_opts in themes.items():
 print("\n" + "=" * 90)
 print("근속연수별 주요 인사이트")
 print("=" * 90)
+profiling.step("근속연수별 주요 인사이트")
 
 print("\n[1년 미만 - 신입]")
 print("  💚 조직문화와 복리후생에 만족")
@@ -283,6 +275,7 @@ print("  ⚠️ 경영 방식에 대한 불만")
 print("\n" + "=" * 90)
 print("근속연수별 요약 매트릭스")
 print("=" * 90)
+profiling.step("근속연수별 요약 매트릭스")
 
 summary_data = []
 for tenure_cat in tenure_order:
@@ -307,8 +300,8 @@ for tenure_cat in tenure_order:
     top_q75 = max(q75_counts.items(), key=lambda x: x[1]) if q75_counts else (None, 0)
     top_q76 = max(q76_counts.items(), key=lambda x: x[1]) if q76_counts else (None, 0)
 
-    q75_text = df_q75_options[df_q75_options['option_number'] == top_q75[0]]['option_text'].values[0] if top_q75[0] else 'N/A'
-    q76_text = df_q76_options[df_q76_options['option_number'] == top_q76[0]]['option_text'].values[0] if top_q76[0] else 'N/A'
+    q75_text = bank.option_text(75, top_q75[0]) if top_q75[0] else 'N/A'
+    q76_text = bank.option_text(76, top_q76[0]) if top_q76[0] else 'N/A'
 
     summary_data.append({
         '근속연수': tenure_cat,
@@ -0,0 +1,127 @@
+# SQLite connection management. Paths resolve against the project root (or the
+# PMIK_DB environment variable), never the working directory. Readers open the
+# file through a read-only URI (mode=ro, plus immutable=1 for closed waves, which
+# also skips locking and change detection) with a memory-mapped page cache, so
+# concurrent readers in one process share the OS page cache instead of each
+# copying pages. ConnectionPool hands out one such connection per thread.
+# Standard library only: pmik imports this module at start-up.
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB = PROJECT_ROOT / 'PMIK_2025.db'
+
+# PMIK_DB=/path/to/wave.db -> default database for scripts that take no --db
+ENV_VAR = 'PMIK_DB'
+
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE_KB = 64 * 1024
+
+
+def resolve(database=None):
+    """DB 경로 결정: 지정 없으면 PMIK_DB 또는 PMIK_2025.db, 상대 경로는 프로젝트 루트 기준"""
+    if database is None:
+        database = os.environ.get(ENV_VAR) or DEFAULT_DB
+    if str(database) == ':memory:':
+        return ':memory:'
+    path = Path(database).expanduser()
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def readonly_uri(database=None, immutable=False):
+    """읽기 전용 URI (immutable=True: 더 이상 바뀌지 않는 웨이브, 잠금/변경 확인 생략)"""
+    uri = f'file:{quote(resolve(database).as_posix())}?mode=ro'
+    return uri + '&immutable=1' if immutable else uri
+
+
+def tune(conn, mmap_size=MMAP_SIZE, cache_size_kb=CACHE_SIZE_KB):
+    # Base-class execute, so a profiling connection does not report the setup PRAGMAs as queries
+    sqlite3.Connection.execute(conn, f'PRAGMA mmap_size = {int(mmap_size)}')
+    sqlite3.Connection.execute(conn, f'PRAGMA cache_size = {-int(cache_size_kb)}')
+    return conn
+
+
+def connect(database=None, readonly=False, immutable=False, **kwargs):
+    """sqlite3.connect 대체 (프로젝트 기준 경로, readonly/immutable 이면 읽기 전용 URI + mmap)"""
+    path = resolve(database)
+    if not (readonly or immutable) or path == ':memory:':
+        return sqlite3.connect(path, **kwargs)
+    if not path.exists():
+        # mode=ro would fail with a generic "unable to open" error
+        raise FileNotFoundError(f"DB 파일이 없습니다: {path}")
+    return tune(sqlite3.connect(readonly_uri(path, immutable), uri=True, **kwargs))
+
+
+class ConnectionPool:
+    """스레드별 읽기 전용 연결 풀 (스레드마다 연결 하나를 만들어 재사용)
+
+    sqlite3 연결은 만든 스레드에서만 쓸 수 있으므로 스레드 간에 연결을 넘기지 않고,
+    각 스레드가 처음 요청할 때 연다. 포크된 자식 프로세스는 부모의 연결을 쓰지 않고 새로 연다
+    """
+
+    def __init__(self, database=None, immutable=False, mmap_size=MMAP_SIZE, cache_size_kb=CACHE_SIZE_KB,
+                 factory=sqlite3.Connection):
+        self.path = resolve(database)
+        self.immutable = immutable
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._pid = os.getpid()
+
+    def get(self):
+        """현재 스레드의 연결 (없으면 새로 열기)"""
+        if os.getpid() != self._pid:
+            self._reset()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False only so close() can run from any thread; each thread uses its own
+            conn = tune(connect(self.path, readonly=True, immutable=self.immutable, factory=self.factory,
+                                check_same_thread=False), self.mmap_size, self.cache_size_kb)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _reset(self):
+        # Connections inherited over fork belong to the parent; drop them without closing
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._pid = os.getpid()
+
+    def __len__(self):
+        return len(self._connections)
+
+    def close(self):
+        """모든 스레드의 연결 닫기 (다른 스레드에서 쓰던 연결도 포함)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database=None, immutable=False):
+    """DB 경로별 공유 풀 (같은 경로/모드면 같은 풀)"""
+    key = (str(resolve(database)), immutable)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(key[0], immutable)
+        return _pools[key]
@@ -0,0 +1,207 @@
+# Bitmap cross-filter: every attribute value and every Q75/Q76 option is a
+# packed bitmap over the roster (respondent_index positions), so any AND/OR/NOT
+# filter x option count reduces to word-wise ANDs and popcounts.
+import shlex
+
+import numpy as np
+
+from queries import MULTI_SELECT, OPTION_LIST_SQL
+from respondent_index import ATTRIBUTES, RespondentIndex
+from sql_backend import json_options, option_value
+
+N_OPTIONS = 12
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words, axis=None):
+        """uint64 비트맵의 1 비트 수 (numpy 2.0+ bitwise_count)"""
+        return np.bitwise_count(words).sum(axis=axis, dtype=np.int64)
+else:
+    _POPCOUNT_LUT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def popcount(words, axis=None):
+        """uint64 비트맵의 1 비트 수 (바이트 단위 조회표)"""
+        table = _POPCOUNT_LUT[words.view(np.uint8)]
+        return table.sum(axis=axis, dtype=np.int64)
+
+
+def to_bitmap(positions, n):
+    """정렬된 위치 배열 -> uint64 비트맵 (little-endian 비트 순서)"""
+    bits = np.zeros(-(-n // 64) * 64, dtype=bool)
+    bits[positions] = True
+    return np.packbits(bits, bitorder='little').view(np.uint64)
+
+
+def to_positions(bitmap, n):
+    """uint64 비트맵 -> 정렬된 위치 배열"""
+    bits = np.unpackbits(bitmap.view(np.uint8), bitorder='little')[:n]
+    return np.flatnonzero(bits).astype(np.int32)
+
+
+def _selections_sql(column):
+    return f"""
+    SELECT b.corporate_id, {option_value()}
+    FROM (SELECT corporate_id, {column} AS answer FROM pmik_raw_data
+          WHERE completed = 1 AND {column} IS NOT NULL) b,
+         {json_options('b.answer')} j
+    WHERE {option_value()} BETWEEN 1 AND {N_OPTIONS}
+    """
+
+
+class CrossFilter:
+    """속성 값/선택지별 비트맵으로 임의 조건 x 선택지 빈도를 계산"""
+
+    def __init__(self, index, answered, selections, option_text):
+        self.index = index
+        self.n = len(index)
+        self.universe = to_bitmap(index.all, self.n)
+        self.empty = np.zeros_like(self.universe)
+        self.bitmaps = {
+            attribute: {value: to_bitmap(positions, self.n) for value, positions in postings.items()}
+            for attribute, postings in index.postings.items()
+        }
+        self.option_text = option_text
+        self.answered = {}
+        self.options = {}
+        for question in MULTI_SELECT:
+            self.answered[question] = to_bitmap(answered[question], self.n)
+            # One row per option so a filter is applied to all options in a single AND
+            self.options[question] = np.stack([
+                to_bitmap(selections[question][option], self.n) for option in range(1, N_OPTIONS + 1)
+            ])
+
+    @classmethod
+    def build(cls, conn, index=None):
+        if index is None:
+            index = RespondentIndex.build(conn)
+
+        answered, selections, option_text = {}, {}, {}
+        for question, column in MULTI_SELECT.items():
+            answered[question] = index.position_of(row[0] for row in conn.execute(
+                f'SELECT corporate_id FROM pmik_raw_data WHERE completed = 1 AND {column} IS NOT NULL'
+            ))
+            pairs = conn.execute(_selections_sql(column)).fetchall()
+            ids = np.array([pair[0] for pair in pairs], dtype=object)
+            options = np.array([pair[1] for pair in pairs], dtype=np.int64)
+            selections[question] = {
+                option: index.position_of(ids[options == option]) for option in range(1, N_OPTIONS + 1)
+            }
+            option_text[question] = {
+                int(number): text for number, text in conn.execute(OPTION_LIST_SQL, (float(question),))
+            }
+        return cls(index, answered, selections, option_text)
+
+    def bitmap(self, attribute, values):
+        """한 속성의 값 목록 OR (없는 값은 무시)"""
+        if attribute not in self.bitmaps:
+            raise ValueError(f"알 수 없는 속성: {attribute} (가능: {', '.join(ATTRIBUTES)})")
+        if isinstance(values, str):
+            values = [values]
+        result = self.empty.copy()
+        for value in values:
+            if value in self.bitmaps[attribute]:
+                result |= self.bitmaps[attribute][value]
+        return result
+
+    def where(self, expression=None, **filters):
+        """조건 비트맵. 키워드 조건(속성 안 OR, 속성 사이 AND)과 문자열 식을 AND 로 결합
+
+        식 예: "(rank=B1,B2 or biz_unit=Sales) and not tenure_category='1년 미만'"
+        """
+        result = self.universe.copy()
+        for attribute, values in filters.items():
+            if values is not None:
+                result &= self.bitmap(attribute, values)
+        if expression:
+            result &= self.parse(expression)
+        return result
+
+    def parse(self, expression):
+        """and / or / not / 괄호 조건식 -> 비트맵"""
+        lexer = shlex.shlex(expression, posix=True, punctuation_chars='()')
+        lexer.whitespace_split = True
+        tokens = list(lexer)
+        position = 0
+
+        def peek():
+            return tokens[position].lower() if position < len(tokens) else None
+
+        def take():
+            nonlocal position
+            if position >= len(tokens):
+                raise ValueError(f"조건식이 중간에 끝났습니다: {expression}")
+            position += 1
+            return tokens[position - 1]
+
+        def disjunction():
+            result = conjunction()
+            while peek() == 'or':
+                take()
+                result = result | conjunction()
+            return result
+
+        def conjunction():
+            result = negation()
+            while peek() == 'and':
+                take()
+                result = result & negation()
+            return result
+
+        def negation():
+            token = take()
+            if token.lower() == 'not':
+                return self.universe & ~negation()
+            if token == '(':
+                result = disjunction()
+                if take() != ')':
+                    raise ValueError(f"괄호가 닫히지 않았습니다: {expression}")
+                return result
+            attribute, sep, values = token.partition('=')
+            if not sep:
+                raise ValueError(f"조건은 속성=값[,값] 형식이어야 합니다: {token}")
+            return self.bitmap(attribute, values.split(','))
+
+        result = disjunction()
+        if position != len(tokens):
+            raise ValueError(f"해석할 수 없는 조건식: {' '.join(tokens[position:])}")
+        return result
+
+    def count(self, mask=None):
+        return int(popcount(self.universe if mask is None else mask))
+
+    def option_counts(self, question, mask=None):
+        """(응답자 수, 선택지 1..12 선택 수 배열)"""
+        mask = self.universe if mask is None else mask
+        respondents = int(popcount(self.answered[question] & mask))
+        return respondents, popcount(self.options[question] & mask, axis=1)
+
+    def top_options(self, question, mask=None, n=3):
+        """조건에 해당하는 응답자의 Top N 선택지 (동률은 선택지 번호 순)"""
+        respondents, counts = self.option_counts(question, mask)
+        order = np.lexsort((np.arange(N_OPTIONS), -counts))
+        rows = []
+        for rank, idx in enumerate(order[:n], 1):
+            if counts[idx] == 0:
+                break
+            rows.append({
+                'rank': rank,
+                'option_number': int(idx) + 1,
+                'option_text': self.option_text[question].get(int(idx) + 1),
+                'count': int(counts[idx]),
+                'respondents': respondents,
+                'percentage': counts[idx] / respondents * 100,
+            })
+        return rows
+
+    def crosstab(self, question, attribute, mask=None, n=3):
+        """attribute 값별 Top N 선택지 {값: top_options 결과} (응답자가 있는 값만)"""
+        mask = self.universe if mask is None else mask
+        result = {}
+        for value, bitmap in self.bitmaps[attribute].items():
+            rows = self.top_options(question, mask & bitmap, n)
+            if rows:
+                result[value] = rows
+        return result
+
+    def positions(self, mask):
+        """비트맵 -> respondent_index 위치 배열 (상세 목록 출력용)"""
+        return to_positions(mask, self.n)
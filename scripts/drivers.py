@@ -0,0 +1,224 @@
+# Key-driver analysis: which Likert items predict choosing each Q75/Q76 option.
+# One L2-regularized logistic regression per option (company-wide), then per
+# option x segment value warm-started from the company coefficients. Fits are
+# Newton/IRLS in numpy on standardized items and run in a process pool.
+import argparse
+import contextlib
+import multiprocessing
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import questions
+import stream
+from queries import MULTI_SELECT
+from survey import LIKERT_COLUMNS, N_OPTIONS, load_responses, option_indicators
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB = PROJECT_ROOT / 'PMIK_2025.db'
+
+# Shared with worker processes through the pool initializer (inherited, not pickled, under fork)
+_X = None
+_Y = None
+_SEGMENTS = None
+
+
+# Rows per block when accumulating X'WX, so the weighted copy stays cache-sized
+BLOCK_ROWS = 65_536
+
+
+def design_matrix(df):
+    """절편 열 + Likert 문항 z-점수 행렬 (float32, 결측은 평균 = 0 으로 대체)"""
+    items = df[LIKERT_COLUMNS].to_numpy(dtype=np.float64)
+    mean = np.nanmean(items, axis=0)
+    std = np.nanstd(items, axis=0)
+    std[~(std > 0)] = 1.0
+    X = np.ones((len(items), len(LIKERT_COLUMNS) + 1), dtype=np.float32)
+    X[:, 1:] = np.nan_to_num((items - mean) / std)
+    return X
+
+
+def fit_logistic(X, y, penalty=1.0, start=None, tol=1e-5, max_iter=50):
+    """L2 정규화 로지스틱 회귀 (Newton/IRLS) -> (계수, 반복 수)
+
+    X 의 첫 열은 절편 (정규화 제외). start: 이전 적합 계수로 시작 (warm start)
+    """
+    n, k = X.shape
+    ridge = np.full(k, penalty)
+    ridge[0] = 0.0
+    beta = np.zeros(k) if start is None else np.array(start, dtype=np.float64)
+    for iteration in range(1, max_iter + 1):
+        p = 1.0 / (1.0 + np.exp(-np.clip(X @ beta.astype(np.float32), -30, 30)))
+        gradient = (X.T @ (p - y)).astype(np.float64) + ridge * beta
+        weight = p * (1 - p)
+        hessian = np.diag(ridge + 1e-9)
+        for start_row in range(0, n, BLOCK_ROWS):
+            block = X[start_row:start_row + BLOCK_ROWS]
+            hessian += (block.T * weight[start_row:start_row + BLOCK_ROWS]) @ block
+        step = np.linalg.solve(hessian, gradient)
+        beta -= step
+        if np.abs(step).max() < tol:
+            break
+    return beta, iteration
+
+
+def _share(X, Y, segments):
+    global _X, _Y, _SEGMENTS
+    _X, _Y, _SEGMENTS = X, Y, segments
+
+
+def _init(X, Y, segments):
+    stream.ignore_interrupt()
+    _share(X, Y, segments)
+
+
+def _fit_task(task):
+    """(세그먼트, 값, 선택지 목록, 시작 계수, penalty, 최소 선택 수) -> 결과 행 목록 (워커에서 실행)"""
+    segment, value, options, starts, penalty, min_cases = task
+    # A segment's rows are copied once and shared by all of its option fits
+    rows = np.flatnonzero(_SEGMENTS[segment] == value) if segment else slice(None)
+    X = _X[rows]
+    results = []
+    for option, start in zip(options, starts):
+        y = _Y[rows, option - 1]
+        cases = int(y.sum())
+        if cases < min_cases or len(y) - cases < min_cases:
+            continue
+        beta, iterations = fit_logistic(X, y, penalty, start)
+        results.append((segment, value, option, len(y), cases, iterations, beta))
+    return results
+
+
+def key_drivers(df, question, segment=None, penalty=1.0, min_cases=5, workers=None, progress=None):
+    """선택지별 로지스틱 회귀 계수 (long format: segment, value, option, item, coef, odds_ratio, n, cases)
+
+    전체 적합 후 segment 값별 적합은 전체 계수로 warm start. workers=1 이면 프로세스 풀 없이 실행.
+    progress(완료 작업 수, 전체 작업 수): 작업(전체 선택지 하나 또는 세그먼트 값 하나)이 끝날 때마다 호출
+    """
+    column = MULTI_SELECT[question]
+    df = df[df[column].notna()].reset_index(drop=True)
+    X = design_matrix(df)
+    Y = option_indicators(df[column], question).to_numpy(dtype=np.float32)
+    segments = {segment: df[segment].fillna('N/A').to_numpy()} if segment else {}
+    options = list(range(1, N_OPTIONS + 1))
+    values = sorted(set(segments[segment])) if segment else []
+    total = len(options) + len(values)
+    done = 0
+
+    def run(tasks):
+        nonlocal done
+        fitted = []
+        with contextlib.ExitStack() as stack:
+            if workers == 1:
+                _share(X, Y, segments)
+                finished = map(_fit_task, tasks)
+            else:
+                pool = stack.enter_context(multiprocessing.Pool(workers, initializer=_init,
+                                                                initargs=(X, Y, segments)))
+                finished = pool.imap_unordered(_fit_task, tasks)
+            for rows in finished:
+                fitted.extend(rows)
+                done += 1
+                if progress:
+                    progress(done, total)
+        return fitted
+
+    # Company-wide fits first: one task per option so they spread over the pool
+    fitted = run([(None, '전체', [option], [None], penalty, min_cases) for option in options])
+    starts = {row[2]: row[6] for row in fitted}
+    if segment:
+        fitted += run([
+            (segment, value, options, [starts.get(option) for option in options], penalty, min_cases)
+            for value in values
+        ])
+
+    records = []
+    for seg, value, option, n, cases, iterations, beta in fitted:
+        for item, coef in zip(LIKERT_COLUMNS, beta[1:]):
+            records.append((seg or '전체', value, option, item, coef, n, cases, iterations))
+    result = pd.DataFrame(records, columns=['segment', 'value', 'option', 'item', 'coef', 'n', 'cases',
+                                            'iterations'])
+    result['odds_ratio'] = np.exp(result['coef'])
+    # Share of the absolute coefficients within each model: a simple relative-importance measure
+    keys = ['segment', 'value', 'option']
+    result['importance'] = result['coef'].abs() / result.groupby(keys)['coef'].transform(
+        lambda c: c.abs().sum()) * 100
+    # Company-wide models first, then segment values
+    result['company'] = result['segment'] != '전체'
+    result = result.sort_values(['company'] + keys + ['coef'], ascending=[True, True, True, True, False],
+                                ignore_index=True)
+    return result.drop(columns='company')
+
+
+def top_drivers(result, n=5):
+    """모형별 계수 상위 n 개 문항 (선택 확률을 높이는 문항)"""
+    return result.groupby(['segment', 'value', 'option'], sort=False).head(n)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Likert 문항 -> Q75/Q76 선택지 핵심 요인 분석 (로지스틱 회귀)')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite DB 경로')
+    parser.add_argument('--question', type=int, choices=list(MULTI_SELECT), default=76)
+    parser.add_argument('--segment', choices=['biz_unit', 'rank', 'tenure_category'], default=None,
+                        help='세그먼트 값별로도 적합')
+    parser.add_argument('--option', type=int, default=None, help='출력할 선택지 (기본: 전체)')
+    parser.add_argument('--top', type=int, default=5, help='모형별 출력 문항 수')
+    parser.add_argument('--penalty', type=float, default=1.0, help='L2 정규화 강도 (z-점수 계수 기준)')
+    parser.add_argument('--min-cases', type=int, default=5, help='선택/비선택 최소 인원 (미만이면 적합 생략)')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수, 1: 단일 프로세스)')
+    parser.add_argument('--out', default=None, help='전체 계수 CSV 저장 경로')
+    stream.add_argument(parser)
+    args = parser.parse_args(argv)
+
+    out = stream.Stream(args.output)
+    with out.cancellable():
+        run(args, out)
+
+
+def run(args, out):
+    conn = sqlite3.connect(args.db)
+    df = load_responses(conn)
+    bank = questions.bank(conn)
+    option_text = bank.option_list(args.question)
+    conn.close()
+
+    started = time.perf_counter()
+    with out.progress('모형 적합 (작업)') as progress:
+        result = key_drivers(df, args.question, args.segment, args.penalty, args.min_cases, args.workers,
+                             progress)
+    elapsed = time.perf_counter() - started
+    models = result.groupby(['segment', 'value', 'option']).ngroups
+    out.section(f"Q{args.question} 핵심 요인 분석: 모형 {models}개, {elapsed:.2f}초 "
+                f"(선택/비선택 {args.min_cases}명 미만 모형 생략)",
+                data={'question': args.question, 'models': models, 'elapsed_sec': round(elapsed, 2)})
+
+    shown = top_drivers(result, args.top)
+    if args.option:
+        shown = shown[shown['option'] == args.option]
+    for (segment, value, option), rows in shown.groupby(['segment', 'value', 'option'], sort=False):
+        first = rows.iloc[0]
+        label = '전체' if segment == '전체' else f"{segment}={value}"
+        items = [(row['item'], row['coef'], row['odds_ratio'], row['importance'],
+                  bank.category(row['item']), bank.item_text(row['item'])) for _, row in rows.iterrows()]
+        out.section(f"\n[{label}] [{option:>2}] {option_text.get(option, '')} "
+                    f"(선택 {first['cases']}/{first['n']}명)",
+                    [f"  {item} {coef:+.3f} (OR {odds:.2f}, {importance:4.1f}%) {category} | {text[:40]}"
+                     for item, coef, odds, importance, category, text in items],
+                    data={'segment': segment, 'value': value, 'option': option,
+                          'option_text': option_text.get(option, ''), 'n': first['n'], 'cases': first['cases'],
+                          'drivers': [{'item': item, 'coef': round(coef, 4), 'odds_ratio': round(odds, 4),
+                                       'importance': round(importance, 2), 'category': category, 'text': text}
+                                      for item, coef, odds, importance, category, text in items]})
+
+    if args.out:
+        result.to_csv(args.out, index=False, encoding='utf-8-sig')
+        out.section(f"\n✓ 저장: {args.out}", data={'path': args.out})
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+import sql_backend
+from queries import COMPLETION_LEVELS, MULTI_SELECT
+from survey import LIKERT_COLUMNS, SEGMENTS, iter_responses
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB = PROJECT_ROOT / 'PMIK_2025.db'
+
+FORMATS = {'parquet': '.parquet', 'feather': '.feather', 'ipc': '.arrows'}
+
+
+def _pyarrow():
+    """pyarrow 는 내보내기에만 필요하므로 사용할 때 불러옴"""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Arrow/Parquet 내보내기에는 pyarrow 가 필요합니다: pip install pyarrow") from e
+    return pyarrow
+
+
+def responses_schema():
+    """응답자 단위 테이블 스키마 (load_responses 열 구성)"""
+    pa = _pyarrow()
+    fields = [('corporate_id', pa.string()), ('biz_unit', pa.string()), ('rank', pa.string()),
+              ('tenure', pa.string())]
+    fields += [(col, pa.float64()) for col in LIKERT_COLUMNS]
+    fields += [(column, pa.string()) for column in MULTI_SELECT.values()]
+    fields += [('tenure_years', pa.float64()), ('tenure_category', pa.string())]
+    return pa.schema(fields)
+
+
+def response_batches(conn, chunksize=50_000):
+    """완료 응답을 chunksize 행 단위 RecordBatch 로 전달 (메모리는 청크 크기에 비례)"""
+    pa = _pyarrow()
+    schema = responses_schema()
+    for chunk in iter_responses(conn, chunksize):
+        yield pa.RecordBatch.from_pandas(chunk[schema.names], schema=schema, preserve_index=False)
+
+
+def rows_table(rows):
+    """sqlite3.Row 목록 -> Arrow 테이블 (열 이름 유지)"""
+    pa = _pyarrow()
+    rows = list(rows)
+    if not rows:
+        return pa.table({})
+    names = rows[0].keys()
+    return pa.table({name: [row[i] for row in rows] for i, name in enumerate(names)})
+
+
+def roster_table(conn):
+    """구성원 명단 + 응답 상태 + 근속 구간 (respondent_index 기준)"""
+    from respondent_index import COLUMNS, RespondentIndex
+
+    pa = _pyarrow()
+    index = RespondentIndex.build(conn)
+    columns = {'id': index.ids.tolist()}
+    columns.update((name, index.columns[name].tolist()) for name in COLUMNS)
+    return pa.table(columns)
+
+
+def segment_items_table(conn, chunksize=50_000):
+    """세그먼트 x 문항 응답 수/평균 (chunked 집계)"""
+    import chunked
+
+    return _pyarrow().Table.from_pandas(
+        chunked.aggregate(conn, chunksize=chunksize).segment_item_table(), preserve_index=False)
+
+
+def segment_top_n_table(conn, question, n=3):
+    """세그먼트(biz_unit/rank/근속 구간)별 Top N 선택지를 한 테이블로"""
+    pa = _pyarrow()
+    tables = []
+    for segment in SEGMENTS:
+        table = rows_table(sql_backend.segment_top_n(conn, question, segment, n))
+        if table.num_rows:
+            tables.append(table.add_column(0, 'segment', pa.array([segment] * table.num_rows)))
+    return pa.concat_tables(tables) if tables else pa.table({})
+
+
+def sections():
+    """내보낼 수 있는 리포트 섹션: 이름 -> conn 을 받아 Arrow 테이블(또는 RecordBatch iterator)을 만드는 함수"""
+    result = {'responses': response_batches, 'roster': roster_table, 'segment_items': segment_items_table}
+    for level in COMPLETION_LEVELS:
+        result[f'completion_{level}'] = lambda conn, level=level: rows_table(sql_backend.completion_by(conn, level))
+    for question in MULTI_SELECT:
+        result[f'q{question}_frequency'] = \
+            lambda conn, q=question: rows_table(sql_backend.option_frequency(conn, q))
+        result[f'q{question}_top_combinations'] = \
+            lambda conn, q=question: rows_table(sql_backend.top_combinations(conn, q))
+        result[f'q{question}_segment_top_n'] = lambda conn, q=question: segment_top_n_table(conn, q)
+    return result
+
+
+def to_arrow(conn, name):
+    """섹션 결과를 Arrow 테이블로 (노트북에서 직접 사용)"""
+    pa = _pyarrow()
+    result = sections()[name](conn)
+    if isinstance(result, pa.Table):
+        return result
+    schema, batches = _batches(result)
+    return pa.Table.from_batches(list(batches), schema=schema)
+
+
+def _batches(result):
+    pa = _pyarrow()
+    if isinstance(result, pa.Table):
+        return result.schema, iter(result.to_batches())
+    first = next(result, None)
+    if first is None:
+        return responses_schema(), iter(())
+    return first.schema, _chain(first, result)
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def write(result, path, fmt):
+    """Table/RecordBatch iterator 를 파일로 기록 (배치 단위 스트리밍). 기록한 행 수 반환"""
+    pa = _pyarrow()
+    schema, batches = _batches(result)
+    rows = 0
+
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(path, schema)
+    elif fmt == 'feather':
+        # Feather v2 is the Arrow IPC file format; uncompressed so readers can memory-map it zero-copy
+        writer = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression=None))
+    else:
+        sink = sys.stdout.buffer if path == '-' else path
+        writer = pa.ipc.new_stream(sink, schema)
+
+    with writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def export(database, out_dir, names=None, fmt='parquet'):
+    """선택한 섹션들을 out_dir/<섹션>.<확장자> 로 저장"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    available = sections()
+    conn = sqlite3.connect(database)
+    written = []
+    try:
+        for name in names or list(available):
+            path = out_dir / f'{name}{FORMATS[fmt]}'
+            rows = write(available[name](conn), str(path), fmt)
+            written.append((name, path, rows))
+    finally:
+        conn.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='리포트 섹션 Arrow/Parquet/Feather 내보내기')
+    parser.add_argument('sections', nargs='*', help='내보낼 섹션 (기본: 전체, --list 로 목록 확인)')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite DB 경로')
+    parser.add_argument('--format', choices=list(FORMATS), default='parquet')
+    parser.add_argument('--out', default='export', help='결과 디렉토리')
+    parser.add_argument('--stream', action='store_true',
+                        help='섹션 하나를 Arrow IPC 스트림으로 stdout 에 출력 (파이프 연결용)')
+    parser.add_argument('--list', action='store_true', help='섹션 목록 출력')
+    args = parser.parse_args(argv)
+
+    available = sections()
+    if args.list:
+        for name in available:
+            print(name)
+        return
+    unknown = [name for name in args.sections if name not in available]
+    if unknown:
+        sys.exit(f"알 수 없는 섹션: {', '.join(unknown)} (--list 로 목록 확인)")
+
+    try:
+        _pyarrow()
+    except ImportError as e:
+        sys.exit(str(e))
+
+    if args.stream:
+        if len(args.sections) != 1:
+            sys.exit("--stream 은 섹션 하나만 지정할 수 있습니다")
+        conn = sqlite3.connect(args.db)
+        write(available[args.sections[0]](conn), '-', 'ipc')
+        conn.close()
+        return
+
+    written = export(args.db, args.out, args.sections, args.format)
+    for name, path, rows in written:
+        print(f"  {name:32s} {rows:>10,}행 → {path}")
+    print(f"\n✓ {len(written)}개 섹션 저장: {args.out}")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,285 @@
+# Incremental report state: every tracked row keeps a hash keyed by corporate_id,
+# and all report aggregates are additive (counts, sums, sums of squares). A
+# refresh therefore subtracts the old version of each changed row and adds the
+# new one, instead of recomputing every section from scratch.
+#
+# Changes are found either by rehashing all rows (default, read-only) or, after
+# `--track`, from a trigger-maintained change log so only changed ids are read.
+import argparse
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from chunked import SegmentAggregate
+from queries import COMPLETION_LEVELS
+from survey import SEGMENTS, add_tenure, responses_query
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB = PROJECT_ROOT / 'PMIK_2025.db'
+STATE_SUFFIX = '.incremental.pkl'
+
+CHANGE_LOG = 'pmik_change_log'
+# Only changed ids are needed, so every write on the two tracked tables logs its id(s)
+TRIGGERS = f"""
+CREATE TABLE IF NOT EXISTS {CHANGE_LOG} (corporate_id TEXT);
+CREATE TRIGGER IF NOT EXISTS pmik_log_raw_insert AFTER INSERT ON pmik_raw_data
+BEGIN INSERT INTO {CHANGE_LOG} VALUES (NEW.corporate_id); END;
+CREATE TRIGGER IF NOT EXISTS pmik_log_raw_update AFTER UPDATE ON pmik_raw_data
+BEGIN INSERT INTO {CHANGE_LOG} VALUES (OLD.corporate_id), (NEW.corporate_id); END;
+CREATE TRIGGER IF NOT EXISTS pmik_log_raw_delete AFTER DELETE ON pmik_raw_data
+BEGIN INSERT INTO {CHANGE_LOG} VALUES (OLD.corporate_id); END;
+CREATE TRIGGER IF NOT EXISTS pmik_log_member_insert AFTER INSERT ON pmik_member
+BEGIN INSERT INTO {CHANGE_LOG} VALUES (NEW."ID(new)"); END;
+CREATE TRIGGER IF NOT EXISTS pmik_log_member_update AFTER UPDATE ON pmik_member
+BEGIN INSERT INTO {CHANGE_LOG} VALUES (OLD."ID(new)"), (NEW."ID(new)"); END;
+CREATE TRIGGER IF NOT EXISTS pmik_log_member_delete AFTER DELETE ON pmik_member
+BEGIN INSERT INTO {CHANGE_LOG} VALUES (OLD."ID(new)"); END;
+"""
+
+LOGGED_IDS = f'SELECT corporate_id FROM {CHANGE_LOG}'
+
+# Member-level completion flags (additive form of queries.completion_sql)
+MEMBER_SQL = """
+SELECT
+    m."ID(new)" AS corporate_id,
+    m."Biz Unit.",
+    m.Department,
+    m.Team,
+    m."Job Title",
+    1 AS total_members,
+    COALESCE(r.has_completed, 0) AS completed_responses,
+    COALESCE(r.has_incomplete, 0) AS incomplete_responses,
+    CASE WHEN r.corporate_id IS NULL THEN 1 ELSE 0 END AS no_response
+FROM pmik_member m
+LEFT JOIN (
+    SELECT corporate_id, MAX(completed = 1) AS has_completed, MAX(completed = 0) AS has_incomplete
+    FROM pmik_raw_data
+    WHERE corporate_id IS NOT NULL {raw_filter}
+    GROUP BY corporate_id
+) r ON m."ID(new)" = r.corporate_id
+WHERE m."ID(new)" IS NOT NULL {member_filter}
+"""
+
+COMPLETION_COUNTS = ['total_members', 'completed_responses', 'incomplete_responses', 'no_response']
+
+# GROUP BY keeps NULL keys; a sentinel lets pandas align them across updates
+_NULL = '\x00'
+
+
+def _level_columns(level):
+    return [column.strip('"') for column in COMPLETION_LEVELS[level]]
+
+
+class CompletionCounter:
+    """조직 단위별 대상/완료/미완료/미응답 인원 (가산 집계)"""
+
+    def __init__(self):
+        self.counts = {level: None for level in COMPLETION_LEVELS}
+
+    def update(self, members, sign=1):
+        for level in COMPLETION_LEVELS:
+            columns = _level_columns(level)
+            keys = members[columns].fillna(_NULL)
+            delta = members[COMPLETION_COUNTS].groupby([keys[c] for c in columns]).sum() * sign
+            current = self.counts[level]
+            self.counts[level] = delta if current is None else current.add(delta, fill_value=0)
+        return self
+
+    def table(self, level='biz_unit'):
+        """queries.completion_sql 과 같은 열 구성의 집계 표"""
+        columns = _level_columns(level)
+        counts = self.counts[level]
+        if counts is None:
+            return pd.DataFrame(columns=columns + COMPLETION_COUNTS)
+        counts = counts[counts['total_members'] > 0].astype('int64').sort_index().reset_index()
+        counts = counts[counts[columns[0]] != _NULL]
+        counts[columns] = counts[columns].replace(_NULL, None)
+        return counts.reset_index(drop=True)
+
+
+def _keyed(frame):
+    """corporate_id + 중복 순번을 키로 하는 행 해시 표 (응답 중복 행, id 가 NULL 인 행도 각각 추적)"""
+    # NULL ids share the sentinel key and are numbered like duplicates (groupby would give them NaN)
+    key = frame['corporate_id'].fillna(_NULL).rename('key')
+    keys = [key, frame.groupby(key).cumcount().rename('dup')]
+    frame = frame.set_index(keys)
+    frame['row_hash'] = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return frame
+
+
+def _diff(previous, current, candidates=None):
+    """(이전 버전 행, 새 버전 행). candidates 가 있으면 해당 id 만 비교"""
+    if candidates is not None:
+        previous = previous[previous.index.get_level_values('key').isin(candidates)]
+    common = current.index.intersection(previous.index)
+    changed = common[current.loc[common, 'row_hash'].to_numpy() != previous.loc[common, 'row_hash'].to_numpy()]
+    old = previous.loc[previous.index.difference(current.index).union(changed)]
+    new = current.loc[current.index.difference(previous.index).union(changed)]
+    return old, new
+
+
+class IncrementalReport:
+    """행 해시 + 가산 집계로 변경분만 반영하는 리포트 상태"""
+
+    def __init__(self, segments=SEGMENTS):
+        self.segments = list(segments)
+        self.responses = SegmentAggregate(self.segments)
+        self.completion = CompletionCounter()
+        self.rows = {'responses': None, 'members': None}
+        self.tracked = False
+        self.last = {}
+
+    def _fetch(self, conn, logged):
+        """현재 응답/구성원 행 (logged 이면 변경 로그에 있는 id 만)"""
+        query, params = responses_query()
+        raw_filter = member_filter = ''
+        if logged:
+            # IN never matches NULL, so a logged NULL id re-reads every NULL-id response
+            query += (f' AND (r.corporate_id IN ({LOGGED_IDS}) OR (r.corporate_id IS NULL'
+                      f' AND EXISTS (SELECT 1 FROM {CHANGE_LOG} WHERE corporate_id IS NULL)))')
+            raw_filter = f'AND corporate_id IN ({LOGGED_IDS})'
+            member_filter = f'AND m."ID(new)" IN ({LOGGED_IDS})'
+        responses = add_tenure(pd.read_sql_query(query, conn, params=params))
+        members = pd.read_sql_query(MEMBER_SQL.format(raw_filter=raw_filter, member_filter=member_filter), conn)
+        return _keyed(responses), _keyed(members)
+
+    def _apply(self, name, old, new, aggregate):
+        if len(old):
+            aggregate.update(old.drop(columns='row_hash').reset_index(drop=True), sign=-1)
+        if len(new):
+            aggregate.update(new.drop(columns='row_hash').reset_index(drop=True))
+        rows = self.rows[name]
+        self.rows[name] = pd.concat([rows.drop(index=old.index), new]).sort_index()
+
+    def refresh(self, conn, track=False):
+        """DB 변경분 반영. 반환: 처리 통계 dict"""
+        started = time.perf_counter()
+        if track:
+            install_change_log(conn)
+        logged = self.tracked and self.rows['responses'] is not None and _has_change_log(conn)
+        if track or logged:
+            # Hold the write lock so nothing is logged between our read and clearing the log
+            conn.execute('BEGIN IMMEDIATE')
+
+        if self.rows['responses'] is None:
+            mode = 'full'
+            responses, members = self._fetch(conn, logged=False)
+            self.responses.update(responses.drop(columns='row_hash').reset_index(drop=True))
+            self.completion.update(members.drop(columns='row_hash').reset_index(drop=True))
+            self.rows = {'responses': responses, 'members': members}
+            old = {'responses': responses.iloc[:0], 'members': members.iloc[:0]}
+            new = {'responses': responses, 'members': members}
+        else:
+            mode = 'log' if logged else 'scan'
+            candidates = None
+            if logged:
+                candidates = [_NULL if row[0] is None else row[0]
+                              for row in conn.execute(f'SELECT DISTINCT corporate_id FROM {CHANGE_LOG}')]
+            responses, members = self._fetch(conn, logged)
+            old, new = {}, {}
+            old['responses'], new['responses'] = _diff(self.rows['responses'], responses, candidates)
+            old['members'], new['members'] = _diff(self.rows['members'], members, candidates)
+            self._apply('responses', old['responses'], new['responses'], self.responses)
+            self._apply('members', old['members'], new['members'], self.completion)
+        self.tracked = self.tracked or track
+
+        touched = set()
+        for frame in (old['responses'], new['responses']):
+            for segment in self.segments:
+                touched.update((segment, value) for value in frame[segment].dropna().unique())
+        self.last = {
+            'mode': mode,
+            'removed': len(old['responses']) + len(old['members']),
+            'added': len(new['responses']) + len(new['members']),
+            'segments': len(touched),
+            'elapsed': time.perf_counter() - started,
+        }
+        return self.last
+
+    def save(self, path):
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def install_change_log(conn):
+    """변경 로그 테이블과 트리거 설치 (DB 쓰기 권한 필요)"""
+    conn.executescript(TRIGGERS)
+
+
+def _has_change_log(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (CHANGE_LOG,)
+    ).fetchone() is not None
+
+
+def refresh(database, state_path=None, track=False, rebuild=False):
+    """상태 파일을 불러와 변경분을 반영하고 저장. (IncrementalReport, 통계) 반환"""
+    state_path = state_path or f'{database}{STATE_SUFFIX}'
+    report = None
+    if not rebuild and os.path.exists(state_path):
+        report = IncrementalReport.load(state_path)
+    report = report or IncrementalReport()
+
+    conn = sqlite3.connect(database, isolation_level=None)
+    try:
+        stats = report.refresh(conn, track)
+        # Save before clearing the log: if the commit fails the same ids are
+        # re-diffed next time and their hashes already match (no double count)
+        report.save(state_path)
+        if conn.in_transaction:
+            conn.execute(f'DELETE FROM {CHANGE_LOG}')
+            conn.execute('COMMIT')
+    finally:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        conn.close()
+    return report, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='변경된 응답만 반영하는 증분 리포트 갱신')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite DB 경로')
+    parser.add_argument('--state', default=None, help=f'상태 파일 경로 (기본: <DB>{STATE_SUFFIX})')
+    parser.add_argument('--track', action='store_true',
+                        help='DB 에 변경 로그 트리거를 설치해 이후 갱신 시 변경된 id 만 조회')
+    parser.add_argument('--rebuild', action='store_true', help='상태를 버리고 처음부터 다시 계산')
+    parser.add_argument('--out', default=None, help='세그먼트/완료율 표 CSV 저장 디렉토리')
+    args = parser.parse_args(argv)
+
+    report, stats = refresh(args.db, args.state, args.track, args.rebuild)
+    modes = {'full': '전체 계산', 'scan': '전체 해시 비교', 'log': '변경 로그'}
+    print(f"갱신 방식: {modes[stats['mode']]}")
+    print(f"  차감 행: {stats['removed']:,} | 추가 행: {stats['added']:,} | 영향받은 세그먼트 값: {stats['segments']}")
+    print(f"  소요 시간: {stats['elapsed']:.3f}초")
+
+    completion = report.completion.table('biz_unit')
+    total = completion['total_members'].sum()
+    completed = completion['completed_responses'].sum()
+    print(f"\n전체 완료율: {completed / total * 100 if total else 0:.1f}% ({completed}/{total}명)")
+
+    if args.out:
+        out = Path(args.out)
+        out.mkdir(parents=True, exist_ok=True)
+        report.responses.segment_item_table().to_csv(out / 'segment_items.csv', index=False, encoding='utf-8-sig')
+        for level in COMPLETION_LEVELS:
+            report.completion.table(level).to_csv(out / f'completion_{level}.csv', index=False, encoding='utf-8-sig')
+        print(f"결과 저장: {out}")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    # Run through the importable module so the pickled state refers to incremental.IncrementalReport
+    import incremental
+    incremental.main()
@@ -0,0 +1,165 @@
+# Org hierarchy (전체 > Biz Unit > Department > Team) as flat node arrays.
+# Nodes are stored in pre-order, so every parent precedes its children: a metric
+# is filled in at the teams (leaves) and rolled up to every level in one
+# bottom-up pass, one vectorized np.add.at per depth (linear in the node count).
+import numpy as np
+
+from queries import MULTI_SELECT, completion_sql
+from sql_backend import LIKERT_COLUMNS, json_options, option_value
+
+LEVELS = ['biz_unit', 'department', 'team']
+ROOT = '전체'
+N_OPTIONS = 12
+
+PATHS_SQL = """
+SELECT DISTINCT "Biz Unit.", Department, Team
+FROM pmik_member
+WHERE "Biz Unit." IS NOT NULL
+"""
+
+# Completion columns of queries.completion_sql (distinct ids; additive because a member has one team)
+COMPLETION_COLUMNS = ['total_members', 'completed_responses', 'incomplete_responses', 'no_response']
+
+# Completed responses joined to the member's team (same join as the completion report)
+_RESPONDENTS = """
+    SELECT r.rowid AS respondent, m."Biz Unit." AS biz_unit, m.Department AS department, m.Team AS team,
+           r.{column} AS answer
+    FROM pmik_raw_data r
+    JOIN pmik_member m ON r.corporate_id = m."ID(new)"
+    WHERE r.completed = 1 AND m."Biz Unit." IS NOT NULL
+"""
+
+
+def option_counts_sql(question):
+    """팀별 응답자 수 + 선택지별 선택 수 (biz_unit, department, team, option, count; option 0 = 응답자 수)"""
+    column = MULTI_SELECT[question]
+    return f"""
+    WITH base AS MATERIALIZED ({_RESPONDENTS.format(column=column)} AND r.{column} IS NOT NULL),
+    selections AS (
+        SELECT DISTINCT b.respondent, b.biz_unit, b.department, b.team, {option_value()} AS option
+        FROM base b, {json_options('b.answer')} j
+        WHERE {option_value()} BETWEEN 1 AND {N_OPTIONS}
+    )
+    SELECT biz_unit, department, team, 0, COUNT(*) FROM base GROUP BY biz_unit, department, team
+    UNION ALL
+    SELECT biz_unit, department, team, option, COUNT(*) FROM selections
+    GROUP BY biz_unit, department, team, option
+    """
+
+
+def likert_sql():
+    """팀별 Likert 문항 응답 수/합 (biz_unit, department, team, n_r001.., sum_r001..)"""
+    counts = ', '.join(f'COUNT(r.{col})' for col in LIKERT_COLUMNS)
+    sums = ', '.join(f'TOTAL(r.{col})' for col in LIKERT_COLUMNS)
+    return f"""
+    SELECT m."Biz Unit.", m.Department, m.Team, {counts}, {sums}
+    FROM pmik_raw_data r
+    JOIN pmik_member m ON r.corporate_id = m."ID(new)"
+    WHERE r.completed = 1 AND m."Biz Unit." IS NOT NULL
+    GROUP BY m."Biz Unit.", m.Department, m.Team
+    """
+
+
+def _label(value):
+    return 'N/A' if value is None else str(value)
+
+
+class OrgTree:
+    """조직 트리 (노드 배열: 이름/부모/깊이, 노드 0 = 전체)"""
+
+    def __init__(self, paths):
+        # NULLs sort first, like ORDER BY in SQLite
+        paths = sorted({tuple(path) for path in paths},
+                       key=lambda path: [(value is not None, _label(value)) for value in path])
+        names, parent, depth = [ROOT], [-1], [0]
+        self.node_of = {(): 0}
+        for path in paths:
+            key = tuple(_label(value) for value in path)
+            for d in range(1, len(key) + 1):
+                if key[:d] not in self.node_of:
+                    self.node_of[key[:d]] = len(names)
+                    names.append(key[d - 1])
+                    parent.append(self.node_of[key[:d - 1]])
+                    depth.append(d)
+        self.names = names
+        self.parent = np.array(parent, dtype=np.int64)
+        self.depth = np.array(depth, dtype=np.int64)
+        self.paths = [None] * len(names)
+        for key, node in self.node_of.items():
+            self.paths[node] = key
+        # Nodes of each depth, deepest last, for the level-by-level rollup
+        self.levels = [np.flatnonzero(self.depth == d) for d in range(int(self.depth.max()) + 1)]
+        # Child lists in CSR form: children of node i are child_nodes[child_start[i]:child_start[i + 1]]
+        self.child_nodes = np.argsort(self.parent[1:], kind='stable') + 1
+        self.child_start = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.parent[1:], minlength=len(names)), out=self.child_start[1:])
+
+    @classmethod
+    def build(cls, conn):
+        return cls(conn.execute(PATHS_SQL).fetchall())
+
+    def __len__(self):
+        return len(self.names)
+
+    def children(self, node):
+        return self.child_nodes[self.child_start[node]:self.child_start[node + 1]]
+
+    def leaf_values(self, rows, width, dtype=np.float64):
+        """(biz_unit, department, team, 값...) 행 -> 노드 x width 배열 (팀 노드에만 값, 트리에 없는 경로는 무시)"""
+        values = np.zeros((len(self), width), dtype=dtype)
+        nodes, data = [], []
+        for row in rows:
+            node = self.node_of.get(tuple(_label(value) for value in row[:3]))
+            if node is not None:
+                nodes.append(node)
+                data.append(row[3:])
+        if nodes:
+            np.add.at(values, np.array(nodes), np.array(data, dtype=dtype))
+        return values
+
+    def rollup(self, values):
+        """하위 노드 값을 상위 노드로 누적한 새 배열 (깊이별 한 번씩, 노드 수에 선형)"""
+        values = np.array(values, copy=True)
+        for nodes in reversed(self.levels[1:]):
+            np.add.at(values, self.parent[nodes], values[nodes])
+        return values
+
+    def walk(self, max_depth=None):
+        """전위 순회 노드 번호 (부모 -> 자식, 이름순)"""
+        if max_depth is None:
+            return range(len(self))
+        return [node for node in range(len(self)) if self.depth[node] <= max_depth]
+
+    def rows(self, values, columns, max_depth=None):
+        """노드별 결과 행 (level, path, 지표...) - 출력/DataFrame 변환용"""
+        for node in self.walk(max_depth):
+            row = {'level': (['company'] + LEVELS)[self.depth[node]], 'path': ' > '.join(self.paths[node]) or ROOT}
+            row.update(zip(columns, values[node].tolist()))
+            yield row
+
+
+def completion(conn, tree):
+    """노드 x COMPLETION_COLUMNS 완료 현황 (모든 레벨)"""
+    return tree.rollup(tree.leaf_values(conn.execute(completion_sql('team')), len(COMPLETION_COLUMNS),
+                                        dtype=np.int64))
+
+
+def option_counts(conn, tree, question):
+    """(노드별 응답자 수, 노드 x 선택지 1..12 선택 수) (모든 레벨)"""
+    # Spread each (team, option, count) row into its option column
+    values = np.zeros((len(tree), N_OPTIONS + 1), dtype=np.int64)
+    for row in conn.execute(option_counts_sql(question)):
+        node = tree.node_of.get(tuple(_label(value) for value in row[:3]))
+        if node is not None:
+            values[node, row[3]] += row[4]
+    values = tree.rollup(values)
+    return values[:, 0], values[:, 1:]
+
+
+def likert_means(conn, tree):
+    """(노드 x 문항 응답 수, 노드 x 문항 평균) (모든 레벨, 응답 없으면 NaN)"""
+    n = len(LIKERT_COLUMNS)
+    values = tree.rollup(tree.leaf_values(conn.execute(likert_sql()), 2 * n))
+    counts, sums = values[:, :n], values[:, n:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return counts.astype(np.int64), np.where(counts > 0, sums / counts, np.nan)
@@ -0,0 +1,321 @@
+# Data-driven personas: mini-batch k-means over the full answer matrix (Likert
+# z-scores + Q75/Q76 option indicators). Responses are streamed once into a
+# float32 memory-mapped feature file, so memory stays at one block while every
+# k is fitted in parallel from the same file and scored by silhouette on a sample.
+import argparse
+import contextlib
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import questions
+import stream
+from queries import MULTI_SELECT
+from survey import LIKERT_COLUMNS, N_OPTIONS, item_matrix, iter_responses, responses_query
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB = PROJECT_ROOT / 'PMIK_2025.db'
+
+OPTION_COLUMNS = [f'q{question}_{option:02d}' for question in MULTI_SELECT for option in range(1, N_OPTIONS + 1)]
+FEATURES = LIKERT_COLUMNS + OPTION_COLUMNS
+
+# Rows per block when streaming over the feature file
+BLOCK_ROWS = 65_536
+
+
+class FeatureFile:
+    """응답자 x FEATURES float32 memmap (Likert 는 z-점수/결측 0, 선택지는 0/1 x choice_weight)"""
+
+    def __init__(self, path, rows, mean, std):
+        self.path = str(path)
+        self.rows = rows
+        self.mean = mean
+        self.std = std
+
+    @classmethod
+    def build(cls, conn, path, chunksize=50_000, choice_weight=1.0, progress=None):
+        """응답을 chunksize 행씩 읽어 특성 파일 작성 (corporate_id 목록도 반환, progress(완료 행, 전체 행))"""
+        query, params = responses_query()
+        rows = conn.execute(f'SELECT COUNT(*) FROM ({query})', params).fetchone()[0]
+        data = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(rows, len(FEATURES)))
+        ids = []
+        n_likert = len(LIKERT_COLUMNS)
+        total = np.zeros(n_likert)
+        squares = np.zeros(n_likert)
+        count = np.zeros(n_likert)
+        position = 0
+        for chunk in iter_responses(conn, chunksize):
+            items = item_matrix(chunk)[FEATURES].to_numpy(dtype=np.float64)
+            likert = items[:, :n_likert]
+            answered = ~np.isnan(likert)
+            total += np.nansum(likert, axis=0)
+            squares += np.nansum(likert ** 2, axis=0)
+            count += answered.sum(axis=0)
+            # Unanswered Q75/Q76 means no option chosen
+            items[:, n_likert:] = np.nan_to_num(items[:, n_likert:]) * choice_weight
+            data[position:position + len(items)] = items
+            ids.extend(chunk['corporate_id'].tolist())
+            position += len(items)
+            if progress:
+                progress(position, rows)
+
+        # Second pass over the file (not the DB): standardize Likert columns in place
+        mean = total / np.maximum(count, 1)
+        std = np.sqrt(np.maximum(squares / np.maximum(count, 1) - mean ** 2, 0))
+        std[~(std > 0)] = 1.0
+        for start in range(0, rows, BLOCK_ROWS):
+            block = data[start:start + BLOCK_ROWS, :n_likert]
+            data[start:start + BLOCK_ROWS, :n_likert] = np.nan_to_num((block - mean) / std)
+        data.flush()
+        del data
+        return cls(path, rows, mean, std), np.array(ids, dtype=object)
+
+    def open(self):
+        return np.load(self.path, mmap_mode='r')
+
+
+def _distances(X, centers):
+    """행 x 중심 제곱 거리 (float32)"""
+    return (np.einsum('ij,ij->i', X, X)[:, None] - 2 * X @ centers.T
+            + np.einsum('ij,ij->i', centers, centers)[None, :])
+
+
+def _kmeans_plus_plus(X, k, rng):
+    centers = [X[rng.integers(len(X))]]
+    closest = _distances(X, np.array(centers)).ravel()
+    for _ in range(1, k):
+        probabilities = np.maximum(closest, 0)
+        centers.append(X[rng.choice(len(X), p=probabilities / probabilities.sum())])
+        closest = np.minimum(closest, _distances(X, centers[-1][None, :]).ravel())
+    return np.array(centers, dtype=np.float32)
+
+
+class MiniBatchKMeans:
+    """미니배치 k-means (Sculley 2010): 배치마다 중심을 배치 평균 쪽으로 1/누적 수 만큼 이동"""
+
+    def __init__(self, k, batch_size=4096, epochs=3, seed=0, tol=1e-4):
+        self.k = k
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.seed = seed
+        self.tol = tol
+        self.centers = None
+        self.steps = 0
+
+    def fit(self, data, init_sample=20_000):
+        rng = np.random.default_rng(self.seed)
+        sample = np.asarray(data[np.sort(rng.choice(len(data), min(init_sample, len(data)), replace=False))])
+        self.centers = _kmeans_plus_plus(sample, self.k, rng)
+        counts = np.zeros(self.k)
+        for _ in range(self.epochs):
+            previous = self.centers.copy()
+            # Blocks in random order, rows shuffled inside each block
+            for start in rng.permutation(np.arange(0, len(data), BLOCK_ROWS)):
+                block = np.asarray(data[start:start + BLOCK_ROWS])
+                block = block[rng.permutation(len(block))]
+                for batch_start in range(0, len(block), self.batch_size):
+                    self._step(block[batch_start:batch_start + self.batch_size], counts)
+            shift = np.abs(self.centers - previous).max()
+            if shift < self.tol:
+                break
+        return self
+
+    def _step(self, batch, counts):
+        labels = self.predict(batch)
+        sizes = np.bincount(labels, minlength=self.k)
+        sums = np.zeros_like(self.centers)
+        np.add.at(sums, labels, batch)
+        counts += sizes
+        moved = sizes > 0
+        # Equivalent to moving each center by 1/count towards every assigned point, batched
+        rate = (sizes[moved] / counts[moved])[:, None].astype(np.float32)
+        self.centers[moved] += rate * (sums[moved] / sizes[moved][:, None] - self.centers[moved])
+        self.steps += 1
+
+    def predict(self, X):
+        return _distances(X, self.centers).argmin(axis=1)
+
+    def labels(self, data):
+        """전체 행 군집 번호 (블록 단위)"""
+        return np.concatenate([self.predict(np.asarray(data[start:start + BLOCK_ROWS]))
+                               for start in range(0, len(data), BLOCK_ROWS)])
+
+    def inertia(self, X):
+        return float(_distances(X, self.centers).min(axis=1).clip(0).sum())
+
+
+def silhouette(X, labels, block=2048):
+    """실루엣 계수 평균 (X 는 표본, 거리 행렬을 block 행씩 계산)"""
+    k = labels.max() + 1
+    sizes = np.bincount(labels, minlength=k).astype(np.float64)
+    if (sizes > 0).sum() < 2:
+        return np.nan
+    scores = np.empty(len(X))
+    for start in range(0, len(X), block):
+        distances = np.sqrt(np.maximum(_distances(X[start:start + block], X), 0)).astype(np.float64)
+        # Sum of distances to every cluster, then mean (excluding the point itself in its own cluster)
+        totals = np.zeros((len(distances), k))
+        for cluster in range(k):
+            totals[:, cluster] = distances[:, labels == cluster].sum(axis=1)
+        own = labels[start:start + block]
+        rows = np.arange(len(own))
+        a = totals[rows, own] / np.maximum(sizes[own] - 1, 1)
+        totals[rows, own] = np.inf
+        with np.errstate(divide='ignore', invalid='ignore'):
+            b = np.where(sizes > 0, totals / sizes, np.inf).min(axis=1)
+        scores[start:start + block] = np.where(sizes[own] > 1, (b - a) / np.maximum(a, b), 0.0)
+    return float(scores.mean())
+
+
+def _fit_k(task):
+    """k 하나 적합 + 표본 실루엣/관성 (워커에서 실행, 특성 파일은 memmap 으로 공유)"""
+    path, k, sample, batch_size, epochs, seed = task
+    data = np.load(path, mmap_mode='r')
+    started = time.perf_counter()
+    model = MiniBatchKMeans(k, batch_size, epochs, seed).fit(data)
+    X = np.asarray(data[sample])
+    return {
+        'k': k,
+        'silhouette': silhouette(X, model.predict(X)),
+        'inertia': model.inertia(X) / len(X),
+        'steps': model.steps,
+        'elapsed_sec': time.perf_counter() - started,
+        'centers': model.centers,
+    }
+
+
+def search_k(features, ks=range(2, 9), sample_size=5000, batch_size=4096, epochs=3, seed=0, workers=None,
+             on_result=None):
+    """k 후보별 모형을 병렬 적합하고 같은 표본으로 실루엣 비교 -> k 순 결과 목록
+
+    on_result(result): k 하나가 끝날 때마다 (완료 순) 호출
+    """
+    rng = np.random.default_rng(seed)
+    sample = np.sort(rng.choice(features.rows, min(sample_size, features.rows), replace=False))
+    tasks = [(features.path, k, sample, batch_size, epochs, seed) for k in ks if k < features.rows]
+    results = []
+    with contextlib.ExitStack() as stack:
+        if workers == 1:
+            finished = map(_fit_k, tasks)
+        else:
+            pool = stack.enter_context(multiprocessing.Pool(workers, initializer=stream.ignore_interrupt))
+            finished = pool.imap_unordered(_fit_k, tasks)
+        for result in finished:
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return sorted(results, key=lambda result: result['k'])
+
+
+def profile(features, labels, k):
+    """군집별 크기 + 특성 평균 (Likert 는 원 척도로 환원) -> DataFrame (군집 x [size] + FEATURES)"""
+    data = features.open()
+    sums = np.zeros((k, len(FEATURES)))
+    for start in range(0, features.rows, BLOCK_ROWS):
+        block = np.asarray(data[start:start + BLOCK_ROWS], dtype=np.float64)
+        np.add.at(sums, labels[start:start + BLOCK_ROWS], block)
+    sizes = np.bincount(labels, minlength=k)
+    means = sums / np.maximum(sizes, 1)[:, None]
+    n_likert = len(LIKERT_COLUMNS)
+    means[:, :n_likert] = means[:, :n_likert] * features.std + features.mean
+    table = pd.DataFrame(means, columns=FEATURES)
+    table.insert(0, 'size', sizes)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='응답 패턴 기반 페르소나 (미니배치 k-means)')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite DB 경로')
+    parser.add_argument('--k', type=int, nargs='+', default=list(range(2, 9)), help='k 후보 (기본: 2~8)')
+    parser.add_argument('--sample', type=int, default=5000, help='실루엣 계산 표본 크기')
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--choice-weight', type=float, default=1.0, help='Q75/Q76 선택지 지표 가중 (Likert 는 z-점수)')
+    parser.add_argument('--chunksize', type=int, default=50_000, help='DB 에서 한 번에 읽는 응답 수')
+    parser.add_argument('--workers', type=int, default=None, help='k 후보 병렬 프로세스 수 (1: 단일 프로세스)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=None, help='응답자별 페르소나 CSV 저장 경로 (corporate_id, persona)')
+    stream.add_argument(parser)
+    args = parser.parse_args(argv)
+
+    out = stream.Stream(args.output)
+    with out.cancellable():
+        run(args, out)
+
+
+def run(args, out):
+    conn = sqlite3.connect(args.db)
+    bank = questions.bank(conn)
+    option_text = {question: bank.option_list(question) for question in MULTI_SELECT}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        with out.progress('특성 행렬', unit='명') as progress:
+            features, ids = FeatureFile.build(conn, Path(tmp) / 'features.npy', args.chunksize,
+                                              args.choice_weight, progress)
+        conn.close()
+        out.section(f"특성 행렬: {features.rows:,}명 x {len(FEATURES)}열 (float32, {time.perf_counter() - started:.1f}초)",
+                    data={'rows': features.rows, 'columns': len(FEATURES),
+                          'elapsed_sec': round(time.perf_counter() - started, 2)})
+        if features.rows < 2:
+            sys.exit("응답자가 2명 미만이라 군집을 만들 수 없습니다")
+
+        if not out.json:
+            out.section(f"\n{'k':>3} {'실루엣':>8} {'관성/명':>10} {'배치 수':>8} {'시간':>8}")
+        with out.progress('k 후보 적합', total=len([k for k in args.k if k < features.rows])) as progress:
+            def on_result(result):
+                # Rows appear in completion order; the chosen k is announced once all are in
+                fields = {key: value for key, value in result.items() if key != 'centers'}
+                out.section(f"{result['k']:>3} {result['silhouette']:>8.3f} {result['inertia']:>10.2f} "
+                            f"{result['steps']:>8} {result['elapsed_sec']:>7.1f}s", data=fields)
+                progress.advance()
+
+            results = search_k(features, args.k, args.sample, args.batch_size, args.epochs, args.seed, args.workers,
+                               on_result)
+        best = max(results, key=lambda result: np.nan_to_num(result['silhouette'], nan=-1))
+        out.section(f"\n선택: k={best['k']} (표본 실루엣 최대)", data={'k': best['k']})
+
+        model = MiniBatchKMeans(best['k'])
+        model.centers = best['centers']
+        labels = model.labels(features.open())
+        table = profile(features, labels, best['k'])
+    overall = table[LIKERT_COLUMNS].mul(table['size'], axis=0).sum() / table['size'].sum()
+
+    for persona, row in table.iterrows():
+        diff = (row[LIKERT_COLUMNS] - overall).sort_values()
+        high, low = diff[::-1][:3], diff[:3]
+        choices = {}
+        for question in MULTI_SELECT:
+            columns = [column for column in OPTION_COLUMNS if column.startswith(f'q{question}_')]
+            top = row[columns].sort_values(ascending=False)[:2] / args.choice_weight * 100
+            choices[question] = [(option_text[question].get(int(column[-2:]), column), share)
+                                 for column, share in top.items()]
+        lines = ["  높은 문항: " + ", ".join(f"{item} {value:+.2f}" for item, value in high.items()),
+                 "  낮은 문항: " + ", ".join(f"{item} {value:+.2f}" for item, value in low.items())]
+        lines += [f"  Q{question}: " + ", ".join(f"{text} {share:.0f}%" for text, share in top)
+                  for question, top in choices.items()]
+        out.section(f"\n[페르소나 {persona + 1}] {row['size']:,.0f}명 ({row['size'] / features.rows * 100:.1f}%)",
+                    lines, data={
+                        'persona': persona + 1,
+                        'size': int(row['size']),
+                        'share': round(row['size'] / features.rows * 100, 2),
+                        'high': {item: round(value, 3) for item, value in high.items()},
+                        'low': {item: round(value, 3) for item, value in low.items()},
+                        **{f'q{question}': {text: round(share, 1) for text, share in top}
+                           for question, top in choices.items()},
+                    })
+
+    if args.out:
+        pd.DataFrame({'corporate_id': ids, 'persona': labels + 1}).to_csv(args.out, index=False, encoding='utf-8-sig')
+        out.section(f"\n✓ 저장: {args.out}", data={'path': args.out})
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,317 @@
+import argparse
+import json
+import os
+import re
+import runpy
+import sqlite3
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import connections
+import profiling
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+DEFAULT_DB = PROJECT_ROOT / 'PMIK_2025.db'
+
+# Report suite whose SQL is audited
+REPORT_SCRIPTS = [
+    'analyze_department_responses.py',
+    'analyze_tenure_responses.py',
+    'analyze_rank_responses.py',
+    'analyze_q75_motivation.py',
+    'analyze_q76_hindrance.py',
+    'compare_q75_q76_by_tenure.py',
+]
+
+# Beyond this many referenced columns an index is suggested on the filter columns only
+MAX_COVERING_COLUMNS = 6
+
+TABLE_REF = re.compile(r'(?:FROM|JOIN|,)\s+("?[\w.]+"?)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+COMMA_JOIN = re.compile(r'\bFROM\s+"?\w+"?(?:\s+(?:AS\s+)?\w+)?\s*,', re.IGNORECASE)
+AUTOMATIC_INDEX = re.compile(r'^SEARCH (\S+) USING AUTOMATIC (?:PARTIAL )?COVERING INDEX \((.*)\)')
+CLAUSE_END = re.compile(r'\b(GROUP\s+BY|ORDER\s+BY|LIMIT|HAVING)\b', re.IGNORECASE)
+
+
+def _run_library_sections(conn):
+    """report.py / survey.py 가 실행하는 쿼리 (벤치마크 섹션과 동일)"""
+    import report
+    from survey import load_responses
+
+    load_responses(conn)
+    for level in report.COMPLETION_LEVELS:
+        report.completion_by(conn, level)
+    for question in (75, 76):
+        report.option_list(conn, question)
+        report.option_frequency(conn, question)
+        report.top_combinations(conn, question)
+
+
+def collect_queries(database=DEFAULT_DB, scripts=REPORT_SCRIPTS):
+    """리포트 스크립트를 실행해 실제 발행되는 SQL 문장 수집 ({문장: 출처})"""
+    was_enabled = profiling.enabled()
+    if was_enabled:
+        profiling.disable()
+    profiler = profiling.enable()
+
+    sources = {}
+    previous = os.environ.get(connections.ENV_VAR)
+    try:
+        # The scripts open the database named by PMIK_DB (connections.resolve)
+        os.environ[connections.ENV_VAR] = str(Path(database).resolve())
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:
+            for script in scripts:
+                start = len(profiler.queries)
+                with redirect_stdout(devnull):
+                    runpy.run_path(str(SCRIPTS_DIR / script), run_name='__main__')
+                profiler.finish()
+                for query in profiler.queries[start:]:
+                    sources.setdefault(query['statement'] or query['sql'], script)
+
+        start = len(profiler.queries)
+        conn = profiling.connect(database)
+        _run_library_sections(conn)
+        conn.close()
+        for query in profiler.queries[start:]:
+            sources.setdefault(query['statement'] or query['sql'], 'report.py')
+    finally:
+        if previous is None:
+            os.environ.pop(connections.ENV_VAR, None)
+        else:
+            os.environ[connections.ENV_VAR] = previous
+        profiling.disable()
+        if was_enabled:
+            profiling.enable()
+
+    return {sql: source for sql, source in sources.items()
+            if sql.lstrip().upper().startswith(('SELECT', 'WITH'))}
+
+
+def _table_columns(conn):
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    return {table: [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')] for table in tables}
+
+
+def _aliases(sql, schema):
+    """FROM/JOIN 절의 별칭 -> 테이블 매핑"""
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        table = table.strip('"')
+        if table in schema:
+            aliases[alias or table] = table
+            aliases[table] = table
+    return aliases
+
+
+def _column_refs(text, alias, columns, single_table):
+    """text 에서 alias(단일 테이블이면 접두어 없이도) 로 참조된 열 -> [(위치, 열, 참조 끝 위치)]"""
+    refs = []
+    for col in columns:
+        names = [re.escape(f'"{col}"')]
+        if re.fullmatch(r'\w+', col):
+            names.append(r'\b' + re.escape(col) + r'\b')
+        patterns = [rf'\b{re.escape(alias)}\.{name}' for name in names]
+        if single_table:
+            patterns += [rf'(?<![.\w"]){name}' for name in names]
+        for pattern in patterns:
+            refs.extend((m.start(), col, m.end()) for m in re.finditer(pattern, text))
+    return sorted(refs)
+
+
+def _filter_columns(where, alias, columns, single_table):
+    """WHERE 절에서 인덱스로 좁힐 수 있는 열: 상수 동등 비교 열 먼저, 범위 비교 열 다음"""
+    equality, ranges = [], []
+    for _, col, end in _column_refs(where, alias, columns, single_table):
+        rest = where[end:].lstrip()
+        if re.match(r"(=|IN\s*\()\s*(?!\w+\.)", rest, re.IGNORECASE):
+            equality.append(col)
+        elif re.match(r"(<|>|BETWEEN\b|LIKE\s+'[^%_])", rest, re.IGNORECASE):
+            ranges.append(col)
+    equality = list(dict.fromkeys(equality))
+    ranges = [c for c in dict.fromkeys(ranges) if c not in equality]
+    return equality, ranges[:1]
+
+
+def _where_text(sql):
+    """바깥 WHERE 조건 부분만 추출"""
+    match = re.search(r'\bWHERE\b(.*)', sql, re.IGNORECASE | re.DOTALL)
+    if not match:
+        return ''
+    end = CLAUSE_END.search(match.group(1))
+    return match.group(1)[:end.start()] if end else match.group(1)
+
+
+def _normalize(sql):
+    """리터럴을 ? 로 바꾼 쿼리 형태 (값만 다른 쿼리는 한 번만 점검)"""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'(?<![\w."])\d+(?:\.\d+)?\b', '?', sql)
+    return ' '.join(sql.split())
+
+
+def _index_sql(table, columns):
+    name = 'idx_' + table + '_' + '_'.join(re.sub(r'\W+', '', c).lower() or 'col' for c in columns)
+    cols = ', '.join(f'"{c}"' for c in columns)
+    return f'CREATE INDEX IF NOT EXISTS {name} ON "{table}" ({cols})'
+
+
+def explain(conn, sql):
+    """EXPLAIN QUERY PLAN 결과 [(id, parent, detail)]"""
+    return [(row[0], row[1], row[3]) for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+
+
+def audit_query(conn, sql, schema):
+    """쿼리 하나의 실행 계획 점검 결과"""
+    plan = explain(conn, sql)
+    aliases = _aliases(sql, schema)
+    single_table = len(set(aliases.values())) == 1
+    where = _where_text(sql)
+
+    issues = []
+    suggestions = []
+    full_scans = {}
+
+    for _, parent, detail in plan:
+        if detail.startswith('SCAN ') and 'INDEX' not in detail:
+            alias = detail.split()[1]
+            if alias in aliases:
+                full_scans.setdefault(parent, []).append(alias)
+                issues.append(('full_scan', detail))
+        elif 'TEMP B-TREE' in detail:
+            issues.append(('temp_btree', detail))
+
+        auto = AUTOMATIC_INDEX.match(detail)
+        if auto:
+            alias, terms = auto.groups()
+            issues.append(('automatic_index', detail))
+            table = aliases.get(alias)
+            if table:
+                cols = [re.split(r'[=<>]', term.strip())[0].strip() for term in terms.split(' AND ')]
+                suggestions.append(_index_sql(table, [c for c in cols if c in schema[table]]))
+
+    if COMMA_JOIN.search(sql) or any(len(set(scans)) > 1 for scans in full_scans.values()):
+        issues.append(('cartesian_join', 'FROM 절 콤마 조인 / 인덱스 없는 중첩 전체 스캔'))
+
+    for scans in full_scans.values():
+        for alias in dict.fromkeys(scans):
+            table = aliases[alias]
+            equality, ranges = _filter_columns(where, alias, schema[table], single_table)
+            if not equality and not ranges:
+                continue
+            # Append the other referenced columns when few enough to make the index covering
+            keys = equality + ranges
+            used = dict.fromkeys(col for _, col, _ in _column_refs(sql, alias, schema[table], single_table))
+            extra = [c for c in used if c not in keys]
+            columns = keys + extra if len(keys) + len(extra) <= MAX_COVERING_COLUMNS else keys
+            suggestions.append(_index_sql(table, columns))
+
+    return {
+        'sql': ' '.join(sql.split()),
+        'plan': [detail for _, _, detail in plan],
+        'issues': [{'kind': kind, 'detail': detail} for kind, detail in issues],
+        'suggestions': list(dict.fromkeys(suggestions)),
+    }
+
+
+def verify(database, findings):
+    """제안 인덱스를 메모리 복사본에 적용한 뒤 남는 문제 수 재확인"""
+    source = sqlite3.connect(database)
+    conn = sqlite3.connect(':memory:')
+    source.backup(conn)
+    source.close()
+
+    for statement in dict.fromkeys(s for f in findings for s in f['suggestions']):
+        conn.execute(statement)
+    conn.execute('ANALYZE')
+
+    schema = _table_columns(conn)
+    for finding in findings:
+        after = audit_query(conn, finding['sql'], schema)
+        finding['issues_after_index'] = after['issues']
+        finding['plan_after_index'] = after['plan']
+    conn.close()
+    return findings
+
+
+def audit(database=DEFAULT_DB, queries=None, check=False):
+    """수집한 모든 쿼리에 대해 실행 계획 점검 (check=True 면 제안 인덱스 효과 검증)"""
+    if queries is None:
+        queries = collect_queries()
+
+    conn = sqlite3.connect(database)
+    schema = _table_columns(conn)
+    findings = {}
+    for sql, source in queries.items():
+        shape = _normalize(sql)
+        if shape in findings:
+            findings[shape]['variants'] += 1
+            continue
+        finding = audit_query(conn, sql, schema)
+        finding['source'] = source
+        finding['variants'] = 1
+        findings[shape] = finding
+    findings = list(findings.values())
+    conn.close()
+
+    if check:
+        verify(database, findings)
+    return findings
+
+
+def print_findings(findings):
+    flagged = [f for f in findings if f['issues']]
+    counts = {}
+    for finding in flagged:
+        for issue in finding['issues']:
+            counts[issue['kind']] = counts.get(issue['kind'], 0) + 1
+
+    print(f"\n점검 쿼리: {len(findings)}개 | 문제 있는 쿼리: {len(flagged)}개")
+    for kind, count in sorted(counts.items()):
+        print(f"  - {kind}: {count}건")
+
+    for idx, finding in enumerate(flagged, 1):
+        variants = f" (값만 다른 쿼리 {finding['variants']}개)" if finding['variants'] > 1 else ''
+        print(f"\n[{idx}] {finding['source']}{variants}")
+        print(f"  SQL: {finding['sql'][:150]}")
+        for detail in finding['plan']:
+            print(f"    | {detail}")
+        for issue in finding['issues']:
+            print(f"  ✗ {issue['kind']}: {issue['detail']}")
+        if 'issues_after_index' in finding:
+            print(f"  → 인덱스 적용 후 문제: {len(finding['issues'])}건 → {len(finding['issues_after_index'])}건")
+
+    suggestions = list(dict.fromkeys(s for f in findings for s in f['suggestions']))
+    if suggestions:
+        print("\n" + "=" * 80)
+        print("권장 인덱스")
+        print("=" * 80)
+        for statement in suggestions:
+            print(f"{statement};")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='리포트 SQL 실행 계획(EXPLAIN QUERY PLAN) 점검')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='실행 계획을 확인할 DB (예: 합성 100만 명 DB)')
+    parser.add_argument('--verify', action='store_true', help='메모리 복사본에 권장 인덱스 적용 후 재점검')
+    parser.add_argument('--json', default=None, help='점검 결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("리포트 SQL 실행 계획 점검")
+    print("=" * 80)
+
+    findings = audit(args.db, check=args.verify)
+    print_findings(findings)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(findings, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n결과 저장: {args.json}")
+
+    print("\n" + "=" * 80)
+    print("✓ 점검 완료")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
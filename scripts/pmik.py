@@ -0,0 +1,505 @@
+import os
+import sqlite3
+import sys
+
+import connections
+import sql_backend
+from connections import ENV_VAR
+from queries import ALL_QUALITY_FLAGS, COMPLETION_LEVELS, MULTI_SELECT, OPTION_LIST_SQL, completion_sql
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+DEFAULT_DB = os.path.join(PROJECT_ROOT, 'PMIK_2025.db')
+
+FULL_REPORTS = {
+    'completion': ['analyze_department_responses.py', 'analyze_tenure_responses.py',
+                   'analyze_rank_responses.py'],
+    'q75': ['analyze_q75_motivation.py'],
+    'q76': ['analyze_q76_hindrance.py'],
+    'compare': ['compare_q75_q76_by_tenure.py'],
+}
+
+# Mirrors respondent_index.ATTRIBUTES (not imported so numpy stays lazy)
+DRILL_ATTRIBUTES = ['biz_unit', 'department', 'team', 'rank', 'tenure_category', 'status']
+
+# Summary cache tables live in a sidecar file next to the database (see cache_path),
+# so read-only commands never write into the survey DB itself
+CACHE_TABLES = """
+CREATE TABLE IF NOT EXISTS cache.pmik_cache_meta (
+    name TEXT PRIMARY KEY,
+    source_counter INTEGER,
+    built_at TEXT
+);
+CREATE TABLE IF NOT EXISTS cache.pmik_cache_completion (
+    level TEXT,
+    key TEXT,
+    total_members INTEGER,
+    completed_responses INTEGER,
+    incomplete_responses INTEGER,
+    no_response INTEGER
+);
+CREATE TABLE IF NOT EXISTS cache.pmik_cache_frequency (
+    question INTEGER,
+    option_number TEXT,
+    option_text TEXT,
+    selection_count INTEGER,
+    percentage REAL
+);
+"""
+
+
+def cache_path(path):
+    """요약 캐시 사이드카 파일 경로 (PMIK_2025.db -> PMIK_2025.pmik-cache.db)"""
+    return os.path.splitext(path)[0] + '.pmik-cache.db'
+
+
+def _change_counter(path):
+    """SQLite 파일 헤더의 변경 카운터 (쓰기 트랜잭션마다 1 증가)"""
+    with open(path, 'rb') as f:
+        header = f.read(28)
+    return int.from_bytes(header[24:28], 'big')
+
+
+def _cache_fresh(conn, path):
+    try:
+        row = conn.execute("SELECT source_counter FROM cache.pmik_cache_meta WHERE name = 'summary'").fetchone()
+    except sqlite3.OperationalError:
+        return False
+    # WAL commits do not bump the header counter, so WAL databases are never trusted
+    journal = conn.execute('PRAGMA main.journal_mode').fetchone()[0]
+    return row is not None and journal != 'wal' and row[0] == _change_counter(path)
+
+
+def _open_with_cache(path):
+    """DB 는 읽기 전용으로 열고 캐시 사이드카를 'cache' 로 연결"""
+    conn = connections.connect(path, readonly=True, isolation_level=None)
+    try:
+        conn.execute('ATTACH DATABASE ? AS cache', (cache_path(path),))
+    except sqlite3.OperationalError:
+        conn.close()
+        raise
+    return conn
+
+
+def build_cache(conn, path):
+    """완료율/선택지 빈도 요약 테이블 재생성 (sqlite3 만 사용, 원본 DB 는 읽기만 함)"""
+    # Read before computing: a write to the source during the build leaves the cache stale
+    counter = _change_counter(path)
+    conn.execute('BEGIN')
+    try:
+        for statement in CACHE_TABLES.split(';'):
+            if statement.strip():
+                conn.execute(statement)
+        conn.execute('DELETE FROM cache.pmik_cache_completion')
+        conn.execute('DELETE FROM cache.pmik_cache_frequency')
+
+        for level, columns in COMPLETION_LEVELS.items():
+            rows = conn.execute(completion_sql(level)).fetchall()
+            n = len(columns)
+            conn.executemany(
+                'INSERT INTO cache.pmik_cache_completion VALUES (?, ?, ?, ?, ?, ?)',
+                [(level, ' > '.join('N/A' if v is None else str(v) for v in row[:n])) + tuple(row[n:])
+                 for row in rows],
+            )
+
+        for question in MULTI_SELECT:
+            conn.executemany('INSERT INTO cache.pmik_cache_frequency VALUES (?, ?, ?, ?, ?)',
+                             [(question,) + tuple(row) for row in sql_backend.option_frequency(conn, question)])
+
+        conn.execute(
+            "INSERT OR REPLACE INTO cache.pmik_cache_meta VALUES ('summary', ?, datetime('now', 'localtime'))",
+            (counter,),
+        )
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def _connect(path):
+    """읽기 전용 연결 (없는 경로는 빈 DB 를 만들지 않고 FileNotFoundError)"""
+    # connections.resolve reads relative paths from the project root; --db is relative to the cwd
+    return connections.connect(os.path.abspath(path), readonly=True)
+
+
+def _summary_conn(path, use_cache=True):
+    """(연결, 캐시 사용 여부). 캐시가 오래됐으면 사이드카에 재생성, 만들 수 없으면 캐시 없이 사용"""
+    path = os.path.abspath(path)
+    if not use_cache:
+        return _connect(path), False
+    try:
+        conn = _open_with_cache(path)
+    except sqlite3.OperationalError:
+        return _connect(path), False
+    if not _cache_fresh(conn, path):
+        try:
+            build_cache(conn, path)
+        except sqlite3.OperationalError:
+            return conn, False
+    return conn, True
+
+
+def _bar(rate):
+    length = int(rate / 5)
+    return "█" * length + "░" * (20 - length)
+
+
+def cmd_schema(args):
+    conn = _connect(args.db)
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'pmik_cache_%' ORDER BY name"
+    )]
+    print('Tables:')
+    for table in tables:
+        count = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        print(f'  - {table} ({count}행)')
+    if args.columns:
+        print('\nSchema:')
+        for table in tables:
+            print(f'\n{table}:')
+            for col in conn.execute(f'PRAGMA table_info("{table}")'):
+                print(f'  {col[1]} ({col[2]})')
+    conn.close()
+
+
+def cmd_completion(args):
+    if args.approx:
+        return cmd_completion_approx(args)
+    conn, cached = _summary_conn(args.db, not args.no_cache)
+    if cached:
+        rows = conn.execute(
+            'SELECT key, total_members, completed_responses, incomplete_responses, no_response '
+            'FROM cache.pmik_cache_completion WHERE level = ? ORDER BY key', (args.by,)
+        ).fetchall()
+    else:
+        n = len(COMPLETION_LEVELS[args.by])
+        rows = [(' > '.join('N/A' if v is None else str(v) for v in row[:n]),) + tuple(row[n:])
+                for row in conn.execute(completion_sql(args.by))]
+    conn.close()
+
+    total = sum(r[1] for r in rows)
+    completed = sum(r[2] for r in rows)
+    print(f"전체: {completed}/{total}명 ({completed / total * 100 if total else 0:.1f}%)\n")
+    for key, members, done, incomplete, no_resp in rows:
+        rate = done / members * 100 if members else 0
+        print(f"{key:40s} [{_bar(rate)}] {rate:5.1f}% ({done}/{members}명, 미완료 {incomplete}, 미응답 {no_resp})")
+
+
+def _weights(conn, args, exclude=0):
+    """--weighted 이면 구성원 분포 기준 응답자 가중치 (pandas/numpy 는 이때만 로드)
+
+    exclude: --clean 의 제외 비트. 레이킹도 집계와 같은 정제된 응답자 집합으로 계산
+    """
+    if not args.weighted:
+        return None
+    import weighting
+
+    weights = weighting.rake_weights(conn, exclude=exclude)
+    print(f"가중치 적용: {', '.join(weights.attrs['margins'])} 기준 레이킹 "
+          f"(유효 표본 {weights.attrs['effective_n']:.1f}명 / {len(weights)}명)\n")
+    return weights
+
+
+def _exclude(conn, args):
+    """--clean 이면 품질 플래그 행 제외 비트 (validate.py 결과가 없으면 종료)"""
+    if not args.clean:
+        return 0
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'pmik_quality'").fetchone():
+        conn.close()
+        sys.exit("품질 검증 결과(pmik_quality)가 없습니다. 먼저 validate.py 를 실행하세요.")
+    flagged, = conn.execute('SELECT COUNT(*) FROM pmik_quality').fetchone()
+    print(f"품질 플래그 응답 {flagged}건 제외 (validate.py)\n")
+    return ALL_QUALITY_FLAGS
+
+
+def cmd_segment_top_n(args, question):
+    conn = _connect(args.db)
+    exclude = _exclude(conn, args)
+    weights = _weights(conn, args, exclude)
+    top = args.top or 3
+    print(f"Q{question} {args.by}별 Top {top} 선택지")
+    digits = 0 if weights is None else 1
+    current = None
+    for row in sql_backend.segment_top_n(conn, question, args.by, top, weights, exclude):
+        if row['value'] != current:
+            current = row['value']
+            print(f"\n{current} ({row['respondents']:.{digits}f}명)")
+        print(f"  {row['rank']}. [{row['option_number']:>2}] {row['option_text'] or '':<35} "
+              f"{row['count']:>5.{digits}f}명 ({row['percentage']:5.1f}%)")
+    conn.close()
+
+
+def cmd_frequency(args):
+    question = int(args.command[1:])
+    if args.approx:
+        return cmd_frequency_approx(args, question)
+    if args.by:
+        return cmd_segment_top_n(args, question)
+    # Weighted or cleaned counts depend on their inputs, so they are never cached
+    conn, cached = _summary_conn(args.db, not (args.no_cache or args.weighted or args.clean))
+    if cached:
+        rows = conn.execute(
+            'SELECT option_number, option_text, selection_count, percentage '
+            'FROM cache.pmik_cache_frequency WHERE question = ? ORDER BY selection_count DESC', (question,)
+        ).fetchall()
+    else:
+        exclude = _exclude(conn, args)
+        rows = [tuple(row) for row in sql_backend.option_frequency(conn, question, _weights(conn, args, exclude), exclude)]
+    conn.close()
+
+    print(f"Q{question} 선택지별 빈도\n")
+    print(f"{'순위':<6} {'번호':<6} {'선택지':<35} {'선택 수':<10} {'비율':<10}")
+    print("-" * 80)
+    for rank, (number, text, count, percentage) in enumerate(rows[:args.top or 12], 1):
+        count = f'{count:.1f}' if args.weighted else count
+        print(f"{rank:<6} {number:<6} {text:<35} {count:<10} {percentage:>5.1f}%   {'█' * int(percentage / 5)}")
+
+
+def cmd_drill(args):
+    from respondent_index import RespondentIndex
+
+    conn = _connect(args.db)
+    index = RespondentIndex.build(conn)
+    conn.close()
+
+    filters = {name: getattr(args, name) for name in DRILL_ATTRIBUTES if getattr(args, name)}
+    positions = index.positions(**filters)
+    condition = ' | '.join(f"{name}={','.join(values)}" for name, values in filters.items()) or '전체'
+    print(f"조건: {condition}")
+    print(f"해당 인원: {len(positions)}명 / {len(index)}명")
+
+    if args.count_by:
+        print(f"\n{args.count_by}별 인원:")
+        for value, n in sorted(index.counts_by(args.count_by, positions).items()):
+            print(f"  {value:30s} {n:>6}명")
+
+    if args.limit:
+        print()
+        for row in index.rows(positions[:args.limit]):
+            print(f"  [{row['status']}] {row['tenure'] or 'N/A':12s} | {row['biz_unit']:8s} > "
+                  f"{row['department']:25s} | {row['rank']}")
+        if len(positions) > args.limit:
+            print(f"  ... 외 {len(positions) - args.limit}명")
+
+
+def cmd_xtab(args):
+    from crossfilter import CrossFilter
+
+    question = int(args.question[1:])
+    conn = _connect(args.db)
+    engine = CrossFilter.build(conn)
+    conn.close()
+
+    try:
+        mask = engine.where(args.where)
+    except ValueError as e:
+        sys.exit(f"조건식 오류: {e}")
+
+    print(f"조건: {args.where or '전체'}")
+    print(f"해당 인원: {engine.count(mask)}명 / Q{question} 응답자 {engine.option_counts(question, mask)[0]}명")
+    if args.by:
+        groups = engine.crosstab(question, args.by, mask, args.top)
+    else:
+        groups = {None: engine.top_options(question, mask, args.top)}
+
+    for value, rows in groups.items():
+        if value is not None:
+            print(f"\n{value} ({rows[0]['respondents']}명)")
+        else:
+            print()
+        for row in rows:
+            print(f"  {row['rank']}. [{row['option_number']:>2}] {row['option_text'] or '':<35} "
+                  f"{row['count']:>5}명 ({row['percentage']:5.1f}%)")
+
+
+def cmd_tree(args):
+    import orgtree
+
+    conn = _connect(args.db)
+    tree = orgtree.OrgTree.build(conn)
+    status = orgtree.completion(conn, tree)
+    if args.question:
+        question = int(args.question[1:])
+        respondents, counts = orgtree.option_counts(conn, tree, question)
+        option_text = {int(number): text for number, text in conn.execute(OPTION_LIST_SQL, (float(question),))}
+    conn.close()
+
+    for node in tree.walk(args.depth):
+        members, done = status[node, 0], status[node, 1]
+        rate = done / members * 100 if members else 0
+        line = f"{'  ' * tree.depth[node]}{tree.names[node]:{40 - 2 * tree.depth[node]}s} " \
+               f"[{_bar(rate)}] {rate:5.1f}% ({done}/{members}명)"
+        if args.question and respondents[node]:
+            top = int(counts[node].argmax())
+            line += f" | Q{question} 1위 [{top + 1:>2}] {option_text.get(top + 1) or ''} " \
+                    f"{counts[node, top] / respondents[node] * 100:.1f}%"
+        print(line)
+
+
+def _panel(args):
+    """--approx 스케치 파일들을 합친 PanelSketch (numpy 는 이때만 로드)"""
+    import sketches
+
+    panel = sketches.PanelSketch.load_all(args.approx)
+    hll_error, cm_error = panel.error_bounds()
+    print(f"근사 집계: 스케치 {len(panel.sources)}개 (인원 수 상대 표준오차 ±{hll_error * 100:.1f}%, "
+          f"선택 수 과대 추정 최대 {cm_error * 100:.2f}% x 전체 선택 수)\n")
+    return sketches, panel
+
+
+def cmd_completion_approx(args):
+    sketches, panel = _panel(args)
+    for _, total, completed, rate in panel.completion_rates(sketches.ALL):
+        print(f"전체: 약 {completed:,.0f}/{total:,.0f}명 ({rate:.1f}%)\n")
+    for key, members, done, rate in panel.completion_rates(args.by):
+        print(f"{key:40s} [{_bar(rate)}] {rate:5.1f}% (약 {done:,.0f}/{members:,.0f}명)")
+
+
+def cmd_frequency_approx(args, question):
+    if args.weighted or args.clean:
+        sys.exit("--approx 는 --weighted / --clean 과 함께 쓸 수 없습니다 (정확 집계를 사용하세요)")
+    sketches, panel = _panel(args)
+    option_text = panel.option_text.get(question, {})
+    if args.by:
+        top = args.top or 3
+        print(f"Q{question} {args.by}별 Top {top} 선택지 (근사)")
+        current = None
+        for value, rank, option, count, percentage, answered in panel.top_options(question, args.by, top):
+            if value != current:
+                current = value
+                print(f"\n{current} ({answered:,}명)")
+            print(f"  {rank}. [{option:>2}] {option_text.get(option, ''):<35} 약 {count:>7,}명 ({percentage:5.1f}%)")
+        return
+
+    print(f"Q{question} 선택지별 빈도 (근사)\n")
+    print(f"{'순위':<6} {'번호':<6} {'선택지':<35} {'선택 수':<10} {'비율':<10}")
+    print("-" * 80)
+    for _, rank, option, count, percentage, _ in panel.top_options(question, sketches.ALL, args.top or 12):
+        print(f"{rank:<6} {option:<6} {option_text.get(option, ''):<35} {count:<10,} {percentage:>5.1f}%   "
+              f"{'█' * int(percentage / 5)}")
+
+
+def cmd_cache(args):
+    path = os.path.abspath(args.db)
+    conn = _open_with_cache(path)
+    build_cache(conn, path)
+    conn.close()
+    print(f"✓ 요약 캐시 재생성: {cache_path(path)}")
+
+
+def cmd_freeze(args):
+    import snapshot
+
+    rows = snapshot.freeze(os.path.abspath(args.db), args.out, args.chunksize)
+    print(f"✓ 스냅샷 고정: {args.out} (응답 {rows:,}행, 원본 {args.db})")
+
+
+def run_full_report(name, db):
+    """기존 분석 스크립트 실행 (이때 pandas 를 불러옴)"""
+    import runpy
+
+    # The analysis scripts open the database named by PMIK_DB (connections.resolve)
+    previous = os.environ.get(ENV_VAR)
+    os.environ[ENV_VAR] = os.path.abspath(db)
+    try:
+        for script in FULL_REPORTS[name]:
+            runpy.run_path(os.path.join(SCRIPTS_DIR, script), run_name='__main__')
+    finally:
+        if previous is None:
+            del os.environ[ENV_VAR]
+        else:
+            os.environ[ENV_VAR] = previous
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='pmik', description='PMIK EOS 분석 CLI')
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite DB 경로')
+    parser.add_argument('--profile', action='store_true', help='프로파일링 요약 출력 (stderr)')
+    parser.add_argument('--trace', default=None, help='Chrome trace JSON 저장 경로 (--profile 포함)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('schema', help='테이블 목록/스키마')
+    p.add_argument('--columns', action='store_true', help='열 정보까지 출력')
+    p.set_defaults(func=cmd_schema)
+
+    p = sub.add_parser('completion', help='조직 단위별 완료율')
+    p.add_argument('--by', choices=list(COMPLETION_LEVELS), default='biz_unit')
+    p.add_argument('--full', action='store_true', help='부서/근속/직급 전체 리포트 실행')
+    p.add_argument('--no-cache', action='store_true', help='요약 캐시를 쓰지 않고 직접 계산')
+    p.add_argument('--approx', nargs='+', metavar='SKETCH', default=None,
+                   help='스케치 파일로 근사 집계 (sketches.py build, 여러 개면 합침)')
+    p.set_defaults(func=cmd_completion)
+
+    for question in MULTI_SELECT:
+        p = sub.add_parser(f'q{question}', help=f'Q{question} 선택지 빈도')
+        p.add_argument('--top', type=int, default=None, help='출력할 선택지 수 (기본: 전체 12, --by 지정 시 3)')
+        p.add_argument('--by', choices=list(sql_backend.SEGMENT_SQL), default=None,
+                       help='세그먼트별 Top N (SQL 집계)')
+        p.add_argument('--full', action='store_true', help='전체 분석 리포트 실행')
+        p.add_argument('--no-cache', action='store_true', help='요약 캐시를 쓰지 않고 직접 계산')
+        p.add_argument('--weighted', action='store_true', help='구성원 분포(사업부/직급/근속) 기준 가중 빈도')
+        p.add_argument('--clean', action='store_true', help='품질 플래그 응답 제외 (validate.py 실행 후)')
+        p.add_argument('--approx', nargs='+', metavar='SKETCH', default=None,
+                       help='스케치 파일로 근사 집계 (sketches.py build, 여러 개면 합침)')
+        p.set_defaults(func=cmd_frequency)
+
+    p = sub.add_parser('compare', help='Q75 vs Q76 근속연수별 비교 리포트')
+    p.set_defaults(func=None, full=True)
+
+    p = sub.add_parser('drill', help='세그먼트 조건별 인원 드릴다운 (역색인)')
+    for name in DRILL_ATTRIBUTES:
+        p.add_argument(f"--{name.replace('_', '-')}", dest=name, nargs='+', metavar='VALUE',
+                       help='여러 값은 OR, 조건 사이는 AND')
+    p.add_argument('--count-by', default=None,
+                   choices=DRILL_ATTRIBUTES,
+                   help='결과를 속성 값별 인원 수로 요약')
+    p.add_argument('--limit', type=int, default=50, help='상세 목록 최대 행 수 (0: 생략)')
+    p.set_defaults(func=cmd_drill)
+
+    p = sub.add_parser('xtab', help='임의 조건 x Q75/Q76 Top N (비트맵 교차 필터)')
+    p.add_argument('question', choices=[f'q{question}' for question in MULTI_SELECT])
+    p.add_argument('--where', default=None,
+                   help="조건식 (예: \"rank=B2,B3 and biz_unit=Sales and not tenure_category='1년 미만'\")")
+    p.add_argument('--by', choices=DRILL_ATTRIBUTES, default=None, help='속성 값별로 나눠 출력')
+    p.add_argument('--top', type=int, default=3)
+    p.set_defaults(func=cmd_xtab)
+
+    p = sub.add_parser('tree', help='조직 트리 (전체 > 사업부 > 부서 > 팀) 완료율 롤업')
+    p.add_argument('--depth', type=int, default=None, help='출력할 최대 깊이 (1: 사업부, 2: 부서, 3: 팀)')
+    p.add_argument('--question', choices=[f'q{question}' for question in MULTI_SELECT], default=None,
+                   help='노드별 1위 선택지 함께 출력')
+    p.set_defaults(func=cmd_tree)
+
+    p = sub.add_parser('cache', help='요약 캐시 재생성')
+    p.set_defaults(func=cmd_cache)
+
+    p = sub.add_parser('freeze', help='마감된 웨이브를 memmap 스냅샷 파일로 고정 (snapshot.py)')
+    p.add_argument('out', help='스냅샷 파일 경로 (예: PMIK_2025.snap)')
+    p.add_argument('--chunksize', type=int, default=50_000)
+    p.set_defaults(func=cmd_freeze)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile or args.trace:
+        import profiling
+        profiling.enable(args.trace)
+
+    try:
+        if getattr(args, 'full', False):
+            run_full_report(args.command, args.db)
+        else:
+            args.func(args)
+    except FileNotFoundError as exc:
+        # A mistyped --db must not look like an empty survey to callers
+        print(f"✗ {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
@@ -0,0 +1,293 @@
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from functools import wraps
+
+import connections
+
+# PMIK_PROFILE=1            -> summary table on stderr at exit
+# PMIK_PROFILE=trace.json   -> summary table + Chrome trace (chrome://tracing, Perfetto)
+ENV_VAR = 'PMIK_PROFILE'
+
+_NULL = nullcontext()
+_profiler = None
+
+
+class _Section:
+    """with 블록 하나의 측정 구간"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.begin_section(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.end_section()
+        return False
+
+
+class Profiler:
+    """섹션 시간, SQL 문장, tracemalloc 최대 메모리 수집"""
+
+    def __init__(self, trace_path=None):
+        self.trace_path = trace_path
+        self.origin = time.perf_counter()
+        self.sections = []
+        self.queries = []
+        self._stack = []
+        self._step = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _now(self):
+        return time.perf_counter() - self.origin
+
+    def begin_section(self, name):
+        _, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # Fold the parent's peak so far before the child resets it
+            self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+        self._stack.append({
+            'name': name,
+            'depth': len(self._stack),
+            'start': self._now(),
+            'peak': 0,
+            'sql_time': 0.0,
+            'queries': 0,
+            'rows': 0,
+        })
+
+    def end_section(self):
+        frame = self._stack.pop()
+        frame['duration'] = self._now() - frame['start']
+        frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+        if self._stack:
+            parent = self._stack[-1]
+            parent['peak'] = max(parent['peak'], frame['peak'])
+            parent['sql_time'] += frame['sql_time']
+            parent['queries'] += frame['queries']
+            parent['rows'] += frame['rows']
+        self.sections.append(frame)
+
+    def step(self, name):
+        """선형 스크립트용: 이전 step 을 닫고 새 step 시작"""
+        if self._step is not None:
+            while len(self._stack) > self._step:
+                self.end_section()
+        self._step = len(self._stack)
+        self.begin_section(name)
+
+    def begin_query(self, sql):
+        query = {
+            'sql': ' '.join(str(sql).split()),
+            'statement': None,
+            'section': self._stack[-1]['name'] if self._stack else None,
+            'start': self._now(),
+            'duration': 0.0,
+            'rows': 0,
+            'thread': threading.get_ident(),
+        }
+        with self._lock:
+            self.queries.append(query)
+        if self._stack:
+            self._stack[-1]['queries'] += 1
+        self._local.current = query
+        return query
+
+    def record(self, query, elapsed, rows=0):
+        query['duration'] += elapsed
+        query['rows'] += rows
+        if self._stack:
+            frame = self._stack[-1]
+            frame['sql_time'] += elapsed
+            frame['rows'] += rows
+
+    def on_statement(self, statement):
+        """sqlite3 trace 콜백: 바인딩된 파라미터가 펼쳐진 실제 실행 문장"""
+        query = getattr(self._local, 'current', None)
+        if query is not None and query['statement'] is None:
+            query['statement'] = statement
+
+    def finish(self):
+        while self._stack:
+            self.end_section()
+        self._step = None
+
+    def summary(self, out=sys.stderr, top=10):
+        """섹션별 요약 표와 느린 쿼리 목록 출력"""
+        print("\n" + "=" * 80, file=out)
+        print("[프로파일] 섹션별 실행 시간", file=out)
+        print("=" * 80, file=out)
+        print(f"{'섹션':<36} {'시간(s)':>9} {'SQL(s)':>9} {'쿼리':>6} {'행 수':>9} {'최대 메모리(MB)':>14}", file=out)
+        print("-" * 80, file=out)
+        for frame in sorted(self.sections, key=lambda f: f['start']):
+            name = '  ' * frame['depth'] + frame['name']
+            print(f"{name[:36]:<36} {frame['duration']:>9.4f} {frame['sql_time']:>9.4f} "
+                  f"{frame['queries']:>6} {frame['rows']:>9} {frame['peak'] / 1024 / 1024:>14.1f}", file=out)
+
+        if self.queries:
+            print(f"\n느린 쿼리 Top {top} (총 {len(self.queries)}개, "
+                  f"{sum(q['duration'] for q in self.queries):.4f}s)", file=out)
+            print("-" * 80, file=out)
+            for query in sorted(self.queries, key=lambda q: q['duration'], reverse=True)[:top]:
+                print(f"{query['duration']:>9.4f}s {query['rows']:>8}행  [{query['section']}] "
+                      f"{query['sql'][:60]}", file=out)
+
+    def chrome_trace(self):
+        """Chrome trace event 형식 (ph='X' 완료 이벤트)"""
+        pid = os.getpid()
+        events = []
+        for frame in self.sections:
+            events.append({
+                'name': frame['name'], 'cat': 'section', 'ph': 'X', 'pid': pid, 'tid': 0,
+                'ts': frame['start'] * 1e6, 'dur': frame['duration'] * 1e6,
+                'args': {'peak_mb': round(frame['peak'] / 1024 / 1024, 2),
+                         'queries': frame['queries'], 'rows': frame['rows']},
+            })
+        for query in self.queries:
+            events.append({
+                'name': query['sql'][:80], 'cat': 'sql', 'ph': 'X', 'pid': pid, 'tid': query['thread'],
+                'ts': query['start'] * 1e6, 'dur': query['duration'] * 1e6,
+                'args': {'statement': query['statement'] or query['sql'], 'rows': query['rows'],
+                         'section': query['section']},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+
+class TracedCursor(sqlite3.Cursor):
+    """실행/fetch 시간과 반환 행 수를 기록하는 커서"""
+
+    def execute(self, sql, parameters=()):
+        self._query = _profiler.begin_query(sql)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _profiler.record(self._query, time.perf_counter() - started)
+
+    def _fetch(self, fetch, *args):
+        started = time.perf_counter()
+        rows = fetch(*args)
+        query = getattr(self, '_query', None)
+        if query is not None:
+            count = len(rows) if isinstance(rows, list) else int(rows is not None)
+            _profiler.record(query, time.perf_counter() - started, count)
+        return rows
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self._fetch(super().fetchall)
+
+
+class TracedConnection(sqlite3.Connection):
+    """모든 커서를 TracedCursor 로 생성하는 연결"""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+
+def enabled():
+    return _profiler is not None
+
+
+def enable(trace_path=None):
+    """프로파일링 시작 (프로세스 종료 시 요약 출력)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(trace_path)
+        tracemalloc.start()
+        atexit.register(report)
+    elif trace_path:
+        _profiler.trace_path = trace_path
+    return _profiler
+
+
+def disable():
+    """프로파일링 중단. 수집 결과(Profiler)를 반환하고 종료 시 요약은 생략"""
+    global _profiler
+    profiler = _profiler
+    if profiler is not None:
+        profiler.finish()
+        atexit.unregister(report)
+        tracemalloc.stop()
+        _profiler = None
+    return profiler
+
+
+def report():
+    """요약 표 출력 및 Chrome trace 저장"""
+    if _profiler is None:
+        return
+    _profiler.finish()
+    _profiler.summary()
+    if _profiler.trace_path:
+        _profiler.write_trace(_profiler.trace_path)
+        print(f"\n[프로파일] Chrome trace 저장: {_profiler.trace_path}", file=sys.stderr)
+
+
+def section(name):
+    """측정 구간 컨텍스트. 비활성 시 공유 nullcontext 반환"""
+    if _profiler is None:
+        return _NULL
+    return _Section(_profiler, name)
+
+
+def timed(name=None):
+    """함수 단위 측정 데코레이터 (@timed 또는 @timed('이름'))"""
+    def decorate(func, label):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return func(*args, **kwargs)
+            with _Section(_profiler, label):
+                return func(*args, **kwargs)
+        return wrapper
+
+    if callable(name):
+        return decorate(name, name.__qualname__)
+    return lambda func: decorate(func, name or func.__qualname__)
+
+
+def step(name):
+    """스크립트 섹션 경계 표시"""
+    if _profiler is not None:
+        _profiler.step(name)
+
+
+def connect(database=None, **kwargs):
+    """connections.connect 대체. 활성 시 쿼리별 시간/행 수 추적
+
+    database 생략 시 PMIK_DB 환경 변수 또는 프로젝트의 PMIK_2025.db (상대 경로도 프로젝트 루트 기준)
+    """
+    if _profiler is None:
+        return connections.connect(database, **kwargs)
+    conn = connections.connect(database, factory=TracedConnection, **kwargs)
+    conn.set_trace_callback(_profiler.on_statement)
+    return conn
+
+
+_setting = os.environ.get(ENV_VAR, '').strip()
+if _setting and _setting != '0':
+    enable(_setting if _setting.endswith('.json') else None)
@@ -0,0 +1,95 @@
+# SQL text shared by the pandas reports (report.py) and the sqlite3-only CLI (pmik.py).
+# Keep this module free of third-party imports so the CLI starts fast.
+
+# Multi-select questions: question number -> raw_data column
+MULTI_SELECT = {75: 'r075', 76: 'r076'}
+
+# Completion rollup levels -> pmik_member grouping columns
+COMPLETION_LEVELS = {
+    'biz_unit': ['"Biz Unit."'],
+    'department': ['"Biz Unit."', 'Department'],
+    'team': ['"Biz Unit."', 'Department', 'Team'],
+    'rank': ['"Job Title"'],
+}
+
+
+def completion_sql(level='biz_unit'):
+    """조직 단위별 대상/완료/미완료/미응답 집계 (analyze_department_responses 와 동일 쿼리)"""
+    columns = COMPLETION_LEVELS[level]
+    group_by = ", ".join(f"m.{col}" for col in columns)
+    return f"""
+    SELECT
+        {group_by},
+        COUNT(DISTINCT m."ID(new)") as total_members,
+        COUNT(DISTINCT CASE WHEN r.completed = 1 THEN r.corporate_id END) as completed_responses,
+        COUNT(DISTINCT CASE WHEN r.completed = 0 THEN r.corporate_id END) as incomplete_responses,
+        COUNT(DISTINCT CASE WHEN r.corporate_id IS NULL THEN m."ID(new)" END) as no_response
+    FROM pmik_member m
+    LEFT JOIN pmik_raw_data r ON m."ID(new)" = r.corporate_id
+    WHERE m.{columns[0]} IS NOT NULL
+    GROUP BY {group_by}
+    ORDER BY {group_by}
+    """
+
+
+OPTION_LIST_SQL = """
+    SELECT 비고 as option_number, "선택(보기)" as option_text
+    FROM pmik_eos
+    WHERE "No." = ?
+    ORDER BY CAST(비고 AS INTEGER)
+    """
+
+
+def option_frequency_sql(question):
+    """선택지별 빈도 (analyze_q75/q76 스크립트와 동일한 LIKE 조인, 파라미터: 문항 번호)"""
+    column = MULTI_SELECT[question]
+    return f"""
+    SELECT
+        e.비고 as option_number,
+        e."선택(보기)" as option_text,
+        COUNT(*) as selection_count,
+        ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM pmik_raw_data WHERE completed = 1 AND {column} IS NOT NULL), 1) as percentage
+    FROM pmik_raw_data r, pmik_eos e
+    WHERE r.completed = 1
+        AND r.{column} IS NOT NULL
+        AND e."No." = ?
+        AND (',' || REPLACE(r.{column}, ' ', ',') || ',') LIKE ('%,' || e.비고 || ',%')
+    GROUP BY e.비고, e."선택(보기)"
+    ORDER BY selection_count DESC
+    """
+
+
+def top_combinations_sql(question):
+    """가장 많이 선택된 조합 Top N (파라미터: N)"""
+    column = MULTI_SELECT[question]
+    return f"""
+    SELECT
+        {column} as combination,
+        COUNT(*) as count
+    FROM pmik_raw_data
+    WHERE completed = 1 AND {column} IS NOT NULL
+    GROUP BY {column}
+    ORDER BY count DESC
+    LIMIT ?
+    """
+
+
+# Row-level data-quality flags written by validate.py (bit mask per pmik_raw_data rowid)
+QUALITY_FLAGS = {
+    'q75_options': 1,       # not exactly 3 unique valid options (1-12)
+    'q76_options': 2,
+    'likert_range': 4,      # a Likert answer outside 1..5 or not an integer
+    'likert_missing': 8,    # a Likert answer missing in a completed response
+    'straight_line': 16,    # (almost) the same Likert answer everywhere
+    'speeder': 32,          # far faster than the median response
+    'duplicate_id': 64,     # corporate_id answered more than once (all but the latest)
+    'orphan': 128,          # corporate_id missing or not in pmik_member
+}
+ALL_QUALITY_FLAGS = sum(QUALITY_FLAGS.values())
+
+
+def quality_filter(exclude, alias='r'):
+    """exclude 비트에 해당하는 플래그 행을 빼는 WHERE 조건 (pmik_quality 는 validate.py 가 생성, 0 이면 빈 문자열)"""
+    if not exclude:
+        return ''
+    return f'AND {alias}.rowid NOT IN (SELECT raw_rowid FROM pmik_quality WHERE flags & {int(exclude)})'
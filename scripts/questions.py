@@ -0,0 +1,134 @@
+# Normalized question bank over pmik_eos: integer question and option ids,
+# whitespace-normalized interned text and categories, held in dicts so every
+# lookup is O(1). The bank is built once per database file (keyed by path, size
+# and mtime) and shared by every caller in the process.
+# Standard library only, like queries.py, so the CLI can use it without pandas.
+import math
+import os
+import sys
+import threading
+from collections import namedtuple
+
+from queries import MULTI_SELECT
+
+QUESTIONS_SQL = """
+    SELECT 대분류, 중분류, 소분류, "No.", 문항, "선택(보기)", 비고
+    FROM pmik_eos
+    WHERE "No." IS NOT NULL
+    """
+
+Question = namedtuple('Question', ['id', 'text', 'category', 'subcategory', 'topic', 'kind'])
+
+OPEN_ENDED = '서술형'
+
+
+def normalize(text):
+    """공백/줄바꿈을 한 칸으로 정리한 interned 문자열 (None -> '')"""
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return ''
+    return sys.intern(' '.join(str(text).split()))
+
+
+def parse_number(value):
+    """문항 번호 -> (문항 id, 선택지 id 또는 None)
+
+    정수는 문항 번호. 일부 내보내기 파일은 선택지를 소수로 저장 (75.08999 -> 문항 75, 선택지 9)
+    """
+    number = float(value)
+    question = int(number)
+    fraction = number - question
+    if abs(fraction) < 1e-6:
+        return question, None
+    return question, int(round(fraction * 100))
+
+
+def parse_option(value):
+    """선택지 번호('1', 1, 1.0) -> int, 숫자가 아니면 None"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number == int(number) else None
+
+
+class QuestionBank:
+    """문항 은행 (문항 id -> Question, (문항 id, 선택지 id) -> 선택지 텍스트)"""
+
+    def __init__(self, rows):
+        self.questions = {}
+        self.options = {}
+        self._option_ids = {}
+        for category, subcategory, topic, number, text, option_text, note in rows:
+            question, option = parse_number(number)
+            if option is None:
+                option = parse_option(note)
+            if question not in self.questions:
+                kind = 'multi' if question in MULTI_SELECT else 'open' if note == OPEN_ENDED else 'likert'
+                self.questions[question] = Question(question, normalize(text), normalize(category),
+                                                    normalize(subcategory), normalize(topic), kind)
+            if option is not None:
+                self.options[(question, option)] = normalize(option_text)
+                self._option_ids.setdefault(question, []).append(option)
+        for ids in self._option_ids.values():
+            ids.sort()
+
+    @classmethod
+    def from_conn(cls, conn):
+        return cls(conn.execute(QUESTIONS_SQL).fetchall())
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __contains__(self, question):
+        return question in self.questions
+
+    def question(self, question):
+        return self.questions[int(question)]
+
+    def option_text(self, question, option, default=''):
+        """선택지 텍스트 (option 은 '4', 4, 4.0 모두 가능)"""
+        option = parse_option(option)
+        return self.options.get((int(question), option), default)
+
+    def option_list(self, question):
+        """{선택지 id: 텍스트} (선택지 번호 순)"""
+        question = int(question)
+        return {option: self.options[(question, option)] for option in self._option_ids.get(question, [])}
+
+    def item(self, item):
+        """분석 열 이름('r001', 'q75_01') -> (문항 id, 선택지 id 또는 None)"""
+        if item.startswith('r'):
+            return int(item[1:]), None
+        question, option = item[1:].split('_')
+        return int(question), int(option)
+
+    def item_text(self, item):
+        question, option = self.item(item)
+        if option is not None:
+            return self.option_text(question, option)
+        return self.questions[question].text if question in self.questions else ''
+
+    def category(self, item):
+        question, _ = self.item(item)
+        return self.questions[question].category if question in self.questions else ''
+
+    def likert_ids(self):
+        return sorted(question for question, info in self.questions.items() if info.kind == 'likert')
+
+
+_banks = {}
+_banks_lock = threading.Lock()
+
+
+def bank(conn):
+    """연결된 DB 파일의 문항 은행 (파일 경로/크기/수정 시각이 같으면 한 번 만든 것을 재사용)"""
+    path = next((row[2] for row in conn.execute('PRAGMA database_list') if row[1] == 'main'), '')
+    if not path or not os.path.exists(path):
+        # In-memory or temporary databases have no stable identity to cache on
+        return QuestionBank.from_conn(conn)
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    with _banks_lock:
+        if key not in _banks:
+            _banks[key] = QuestionBank.from_conn(conn)
+        return _banks[key]
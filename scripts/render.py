@@ -0,0 +1,420 @@
+# Report artifacts (Markdown / HTML) rendered from one computation pass.
+# Every segment value is aggregated together up front (segment_item_table and one
+# completion query per level); building a report is then only slicing and
+# formatting. The org fan-out works the same way over the OrgTree: team-level
+# aggregates are rolled up once and every node's report is a row of those arrays
+# next to the company row (node 0) as baseline. Templates are compiled once at
+# import and files are rendered in a process pool, so hundreds of reports cost
+# little more than one.
+import argparse
+import contextlib
+import html
+import multiprocessing
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from string import Template
+
+import numpy as np
+
+import chunked
+import orgtree
+import questions
+import stream
+from queries import COMPLETION_LEVELS, MULTI_SELECT, completion_sql
+from survey import LIKERT_COLUMNS, N_OPTIONS, SEGMENTS, TENURE_ORDER, load_responses, segment_item_table
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB = PROJECT_ROOT / 'PMIK_2025.db'
+
+FORMATS = {'md': '.md', 'html': '.html'}
+
+QUESTION_TITLES = {75: '업무 몰입 동기부여 요인', 76: '업무 몰입 저해 요인'}
+COMPLETION_COLUMNS = ['대상', '완료', '미완료', '미응답']
+
+BAR_WIDTH = 160
+BAR_COLORS = {75: '#2f6fb0', 76: '#c0504d', None: '#6a8f3c'}
+
+BAR_SVG = Template(
+    '<svg xmlns="http://www.w3.org/2000/svg" width="$width" height="12" role="img" aria-label="$label">'
+    '<rect width="$width" height="12" fill="#e8e8e8"/><rect width="$fill" height="12" fill="$color"/></svg>'
+)
+
+MD_PAGE = Template("# $title\n\n$subtitle\n\n---\n\n$sections")
+MD_SECTION = Template("## $title\n\n$table\n\n")
+
+HTML_STYLE = """
+body { font-family: sans-serif; margin: 2em auto; max-width: 960px; color: #222; }
+table { border-collapse: collapse; margin-bottom: 2em; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; }
+th { background: #f4f4f4; }
+td.num { text-align: right; }
+"""
+HTML_PAGE = Template(
+    '<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="utf-8">\n<title>$title</title>\n'
+    '<style>$style</style>\n</head>\n<body>\n<h1>$title</h1>\n<p>$subtitle</p>\n$sections</body>\n</html>\n'
+)
+HTML_SECTION = Template("<h2>$title</h2>\n<table>\n<thead><tr>$header</tr></thead>\n<tbody>\n$rows</tbody>\n</table>\n")
+
+
+def bar_svg(value, scale=100, color=BAR_COLORS[None]):
+    """값을 가로 막대 SVG 로 (scale 이 막대 전체 길이)"""
+    fill = max(0.0, min(value / scale, 1.0)) * BAR_WIDTH if scale else 0.0
+    return BAR_SVG.substitute(width=BAR_WIDTH, fill=f'{fill:.1f}', color=color, label=f'{value:.1f}')
+
+
+def _cells(section):
+    """섹션 행 -> (헤더, 셀 문자열 행 목록)
+
+    bar=(scale, color) 인 섹션은 행의 마지막 값(열 목록 밖)을 SVG 막대 열로 표시
+    """
+    header = list(section['columns'])
+    bar = section.get('bar')
+    if bar:
+        header.append('')
+    rows = []
+    for row in section['rows']:
+        cells = [str(value) for value in row[:len(section['columns'])]]
+        if bar:
+            cells.append(bar_svg(row[-1], *bar))
+        rows.append(cells)
+    return header, rows
+
+
+def render_markdown(report):
+    sections = []
+    for section in report['sections']:
+        header, rows = _cells(section)
+        lines = ['| ' + ' | '.join(header) + ' |', '|' + '---|' * len(header)]
+        lines += ['| ' + ' | '.join(cell.replace('|', '\\|') for cell in row) + ' |' for row in rows]
+        sections.append(MD_SECTION.substitute(title=section['title'], table='\n'.join(lines)))
+    return MD_PAGE.substitute(title=report['title'], subtitle=report['subtitle'], sections=''.join(sections))
+
+
+def render_html(report):
+    sections = []
+    for section in report['sections']:
+        header, rows = _cells(section)
+        bar = len(header) - 1 if section.get('bar') else None
+        body = []
+        for row in rows:
+            cells = []
+            for i, cell in enumerate(row):
+                if i == bar:
+                    cells.append(f'<td>{cell}</td>')
+                else:
+                    numeric = re.fullmatch(r'[-+]?[\d,.]+%?(명)?', cell) is not None
+                    cells.append(f'<td class="num">{html.escape(cell)}</td>' if numeric else
+                                 f'<td>{html.escape(cell)}</td>')
+            body.append('<tr>' + ''.join(cells) + '</tr>\n')
+        sections.append(HTML_SECTION.substitute(
+            title=html.escape(section['title']),
+            header=''.join(f'<th>{html.escape(name)}</th>' for name in header),
+            rows=''.join(body),
+        ))
+    return HTML_PAGE.substitute(title=html.escape(report['title']), subtitle=html.escape(report['subtitle']),
+                                style=HTML_STYLE, sections=''.join(sections))
+
+
+RENDERERS = {'md': render_markdown, 'html': render_html}
+
+
+def labels(conn):
+    """(문항별 {선택지 번호: 텍스트}, {Likert 문항: 대분류})"""
+    bank = questions.bank(conn)
+    options = {question: bank.option_list(question) for question in MULTI_SELECT}
+    categories = {item: bank.category(item) for item in LIKERT_COLUMNS if bank.category(item)}
+    return options, categories
+
+
+def collect(conn, segments=SEGMENTS, chunksize=None):
+    """리포트에 필요한 모든 세그먼트 값의 집계를 한 번에 계산 (chunksize: N행씩 누적 집계, 결과 동일)"""
+    if chunksize:
+        items = chunked.aggregate(conn, segments, chunksize).segment_item_table()
+    else:
+        items = segment_item_table(load_responses(conn), segments)
+    # One slice per (segment, value), split once instead of filtering per report
+    groups = {key: frame.set_index('item') for key, frame in items.groupby(['segment', 'value'], sort=False)}
+
+    completion = {}
+    for segment in segments:
+        if segment in COMPLETION_LEVELS and len(COMPLETION_LEVELS[segment]) == 1:
+            completion[segment] = {row[0]: row[1:] for row in conn.execute(completion_sql(segment))}
+    if 'biz_unit' not in completion:
+        completion['biz_unit'] = {row[0]: row[1:] for row in conn.execute(completion_sql('biz_unit'))}
+    # A member belongs to one biz unit, so the company totals are the sum
+    completion['전체'] = {'전체': tuple(map(sum, zip(*completion['biz_unit'].values())))}
+
+    options, categories = labels(conn)
+    data = {'groups': groups, 'completion': completion, 'options': options, 'categories': categories}
+    base_options, base_likert, _ = _group_values(data, groups[('전체', '전체')])
+    data['baseline'] = (base_options, base_likert)
+    return data
+
+
+def _delta(value, baseline, digits=1, unit='%p'):
+    if value != value or baseline != baseline:
+        return '-'
+    return f'{value - baseline:+.{digits}f}{unit}'
+
+
+def completion_section(counts, baseline=None):
+    """대상/완료/미완료/미응답 (baseline: 전체 인원 4개, 지정 시 전체 비율과 차이 열 추가)"""
+    columns = ['구분', '인원', '비율']
+    if baseline is not None:
+        columns += ['전체', '차이']
+    rows = []
+    for i, (name, value) in enumerate(zip(COMPLETION_COLUMNS, counts)):
+        rate = value / counts[0] * 100 if counts[0] else float('nan')
+        row = [name, f'{value}명', f'{rate:.1f}%']
+        if baseline is not None:
+            base = baseline[i] / baseline[0] * 100 if baseline[0] else float('nan')
+            row += [f'{base:.1f}%', _delta(rate, base)]
+        rows.append(row)
+    return {'title': '응답 현황', 'columns': columns, 'rows': rows}
+
+
+def option_section(question, option_text, counts, shares, baseline=None):
+    """선택지별 선택 수/비율 (counts/shares: 선택지 1..12 순 배열, 비율은 %, baseline: 전체 비율 배열)"""
+    columns = ['순위', '번호', '선택지', '선택 수', '비율']
+    if baseline is not None:
+        columns += ['전체', '차이']
+    # Ties are broken by option number, like report.rank_options
+    order = sorted((option for option in range(N_OPTIONS) if counts[option] > 0),
+                   key=lambda option: (-counts[option], option))
+    rows = []
+    for rank, option in enumerate(order, 1):
+        share = float(shares[option])
+        row = [rank, option + 1, option_text.get(option + 1, ''), f'{int(counts[option])}명', f'{share:.1f}%']
+        if baseline is not None:
+            row += [f'{baseline[option]:.1f}%', _delta(share, float(baseline[option]))]
+        rows.append(row + [share])
+    return {'title': f'Q{question}: {QUESTION_TITLES[question]}', 'columns': columns, 'rows': rows,
+            'bar': (100, BAR_COLORS[question])}
+
+
+def category_means(counts, means, categories):
+    """(행 x 문항 응답 수, 행 x 문항 평균) -> (대분류 목록, 대분류별 문항 수, 행 x 대분류 평균)
+
+    대분류 평균은 문항 평균을 응답 수로 가중 (응답 없으면 NaN). 모든 행을 행렬곱 한 번으로 계산
+    """
+    labels = [categories.get(item, '기타') for item in LIKERT_COLUMNS]
+    names = list(dict.fromkeys(labels))
+    member = np.zeros((len(LIKERT_COLUMNS), len(names)))
+    member[np.arange(len(labels)), [names.index(label) for label in labels]] = 1.0
+    counts = np.nan_to_num(np.atleast_2d(np.asarray(counts, dtype=np.float64)))
+    sums = counts * np.nan_to_num(np.atleast_2d(np.asarray(means, dtype=np.float64)))
+    answered = counts @ member
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return names, member.sum(axis=0).astype(int), np.where(answered > 0, (sums @ member) / answered, np.nan)
+
+
+def likert_section(names, sizes, means, baseline=None):
+    """대분류별 Likert 평균 (means/baseline: 대분류 순 배열)"""
+    columns = ['대분류', '문항 수', '평균']
+    if baseline is not None:
+        columns += ['전체', '차이']
+    rows = []
+    for i, (name, size) in enumerate(zip(names, sizes)):
+        mean = float(means[i])
+        if mean != mean:
+            continue
+        row = [name, int(size), f'{mean:.2f}']
+        if baseline is not None:
+            row += [f'{baseline[i]:.2f}', _delta(mean, float(baseline[i]), 2, '')]
+        rows.append(row + [mean])
+    return {'title': 'Likert 대분류별 평균 (5점 척도)', 'columns': columns, 'rows': rows,
+            'bar': (5, BAR_COLORS[None])}
+
+
+def _group_values(data, items):
+    """segment_item_table 조각 -> ({문항: (선택 수, 비율 %)}, 대분류 평균, 응답자 수)"""
+    options = {}
+    for question in MULTI_SELECT:
+        keys = [f'q{question}_{option:02d}' for option in range(1, N_OPTIONS + 1)]
+        part = items.reindex(keys)
+        n = part['n'].fillna(0).to_numpy()
+        share = part['mean'].fillna(0).to_numpy()
+        options[question] = (np.rint(n * share), share * 100)
+    likert = items.reindex(LIKERT_COLUMNS)
+    names, sizes, means = category_means(likert['n'], likert['mean'], data['categories'])
+    respondents = int(items['n'].max()) if len(items) else 0
+    return options, (names, sizes, means[0]), respondents
+
+
+def build_report(data, segment=None, value='전체'):
+    """세그먼트 값 하나의 리포트 (segment=None 이면 전체, 그 외는 전체 대비 차이 포함)"""
+    key = segment or '전체'
+    options, likert, respondents = _group_values(data, data['groups'][(key, value)])
+    base_options, base_likert = data['baseline']
+    company = segment is None
+
+    sections = []
+    counts = data['completion'].get(key, {}).get(value)
+    if counts:
+        sections.append(completion_section(counts, None if company else data['completion']['전체']['전체']))
+    for question, (selected, shares) in options.items():
+        sections.append(option_section(question, data['options'][question], selected, shares,
+                                       None if company else base_options[question][1]))
+    sections.append(likert_section(*likert, None if company else base_likert[2]))
+    title = 'EOS 분석 보고서' + ('' if company else f' - {segment}: {value}')
+    return {'title': title, 'subtitle': f'완료 응답 {respondents}명 기준', 'sections': sections}
+
+
+def build_reports(data, segments=SEGMENTS):
+    """(상대 경로, 리포트) 목록: 전체 + 세그먼트 값별"""
+    reports = [('전체', build_report(data))]
+    for segment in segments:
+        values = [value for (seg, value) in data['groups'] if seg == segment]
+        if segment == 'tenure_category':
+            values.sort(key=lambda value: TENURE_ORDER.index(value) if value in TENURE_ORDER else len(TENURE_ORDER))
+        else:
+            values.sort(key=str)
+        names = unique_file_names(values, range(1, len(values) + 1))
+        reports += [(f'{segment}/{name}', build_report(data, segment, value)) for name, value in zip(names, values)]
+    return reports
+
+
+def collect_org(conn):
+    """조직 트리 모든 노드의 완료 현황 / 선택지 선택 수 / 대분류 평균 (팀 단위 집계 + 롤업 한 번씩)"""
+    option_text, categories = labels(conn)
+    tree = orgtree.OrgTree.build(conn)
+    options = {}
+    for question in MULTI_SELECT:
+        respondents, counts = orgtree.option_counts(conn, tree, question)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shares = np.where(respondents[:, None] > 0, counts / respondents[:, None] * 100, 0.0)
+        options[question] = (respondents, counts, shares)
+    item_counts, item_means = orgtree.likert_means(conn, tree)
+    return {
+        'tree': tree,
+        'completion': orgtree.completion(conn, tree),
+        'options': options,
+        'likert': category_means(item_counts, item_means, categories),
+        'option_text': option_text,
+    }
+
+
+def org_report(data, node):
+    """조직 노드 하나의 리포트 (전체 = 노드 0 대비 차이 포함)"""
+    tree = data['tree']
+    names, sizes, means = data['likert']
+    company = node == 0
+    sections = [completion_section(data['completion'][node].tolist(),
+                                   None if company else data['completion'][0].tolist())]
+    for question, (_, counts, shares) in data['options'].items():
+        sections.append(option_section(question, data['option_text'][question], counts[node], shares[node],
+                                       None if company else shares[0]))
+    sections.append(likert_section(names, sizes, means[node], None if company else means[0]))
+    path = ' > '.join(tree.paths[node]) or orgtree.ROOT
+    respondents = max(int(respondents[node]) for respondents, _, _ in data['options'].values())
+    return {'title': f'EOS 분석 보고서 - {path}', 'subtitle': f'완료 응답 {respondents}명 기준', 'sections': sections}
+
+
+def org_reports(data, max_depth=None):
+    """(상대 경로, 리포트) 목록: 조직 노드별 (org/사업부/부서/팀)"""
+    tree = data['tree']
+    nodes = list(tree.walk(max_depth))
+    # Siblings whose names map to the same file name are told apart by node id
+    parts = {}
+    for parent in sorted({int(tree.parent[node]) for node in nodes[1:]}):
+        children = tree.children(parent).tolist()
+        parts.update(zip(children, unique_file_names([tree.names[node] for node in children], children)))
+    dirs = {0: 'org'}
+    reports = [(f'org/{orgtree.ROOT}', org_report(data, 0))]
+    for node in nodes[1:]:
+        dirs[node] = f'{dirs[int(tree.parent[node])]}/{parts[node]}'
+        reports.append((dirs[node], org_report(data, node)))
+    return reports
+
+
+def file_name(value):
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', str(value)).strip('_') or 'N_A'
+
+
+def unique_file_names(values, ids):
+    """값별 파일 이름. 서로 다른 값이 같은 이름(대소문자 무시)이 되면 모두 _<id> 를 붙여 구분"""
+    names = [file_name(value) for value in values]
+    counts = Counter(name.casefold() for name in names)
+    return [name if counts[name.casefold()] == 1 else f'{name}_{id_}' for name, id_ in zip(names, ids)]
+
+
+def _write_task(task):
+    """(경로 앞부분, 리포트, 형식 목록) -> 작성한 파일 수 (워커에서 실행)"""
+    stem, report, formats = task
+    stem = Path(stem)
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    for fmt in formats:
+        stem.with_name(stem.name + FORMATS[fmt]).write_text(RENDERERS[fmt](report), encoding='utf-8')
+    return len(formats)
+
+
+def write_reports(reports, out_dir, formats=tuple(FORMATS), workers=None, progress=None):
+    """리포트 목록을 병렬로 렌더링해 out_dir 에 저장 -> 작성한 파일 수 (progress(완료 리포트 수, 전체))"""
+    out_dir = Path(out_dir)
+    tasks = [(str(out_dir / path), report, list(formats)) for path, report in reports]
+    # Two reports on one path would overwrite each other and be counted twice
+    stems = Counter(stem.casefold() for stem, _, _ in tasks)
+    clashes = sorted(stem for stem, count in stems.items() if count > 1)
+    if clashes:
+        raise ValueError(f"같은 파일 경로의 리포트가 있습니다: {', '.join(clashes[:5])}")
+    files = 0
+    with contextlib.ExitStack() as stack:
+        if workers == 1 or len(tasks) < 2:
+            written = map(_write_task, tasks)
+        else:
+            pool = stack.enter_context(multiprocessing.Pool(workers, initializer=stream.ignore_interrupt))
+            written = pool.imap_unordered(_write_task, tasks, chunksize=max(1, len(tasks) // 64))
+        for done, count in enumerate(written, 1):
+            files += count
+            if progress:
+                progress(done, len(tasks))
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='분석 결과 Markdown/HTML 리포트 생성 (세그먼트 값별)')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite DB 경로')
+    parser.add_argument('--by', nargs='*', choices=SEGMENTS, default=SEGMENTS,
+                        help='세그먼트별 리포트 (값 없이 지정하면 전체 리포트만)')
+    parser.add_argument('--org', action='store_true', help='조직 노드별 리포트 추가 (사업부/부서/팀, 전체 대비 차이)')
+    parser.add_argument('--org-depth', type=int, default=None, help='조직 리포트 최대 깊이 (1: 사업부, 2: 부서, 3: 팀)')
+    parser.add_argument('--format', nargs='+', choices=list(FORMATS), default=list(FORMATS))
+    parser.add_argument('--out', default='reports', help='결과 디렉토리')
+    parser.add_argument('--workers', type=int, default=None, help='렌더링 프로세스 수 (기본: CPU 수, 1: 단일 프로세스)')
+    parser.add_argument('--chunksize', type=int, default=None, help='응답을 N행씩 나눠 집계 (대용량 DB용)')
+    stream.add_argument(parser)
+    args = parser.parse_args(argv)
+
+    out = stream.Stream(args.output)
+    with out.cancellable():
+        run(args, out)
+
+
+def run(args, out):
+    started = time.perf_counter()
+    conn = sqlite3.connect(args.db)
+    # With --org and no segments the company report is the org root, so responses are not loaded
+    data = collect(conn, args.by, args.chunksize) if args.by or not args.org else None
+    org = collect_org(conn) if args.org else None
+    conn.close()
+    computed = time.perf_counter()
+    reports = build_reports(data, args.by) if data else []
+    if org:
+        reports += org_reports(org, args.org_depth)
+    with out.progress('렌더링', len(reports)) as progress:
+        files = write_reports(reports, args.out, args.format, args.workers, progress)
+    finished = time.perf_counter()
+
+    out.section(f"리포트 {len(reports)}개, 파일 {files}개 -> {args.out}",
+                [f"집계 {computed - started:.2f}초 | 렌더링 {finished - computed:.2f}초"],
+                data={'reports': len(reports), 'files': files, 'out': args.out,
+                      'collect_sec': round(computed - started, 2), 'render_sec': round(finished - computed, 2)})
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,66 @@
+import pandas as pd
+
+from profiling import timed
+from queries import (COMPLETION_LEVELS, MULTI_SELECT, OPTION_LIST_SQL, completion_sql,
+                     option_frequency_sql, top_combinations_sql)
+from survey import option_indicators
+
+
+@timed
+def completion_by(conn, level='biz_unit'):
+    """조직 단위별 대상/완료/미완료/미응답 집계 (analyze_department_responses 와 동일 쿼리)"""
+    return pd.read_sql_query(completion_sql(level), conn)
+
+
+@timed
+def option_list(conn, question):
+    """선택지 번호/텍스트 목록"""
+    return pd.read_sql_query(OPTION_LIST_SQL, conn, params=(float(question),))
+
+
+@timed
+def option_frequency(conn, question):
+    """선택지별 빈도 (analyze_q75/q76 스크립트와 동일한 LIKE 조인)"""
+    return pd.read_sql_query(option_frequency_sql(question), conn, params=(float(question),))
+
+
+@timed
+def top_combinations(conn, question, n=10):
+    """가장 많이 선택된 조합 Top N"""
+    return pd.read_sql_query(top_combinations_sql(question), conn, params=(n,))
+
+
+@timed
+def segment_top_n(df, question, segment, n=3, weights=None):
+    """세그먼트별 Top N 선택지 (load_responses 결과 사용)
+
+    weights(corporate_id -> 가중치) 지정 시 선택 수/응답자 수를 가중치 합으로 계산
+    """
+    column = MULTI_SELECT[question]
+    answered = df[df[column].notna()]
+    indicators = option_indicators(answered[column], question)
+    if weights is None:
+        counts = indicators.groupby(answered[segment]).sum()
+        sizes = answered.groupby(segment).size()
+        return rank_options(counts, sizes, n)
+    weight = answered['corporate_id'].map(weights).fillna(0.0)
+    counts = indicators.mul(weight, axis=0).groupby(answered[segment]).sum()
+    sizes = weight.groupby(answered[segment]).sum()
+    return rank_options(counts, sizes, n, weighted=True)
+
+
+def rank_options(counts, sizes, n=3, weighted=False):
+    """세그먼트 값 x 선택지 선택 수(counts)와 응답자 수(sizes)로 Top N 표 생성 (weighted 면 선택 수를 실수로 유지)"""
+    long = counts.stack().rename('count').reset_index()
+    long.columns = ['value', 'item', 'count']
+    long = long[long['count'] > 0]
+    if not weighted:
+        long['count'] = long['count'].astype(int)
+    long['option_number'] = long['item'].str[-2:].astype(int)
+    long['respondents'] = long['value'].map(sizes)
+    long['percentage'] = long['count'] / long['respondents'] * 100
+
+    # Ties are broken by option number so the ranking is deterministic
+    long = long.sort_values(['value', 'count', 'option_number'], ascending=[True, False, True])
+    long['rank'] = long.groupby('value').cumcount() + 1
+    return long[long['rank'] <= n].reset_index(drop=True)
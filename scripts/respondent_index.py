@@ -0,0 +1,165 @@
+# Inverted index over the member roster: every segment value maps to a sorted
+# array of respondent positions, so drill-downs and multi-attribute filters are
+# sorted-array unions/intersections instead of boolean scans over a frame.
+import numpy as np
+
+from sql_backend import TENURE_MONTHS_SQL
+
+# Indexed attributes (filterable); the remaining columns are kept for display only
+ATTRIBUTES = ['biz_unit', 'department', 'team', 'rank', 'tenure_category', 'status']
+COLUMNS = ['tenure'] + ATTRIBUTES
+
+# Same buckets as survey.categorize_tenure, in months
+TENURE_BINS = [12, 36, 60, 120]
+TENURE_LABELS = ['1년 미만', '1-3년', '3-5년', '5-10년', '10년 이상']
+
+STATUS_SQL = """
+    CASE WHEN r.completed = 1 THEN '완료' WHEN r.completed = 0 THEN '미완료' ELSE '미응답' END
+"""
+
+# One row per person: members with their response status, plus responses whose
+# corporate_id has no member row (attributes taken from the response itself)
+ROSTER_SQL = f"""
+WITH r AS (
+    SELECT corporate_id, MAX(completed) AS completed,
+           MIN(etc1) AS etc1, MIN(etc2) AS etc2, MIN(etc3) AS etc3, MIN(rank) AS rank
+    FROM pmik_raw_data
+    WHERE corporate_id IS NOT NULL
+    GROUP BY corporate_id
+)
+SELECT
+    m."ID(new)" AS id,
+    m.근속기간 AS tenure,
+    m."Biz Unit." AS biz_unit,
+    m.Department AS department,
+    m.Team AS team,
+    m."Job Title" AS rank,
+    CASE WHEN m.근속기간 IS NOT NULL THEN {TENURE_MONTHS_SQL} END AS tenure_months,
+    {STATUS_SQL} AS status
+FROM pmik_member m
+LEFT JOIN r ON m."ID(new)" = r.corporate_id
+WHERE m."ID(new)" IS NOT NULL
+UNION ALL
+SELECT r.corporate_id, NULL, r.etc1, r.etc2, r.etc3, r.rank, NULL, {STATUS_SQL}
+FROM r
+WHERE r.corporate_id NOT IN (SELECT "ID(new)" FROM pmik_member WHERE "ID(new)" IS NOT NULL)
+"""
+
+
+def _postings(values):
+    """값 -> 정렬된 위치 배열 (int32), 값 순서로 정렬"""
+    # dict factorization is much faster than sorting Python strings with np.unique
+    codes_of = {}
+    codes = np.fromiter((codes_of.setdefault(v, len(codes_of)) for v in values), dtype=np.int32, count=len(values))
+    # A stable sort of the codes keeps positions ascending inside each group
+    order = np.argsort(codes, kind='stable').astype(np.int32)
+    groups = np.split(order, np.cumsum(np.bincount(codes, minlength=len(codes_of)))[:-1])
+    return dict(sorted(zip(codes_of, groups)))
+
+
+def union(arrays):
+    """정렬된 위치 배열들의 합집합"""
+    arrays = list(arrays)
+    if not arrays:
+        return np.empty(0, dtype=np.int32)
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.unique(np.concatenate(arrays))
+
+
+def intersect(arrays):
+    """정렬된 위치 배열들의 교집합 (작은 배열부터)"""
+    arrays = sorted(arrays, key=len)
+    result = arrays[0]
+    for other in arrays[1:]:
+        if not len(result):
+            break
+        result = np.intersect1d(result, other, assume_unique=True)
+    return result
+
+
+class RespondentIndex:
+    """세그먼트 값 -> 정렬된 응답자 위치 배열 역색인 (위치는 명단 조회 순서)"""
+
+    def __init__(self, ids, columns, attributes=ATTRIBUTES):
+        self.ids = ids
+        self.columns = columns
+        self.postings = {name: _postings(columns[name]) for name in attributes}
+        self.all = np.arange(len(ids), dtype=np.int32)
+        self._lookup = None
+
+    @classmethod
+    def from_frame(cls, df, attributes):
+        """DataFrame 의 attributes 열 색인 (위치 = df.iloc 위치, 열 값에 NaN 이 없어야 함)"""
+        return cls(df.index.to_numpy(), {name: df[name].to_numpy(dtype=object) for name in attributes}, attributes)
+
+    @classmethod
+    def build(cls, conn):
+        rows = conn.execute(ROSTER_SQL).fetchall()
+        if not rows:
+            return cls(np.empty(0, dtype=object), {name: np.empty(0, dtype=object) for name in COLUMNS})
+        values = list(zip(*rows))
+        ids = np.array(values[0], dtype=object)
+        columns = {}
+        for name, column in zip(COLUMNS, values[1:]):
+            column = np.array(column, dtype=object)
+            if name == 'tenure_category':
+                # The query returns tenure in months; bucket it here rather than per row in SQL
+                months = np.array([np.nan if v is None else v for v in column], dtype=np.float64)
+                labels = np.array(TENURE_LABELS + ['N/A'], dtype=object)
+                column = labels[np.where(np.isnan(months), len(TENURE_LABELS),
+                                         np.searchsorted(TENURE_BINS, months, side='right'))]
+            elif name != 'tenure':
+                column[np.equal(column, None)] = 'N/A'
+            columns[name] = column
+        return cls(ids, columns)
+
+    def position_of(self, ids):
+        """id 목록 -> 위치 배열 (명단에 없는 id 는 제외, 정렬/중복 제거)"""
+        if self._lookup is None:
+            self._lookup = {value: pos for pos, value in enumerate(self.ids.tolist())}
+        lookup = self._lookup
+        found = np.fromiter((lookup.get(value, -1) for value in ids), dtype=np.int32)
+        return np.unique(found[found >= 0])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def values(self, attribute):
+        return list(self.postings[attribute])
+
+    def positions(self, **filters):
+        """필터 조건의 위치 배열 (같은 속성 안의 여러 값은 OR, 속성 사이는 AND)"""
+        selected = []
+        for attribute, wanted in filters.items():
+            if wanted is None:
+                continue
+            if isinstance(wanted, str):
+                wanted = [wanted]
+            postings = self.postings[attribute]
+            selected.append(union(postings[value] for value in wanted if value in postings))
+        return intersect(selected) if selected else self.all
+
+    def count(self, **filters):
+        return len(self.positions(**filters))
+
+    def select(self, **filters):
+        """필터 조건에 해당하는 id 목록"""
+        return self.ids[self.positions(**filters)].tolist()
+
+    def counts_by(self, attribute, positions=None):
+        """위치 집합을 attribute 값별로 나눈 인원 수 {값: 수}"""
+        positions = self.all if positions is None else positions
+        result = {}
+        for value, posting in self.postings[attribute].items():
+            n = len(np.intersect1d(positions, posting, assume_unique=True))
+            if n:
+                result[value] = n
+        return result
+
+    def rows(self, positions, columns=COLUMNS):
+        """위치 배열에 해당하는 상세 행 (출력용 dict 목록)"""
+        return [
+            dict(id=self.ids[pos], **{name: self.columns[name][pos] for name in columns})
+            for pos in positions
+        ]
@@ -0,0 +1,516 @@
+# Approximate counts for large multi-wave / multi-company panels. Each partition
+# (one DB file, wave or company) is summarized once into fixed-size sketches:
+#   - HyperLogLog registers for distinct members / completed respondents per org
+#     unit (completion estimates) and distinct respondents per segment value
+#   - a count-min sketch of Q75/Q76 option selections per segment value
+#   - a space-saving summary of the most frequent option combinations
+# Every sketch merges without the rows (register max, table sum, summary merge), so
+# panel-wide Top N and completion estimates come from a few small arrays in
+# milliseconds, with known error bounds. Exact reports stay in sql_backend / report.
+import argparse
+import json
+import math
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import connections
+import questions
+from queries import COMPLETION_LEVELS, MULTI_SELECT
+from snapshot import option_masks
+from sql_backend import SEGMENT_SQL
+from survey import N_OPTIONS
+
+# HyperLogLog: 2^14 one-byte registers (16KB), relative standard error 1.04 / 128 = 0.8%
+HLL_PRECISION = 14
+# Count-min: overestimate <= e / width x total selections with probability 1 - e^-depth
+CM_WIDTH = 1024
+CM_DEPTH = 4
+# Space-saving: combinations kept per segment value and question
+SS_CAPACITY = 64
+
+ALL = '전체'
+FORMAT_VERSION = 1
+
+# Completion levels read from pmik_member (same grouping keys as pmik completion)
+MEMBER_COLUMNS = list(dict.fromkeys(column for columns in COMPLETION_LEVELS.values() for column in columns))
+
+MEMBERS_SQL = f"""
+    SELECT
+        m."ID(new)" AS id,
+        {', '.join(f'm.{column} AS c{i}' for i, column in enumerate(MEMBER_COLUMNS))},
+        c.corporate_id IS NOT NULL AS completed
+    FROM pmik_member m
+    LEFT JOIN (SELECT DISTINCT corporate_id FROM pmik_raw_data WHERE completed = 1) c
+        ON c.corporate_id = m."ID(new)"
+    """
+
+RESPONSES_SQL = f"""
+    SELECT
+        r.corporate_id,
+        {', '.join(f'{expression} AS {name}' for name, expression in SEGMENT_SQL.items())},
+        {', '.join(f'r.{column}' for column in MULTI_SELECT.values())}
+    FROM pmik_raw_data r
+    LEFT JOIN pmik_member m ON r.corporate_id = m."ID(new)"
+    WHERE r.completed = 1
+    """
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def hash_ids(values):
+    """ID 값 -> 64비트 해시 (문자열 기준이므로 DB/프로세스가 달라도 같은 ID 는 같은 해시)"""
+    return pd.util.hash_array(pd.Series(values).astype(str).to_numpy(dtype=object), categorize=False)
+
+
+def _mix(keys, seed):
+    """splitmix64 (행마다 다른 seed 로 독립 해시)"""
+    z = np.asarray(keys, dtype=np.uint64) + np.uint64((seed * _GOLDEN) & _MASK64)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _bit_length(values):
+    # Exact for uint64: each 32-bit half converts to float64 without rounding
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide='ignore'):
+        return np.where(high > 0, 33 + np.floor(np.log2(high)),
+                        np.where(low > 0, 1 + np.floor(np.log2(low)), 0)).astype(np.int64)
+
+
+class HyperLogLog:
+    """고유 개수 추정 (상대 표준오차 1.04/sqrt(2^p), 합치기 = 레지스터별 최댓값)"""
+
+    def __init__(self, precision=HLL_PRECISION, registers=None):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8) if registers is None else registers
+
+    def add(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes):
+            suffix_bits = 64 - self.precision
+            index = (hashes >> np.uint64(suffix_bits)).astype(np.intp)
+            rest = hashes & np.uint64((1 << suffix_bits) - 1)
+            # Position of the first 1-bit in the remaining bits (suffix_bits + 1 when all zero)
+            rank = suffix_bits - _bit_length(rest) + 1
+            np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError(f"HyperLogLog 정밀도가 다릅니다: {self.precision} != {other.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = int((self.registers == 0).sum())
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are still empty
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class CountMin:
+    """count-min 스케치 (과대 추정만 발생, 오차 <= e/width x 전체 합, 확률 1 - e^-depth, 합치기 = 표 합)"""
+
+    def __init__(self, width=CM_WIDTH, depth=CM_DEPTH, table=None):
+        self.table = np.zeros((depth, width), dtype=np.int64) if table is None else table
+
+    @property
+    def depth(self):
+        return self.table.shape[0]
+
+    @property
+    def width(self):
+        return self.table.shape[1]
+
+    @property
+    def total(self):
+        return int(self.table[0].sum())
+
+    def _columns(self, keys):
+        return np.stack([_mix(keys, row + 1) % np.uint64(self.width) for row in range(self.depth)]).astype(np.intp)
+
+    def add(self, keys, counts=None):
+        for row, columns in enumerate(self._columns(keys)):
+            self.table[row] += np.bincount(columns, weights=counts, minlength=self.width).astype(np.int64)
+        return self
+
+    def estimate(self, keys):
+        columns = self._columns(keys)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def error_bound(self):
+        return math.e / self.width * self.total
+
+    def merge(self, other):
+        if other.table.shape != self.table.shape:
+            raise ValueError(f"count-min 크기가 다릅니다: {self.table.shape} != {other.table.shape}")
+        self.table += other.table
+        return self
+
+
+class SpaceSaving:
+    """상위 빈도 요약 (최대 capacity 개 항목의 추정 수/최대 과대 추정, 요약에 없는 항목의 수는 floor 이하)
+
+    추정 수는 상한이며 (추정 수 - 오차) 는 하한. 부분 합계끼리 합쳐도 같은 보장이 유지됨
+    """
+
+    def __init__(self, capacity=SS_CAPACITY, counts=None, errors=None, floor=0):
+        self.capacity = capacity
+        self.counts = counts or {}
+        self.errors = errors or {}
+        self.floor = floor
+
+    @classmethod
+    def from_counts(cls, keys, counts, capacity=SS_CAPACITY):
+        """정확한 (키, 수) -> 상위 capacity 개 요약"""
+        order = np.lexsort((keys, -np.asarray(counts)))
+        kept = order[:capacity]
+        floor = int(counts[order[capacity]]) if len(order) > capacity else 0
+        return cls(capacity, {int(keys[i]): int(counts[i]) for i in kept}, {int(keys[i]): 0 for i in kept}, floor)
+
+    def merge(self, other):
+        keys = set(self.counts) | set(other.counts)
+        # A key missing from one summary may still have up to that summary's floor there
+        counts = {key: self.counts.get(key, self.floor) + other.counts.get(key, other.floor) for key in keys}
+        errors = {key: self.errors.get(key, self.floor) + other.errors.get(key, other.floor) for key in keys}
+        floor = self.floor + other.floor
+        kept = sorted(keys, key=lambda key: (-counts[key], key))
+        if len(kept) > self.capacity:
+            floor = max(floor, counts[kept[self.capacity]])
+            kept = kept[:self.capacity]
+        self.counts = {key: counts[key] for key in kept}
+        self.errors = {key: errors[key] for key in kept}
+        self.floor = floor
+        return self
+
+    def update(self, keys, counts):
+        return self.merge(SpaceSaving.from_counts(keys, counts, self.capacity))
+
+    def top(self, n):
+        """[(키, 추정 수, 최대 과대 추정)] 추정 수 순"""
+        return [(key, self.counts[key], self.errors[key])
+                for key in sorted(self.counts, key=lambda key: (-self.counts[key], key))[:n]]
+
+
+def option_keys(question):
+    """count-min 키: 문항 x 100 + 선택지"""
+    return question * 100 + np.arange(1, N_OPTIONS + 1, dtype=np.uint64)
+
+
+def mask_text(mask):
+    """선택지 비트마스크 -> '1 3 10'"""
+    return ' '.join(str(bit + 1) for bit in range(N_OPTIONS) if mask >> bit & 1)
+
+
+class SegmentSketch:
+    """세그먼트 값 하나의 응답 스케치 (고유 응답자, 문항별 응답 수, 선택지 빈도, 조합 상위 빈도)"""
+
+    def __init__(self, precision, width, depth, capacity):
+        self.respondents = HyperLogLog(precision)
+        self.answered = {question: 0 for question in MULTI_SELECT}
+        self.options = CountMin(width, depth)
+        self.combinations = {question: SpaceSaving(capacity) for question in MULTI_SELECT}
+
+    def merge(self, other):
+        self.respondents.merge(other.respondents)
+        self.options.merge(other.options)
+        for question in MULTI_SELECT:
+            self.answered[question] += other.answered[question]
+            self.combinations[question].merge(other.combinations[question])
+        return self
+
+
+def _groups(values):
+    """값 -> 행 번호 배열 (NULL 값 제외)"""
+    return pd.Series(np.arange(len(values))).groupby(np.asarray(values, dtype=object), sort=False).indices
+
+
+class PanelSketch:
+    """파티션(DB 파일/웨이브/회사)별 스케치 모음. merge 로 여러 파티션을 합쳐 패널 전체를 추정
+
+    completion[(단위, 키)] = (구성원 HLL, 완료자 HLL), segments[(세그먼트, 값)] = SegmentSketch
+    """
+
+    def __init__(self, precision=HLL_PRECISION, width=CM_WIDTH, depth=CM_DEPTH, capacity=SS_CAPACITY):
+        self.params = {'precision': precision, 'width': width, 'depth': depth, 'capacity': capacity}
+        self.completion = {}
+        self.segments = {}
+        self.sources = []
+        self.option_text = {}
+
+    def _completion(self, level, key):
+        if (level, key) not in self.completion:
+            precision = self.params['precision']
+            self.completion[(level, key)] = (HyperLogLog(precision), HyperLogLog(precision))
+        return self.completion[(level, key)]
+
+    def _segment(self, segment, value):
+        if (segment, value) not in self.segments:
+            self.segments[(segment, value)] = SegmentSketch(**self.params)
+        return self.segments[(segment, value)]
+
+    def add_members(self, df):
+        """MEMBERS_SQL 행 묶음 추가 (구성원 / 완료자 HLL)"""
+        hashes = hash_ids(df['id'])
+        completed = df['completed'].to_numpy(dtype=bool)
+        levels = {ALL: (pd.Series(ALL, index=df.index), np.ones(len(df), dtype=bool))}
+        for level, columns in COMPLETION_LEVELS.items():
+            parts = [df[f'c{MEMBER_COLUMNS.index(column)}'] for column in columns]
+            key = parts[0].fillna('N/A').astype(str)
+            for part in parts[1:]:
+                key = key + ' > ' + part.fillna('N/A').astype(str)
+            # completion_sql drops members without the level's first column
+            levels[level] = (key, parts[0].notna().to_numpy())
+        for level, (keys, valid) in levels.items():
+            for key, rows in _groups(keys.to_numpy()[valid]).items():
+                rows = np.flatnonzero(valid)[rows]
+                members, done = self._completion(level, key)
+                members.add(hashes[rows])
+                done.add(hashes[rows[completed[rows]]])
+
+    def add_responses(self, df):
+        """RESPONSES_SQL 행 묶음 추가 (세그먼트 값별 응답자 / 선택지 / 조합)"""
+        df = df.reset_index(drop=True)
+        hashes = hash_ids(df['corporate_id'])
+        # Raw non-null answers count as respondents ('' included), like sql_backend.segment_top_n
+        masks = {question: (option_masks(df[column])[0], df[column].notna().to_numpy())
+                 for question, column in MULTI_SELECT.items()}
+        bits = np.arange(N_OPTIONS, dtype=np.uint16)
+        segments = {ALL: {ALL: np.arange(len(df))}}
+        segments.update({segment: _groups(df[segment].to_numpy()) for segment in SEGMENT_SQL})
+        for segment, groups in segments.items():
+            for value, rows in groups.items():
+                sketch = self._segment(segment, value)
+                sketch.respondents.add(hashes[rows])
+                for question, (question_masks, answered) in masks.items():
+                    chosen = question_masks[rows[answered[rows]]]
+                    sketch.answered[question] += len(chosen)
+                    if not chosen.any():
+                        continue
+                    counts = ((chosen[:, None] >> bits) & 1).sum(axis=0)
+                    sketch.options.add(option_keys(question), counts)
+                    combinations, combination_counts = np.unique(chosen[chosen > 0], return_counts=True)
+                    sketch.combinations[question].update(combinations, combination_counts)
+
+    @classmethod
+    def build(cls, database=None, chunksize=100_000, **params):
+        """DB 파일 하나(파티션)를 chunksize 행씩 읽어 스케치 작성"""
+        sketch = cls(**params)
+        conn = connections.connect(database, readonly=True)
+        try:
+            members = 0
+            for chunk in pd.read_sql_query(MEMBERS_SQL, conn, chunksize=chunksize):
+                sketch.add_members(chunk)
+                members += len(chunk)
+            responses = 0
+            for chunk in pd.read_sql_query(RESPONSES_SQL, conn, chunksize=chunksize):
+                sketch.add_responses(chunk)
+                responses += len(chunk)
+            sketch.option_text = {question: questions.bank(conn).option_list(question) for question in MULTI_SELECT}
+        finally:
+            conn.close()
+        sketch.sources.append({'database': str(connections.resolve(database)), 'members': members,
+                               'responses': responses, 'built_at': datetime.now().isoformat(timespec='seconds')})
+        return sketch
+
+    def merge(self, other):
+        """다른 파티션 스케치를 합침 (같은 설정으로 만든 스케치만)"""
+        if other.params != self.params:
+            raise ValueError(f"스케치 설정이 달라 합칠 수 없습니다: {self.params} != {other.params}")
+        for key, (members, done) in other.completion.items():
+            own_members, own_done = self._completion(*key)
+            own_members.merge(members)
+            own_done.merge(done)
+        for key, segment in other.segments.items():
+            self._segment(*key).merge(segment)
+        self.sources += other.sources
+        self.option_text = self.option_text or other.option_text
+        return self
+
+    def save(self, path):
+        """npz 파일로 저장 (레지스터/표는 배열, 나머지는 JSON 헤더)"""
+        completion_keys = sorted(self.completion)
+        segment_keys = sorted(self.segments, key=str)
+        header = {
+            'version': FORMAT_VERSION,
+            'params': self.params,
+            'sources': self.sources,
+            'option_text': {str(question): options for question, options in self.option_text.items()},
+            'completion': completion_keys,
+            'segments': [[segment, value] for segment, value in segment_keys],
+            'answered': [self.segments[key].answered for key in segment_keys],
+            'combinations': [{question: [summary.counts, summary.errors, summary.floor]
+                              for question, summary in self.segments[key].combinations.items()}
+                             for key in segment_keys],
+        }
+        empty = np.zeros((0, 1 << self.params['precision']), dtype=np.uint8)
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                header=np.array(json.dumps(header, ensure_ascii=False, default=str)),
+                members=np.stack([self.completion[key][0].registers for key in completion_keys]) if completion_keys
+                else empty,
+                completed=np.stack([self.completion[key][1].registers for key in completion_keys]) if completion_keys
+                else empty,
+                respondents=np.stack([self.segments[key].respondents.registers for key in segment_keys])
+                if segment_keys else empty,
+                options=np.stack([self.segments[key].options.table for key in segment_keys]) if segment_keys
+                else np.zeros((0, self.params['depth'], self.params['width']), dtype=np.int64),
+            )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as archive:
+            # NpzFile decompresses on every item access, so each array is read once
+            data = {name: archive[name] for name in archive.files}
+            header = json.loads(str(data['header']))
+            if header['version'] != FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 스케치 파일 버전: {header['version']}")
+            sketch = cls(**header['params'])
+            sketch.sources = header['sources']
+            sketch.option_text = {int(question): {int(option): text for option, text in options.items()}
+                                  for question, options in header['option_text'].items()}
+            precision = header['params']['precision']
+            for i, (level, key) in enumerate(header['completion']):
+                sketch.completion[(level, key)] = (HyperLogLog(precision, data['members'][i]),
+                                                   HyperLogLog(precision, data['completed'][i]))
+            for i, (segment, value) in enumerate(header['segments']):
+                segment_sketch = SegmentSketch(**header['params'])
+                segment_sketch.respondents = HyperLogLog(precision, data['respondents'][i])
+                segment_sketch.options = CountMin(table=data['options'][i])
+                segment_sketch.answered = {int(question): count for question, count in header['answered'][i].items()}
+                for question, (counts, errors, floor) in header['combinations'][i].items():
+                    segment_sketch.combinations[int(question)] = SpaceSaving(
+                        header['params']['capacity'], {int(key): count for key, count in counts.items()},
+                        {int(key): error for key, error in errors.items()}, floor)
+                sketch.segments[(segment, value)] = segment_sketch
+        return sketch
+
+    @classmethod
+    def load_all(cls, paths):
+        """스케치 파일 여러 개를 읽어 하나로 합침"""
+        panel = None
+        for path in paths:
+            sketch = cls.load(path)
+            panel = sketch if panel is None else panel.merge(sketch)
+        return panel
+
+    def completion_rates(self, level=ALL):
+        """[(키, 구성원 추정, 완료자 추정, 완료율 %)] 키 순"""
+        rows = []
+        for (row_level, key), (members, done) in sorted(self.completion.items()):
+            if row_level == level:
+                total, completed = members.estimate(), done.estimate()
+                rows.append((key, total, completed, min(completed / total, 1.0) * 100 if total else 0.0))
+        return rows
+
+    def distinct_respondents(self, segment=ALL):
+        """{세그먼트 값: 고유 응답자 추정}"""
+        return {value: sketch.respondents.estimate()
+                for (row_segment, value), sketch in self.segments.items() if row_segment == segment}
+
+    def top_options(self, question, segment=ALL, n=3):
+        """[(값, 순위, 선택지, 추정 선택 수, 비율 %, 응답 수)] (segment_top_n 과 같은 순서)"""
+        rows = []
+        keys = option_keys(question)
+        for (row_segment, value), sketch in sorted(self.segments.items(), key=lambda item: str(item[0])):
+            answered = sketch.answered[question]
+            if row_segment != segment or not answered:
+                continue
+            counts = sketch.options.estimate(keys)
+            order = np.lexsort((np.arange(N_OPTIONS), -counts))[:n]
+            for rank, index in enumerate(order, 1):
+                if counts[index]:
+                    rows.append((value, rank, index + 1, int(counts[index]), counts[index] / answered * 100, answered))
+        return rows
+
+    def top_combinations(self, question, segment=ALL, value=ALL, n=10):
+        """[(조합 '1 3 10', 추정 수, 최대 과대 추정)]"""
+        summary = self.segments[(segment, value)].combinations[question]
+        return [(mask_text(mask), count, error) for mask, count, error in summary.top(n)]
+
+    def error_bounds(self):
+        """(HLL 상대 표준오차, count-min 최대 과대 추정 비율 = e/width)"""
+        return 1.04 / math.sqrt(1 << self.params['precision']), math.e / self.params['width']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='대규모 패널용 근사 집계 스케치 (HyperLogLog / count-min / space-saving)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('build', help='DB 파일 하나를 스케치 파일로 요약')
+    p.add_argument('out', help='스케치 파일 경로 (.npz)')
+    p.add_argument('--db', default=None, help='SQLite DB 경로 (기본: PMIK_DB 또는 PMIK_2025.db)')
+    p.add_argument('--chunksize', type=int, default=100_000)
+    p.add_argument('--precision', type=int, default=HLL_PRECISION, help='HyperLogLog 정밀도 p (레지스터 2^p 개)')
+    p.add_argument('--width', type=int, default=CM_WIDTH, help='count-min 너비')
+    p.add_argument('--capacity', type=int, default=SS_CAPACITY, help='조합 요약 항목 수')
+
+    p = sub.add_parser('show', help='스케치 파일(여러 개면 합쳐서) 근사 완료율 / Top N')
+    p.add_argument('paths', nargs='+', help='스케치 파일 (파티션별)')
+    p.add_argument('--level', choices=[ALL] + list(COMPLETION_LEVELS), default='biz_unit', help='완료율 단위')
+    p.add_argument('--question', type=int, choices=list(MULTI_SELECT), default=76)
+    p.add_argument('--by', choices=list(SEGMENT_SQL), default=None, help='세그먼트별 Top N')
+    p.add_argument('--top', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        sketch = PanelSketch.build(args.db, args.chunksize, precision=args.precision, width=args.width,
+                                   capacity=args.capacity)
+        sketch.save(args.out)
+        source = sketch.sources[-1]
+        print(f"✓ 스케치 작성: {args.out} (구성원 {source['members']:,}명, 응답 {source['responses']:,}행, "
+              f"세그먼트 값 {len(sketch.segments)}개, {time.perf_counter() - started:.1f}초)")
+        return
+
+    started = time.perf_counter()
+    panel = PanelSketch.load_all(args.paths)
+    loaded = time.perf_counter()
+    completion = panel.completion_rates(args.level)
+    top = panel.top_options(args.question, args.by or ALL, args.top)
+    combinations = panel.top_combinations(args.question, n=5)
+    finished = time.perf_counter()
+
+    hll_error, cm_error = panel.error_bounds()
+    print(f"파티션 {len(panel.sources)}개 | 읽기 {(loaded - started) * 1000:.0f}ms | 추정 {(finished - loaded) * 1000:.1f}ms")
+    print(f"오차: 인원 수 상대 표준오차 ±{hll_error * 100:.1f}%, 선택 수 과대 추정 최대 {cm_error * 100:.2f}% x 전체 선택 수"
+          f" (확률 {1 - math.exp(-panel.params['depth']):.0%})\n")
+
+    print(f"완료율 추정 ({args.level})")
+    for key, members, done, rate in completion:
+        print(f"  {key:40s} {rate:5.1f}% (약 {done:,.0f}/{members:,.0f}명)")
+
+    option_text = panel.option_text.get(args.question, {})
+    print(f"\nQ{args.question} {args.by + '별 ' if args.by else ''}Top {args.top} 추정")
+    current = None
+    for value, rank, option, count, share, answered in top:
+        if value != current:
+            current = value
+            respondents = panel.segments[(args.by or ALL, value)].respondents.estimate()
+            print(f"\n{value} (응답 {answered:,}행, 고유 응답자 약 {respondents:,.0f}명)")
+        print(f"  {rank}. [{option:>2}] {option_text.get(option, ''):<35} 약 {count:,}명 ({share:5.1f}%)")
+
+    print(f"\nQ{args.question} 조합 Top 5 (전체)")
+    for combination, count, error in combinations:
+        print(f"  {combination:<12} 약 {count:,}건" + (f" (최대 {error:,} 과대)" if error else ''))
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
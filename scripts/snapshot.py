@@ -0,0 +1,279 @@
+# Frozen wave snapshots: a closed survey wave compiled into one binary file of
+# fixed-width arrays (Likert matrix, Q75/Q76 option bitmasks, dictionary codes
+# for the segment columns and the string dictionaries themselves). A JSON header
+# records each array's dtype/shape/offset; readers np.memmap the arrays in place,
+# so opening costs no parsing and every process maps the same physical pages.
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import connections
+import questions
+from queries import MULTI_SELECT
+from survey import LIKERT_COLUMNS, N_OPTIONS, TENURE_ORDER, iter_responses
+
+MAGIC = b'PMIKSNAP'
+VERSION = 1
+# Every array starts on a 64-byte (cache line) boundary
+ALIGN = 64
+
+# Dictionary-encoded string columns (code -1 = NULL)
+STRING_COLUMNS = ['biz_unit', 'rank', 'tenure', 'tenure_category']
+
+DICTIONARY_SQL = {
+    'biz_unit': 'SELECT DISTINCT etc1 FROM pmik_raw_data WHERE completed = 1 AND etc1 IS NOT NULL',
+    'rank': 'SELECT DISTINCT rank FROM pmik_raw_data WHERE completed = 1 AND rank IS NOT NULL',
+    'tenure': """
+        SELECT DISTINCT m.근속기간 FROM pmik_raw_data r
+        JOIN pmik_member m ON r.corporate_id = m."ID(new)"
+        WHERE r.completed = 1 AND m.근속기간 IS NOT NULL
+        """,
+}
+
+
+def _align(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def _layout(specs):
+    """{이름: (dtype, shape)} -> ({이름: {dtype, shape, offset}}, 데이터 영역 크기)"""
+    layout, offset = {}, 0
+    for name, (dtype, shape) in specs.items():
+        offset = _align(offset)
+        layout[name] = {'dtype': np.dtype(dtype).str, 'shape': list(shape), 'offset': offset}
+        offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+    return layout, offset
+
+
+def _string_array(values):
+    values = [str(value) for value in values]
+    return np.array(values, dtype=f'<U{max(map(len, values), default=1) or 1}')
+
+
+def dictionaries(conn):
+    """문자열 열별 값 사전 (정렬, 근속 구간은 TENURE_ORDER 순)"""
+    result = {column: sorted(str(row[0]) for row in conn.execute(sql)) for column, sql in DICTIONARY_SQL.items()}
+    result['tenure_category'] = TENURE_ORDER + ['N/A']
+    return result
+
+
+def option_masks(series):
+    """다중선택 응답('4 11 10') -> (선택지 비트마스크 uint16, 응답 여부)"""
+    answered = (series.notna() & (series.astype(str).str.strip() != '')).to_numpy()
+    masks = np.zeros(len(series), dtype=np.uint16)
+    tokens = series[answered].astype(str).str.split().explode()
+    values = pd.to_numeric(tokens, errors='coerce').to_numpy()
+    valid = (values >= 1) & (values <= N_OPTIONS) & (values % 1 == 0)
+    rows = series.index.get_indexer(tokens.index)[valid]
+    np.bitwise_or.at(masks, rows, (1 << (values[valid].astype(np.int64) - 1)).astype(np.uint16))
+    return masks, answered
+
+
+def freeze(database, out, chunksize=50_000):
+    """완료 응답을 스냅샷 파일로 고정 -> 행 수 (응답은 chunksize 행씩 읽어 파일에 직접 기록)"""
+    source = connections.resolve(database)
+    conn = connections.connect(source, readonly=True)
+    n = conn.execute('SELECT COUNT(*) FROM pmik_raw_data WHERE completed = 1').fetchone()[0]
+    id_width = conn.execute('SELECT MAX(LENGTH(corporate_id)) FROM pmik_raw_data WHERE completed = 1').fetchone()[0]
+    values = dictionaries(conn)
+    bank = questions.bank(conn)
+    options = {str(question): bank.option_list(question) for question in MULTI_SELECT}
+
+    specs = {'corporate_id': (f'<U{id_width or 1}', (n,)), 'likert': (np.float32, (n, len(LIKERT_COLUMNS))),
+             'tenure_years': (np.float32, (n,))}
+    for question in MULTI_SELECT:
+        specs[f'q{question}'] = (np.uint16, (n,))
+        specs[f'q{question}_answered'] = (np.bool_, (n,))
+    for column in STRING_COLUMNS:
+        specs[column] = (np.int32, (n,))
+        specs[f'{column}_values'] = (_string_array(values[column]).dtype, (len(values[column]),))
+    layout, size = _layout(specs)
+
+    stat = source.stat()
+    header = json.dumps({
+        'version': VERSION,
+        'rows': n,
+        'arrays': layout,
+        'source': str(source),
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime,
+        'frozen_at': datetime.now().isoformat(timespec='seconds'),
+        'options': options,
+    }, ensure_ascii=False).encode('utf-8')
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    out = Path(out)
+    tmp = out.with_name(out.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC + np.uint64(len(header)).tobytes() + header)
+        f.truncate(data_start + size)
+
+    def array(name):
+        info = layout[name]
+        return np.memmap(tmp, dtype=info['dtype'], mode='r+', offset=data_start + info['offset'],
+                         shape=tuple(info['shape']))
+
+    for column in STRING_COLUMNS:
+        array(f'{column}_values')[:] = _string_array(values[column])
+
+    targets = {name: array(name) for name in specs if not name.endswith('_values')}
+    start = 0
+    for chunk in iter_responses(conn, chunksize):
+        stop = start + len(chunk)
+        rows = slice(start, stop)
+        targets['corporate_id'][rows] = chunk['corporate_id'].fillna('').astype(str).to_numpy()
+        targets['likert'][rows] = chunk[LIKERT_COLUMNS].to_numpy(dtype=np.float32)
+        targets['tenure_years'][rows] = chunk['tenure_years'].to_numpy(dtype=np.float32)
+        for question, column in MULTI_SELECT.items():
+            masks, answered = option_masks(chunk[column].reset_index(drop=True))
+            targets[f'q{question}'][rows] = masks
+            targets[f'q{question}_answered'][rows] = answered
+        for column in STRING_COLUMNS:
+            # Categorical codes are the dictionary positions, -1 for NULL
+            targets[column][rows] = pd.Categorical(chunk[column], categories=values[column]).codes
+        start = stop
+    conn.close()
+
+    for target in targets.values():
+        target.flush()
+    del targets
+    if start != n:
+        tmp.unlink()
+        raise RuntimeError(f"고정 중 응답 수가 바뀌었습니다 ({n} -> {start}). 마감된 웨이브만 고정할 수 있습니다")
+    os.replace(tmp, out)
+    return n
+
+
+class Snapshot:
+    """고정된 웨이브 스냅샷 (배열은 처음 접근할 때 읽기 전용 memmap)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"스냅샷 파일이 아닙니다: {self.path}")
+            length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            self.header = json.loads(f.read(length).decode('utf-8'))
+        if self.header['version'] != VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 버전: {self.header['version']}")
+        self._data_start = _align(len(MAGIC) + 8 + length)
+        self._arrays = {}
+
+    def __len__(self):
+        return self.header['rows']
+
+    def __getitem__(self, name):
+        if name not in self._arrays:
+            info = self.header['arrays'][name]
+            shape = tuple(info['shape'])
+            if 0 in shape:
+                self._arrays[name] = np.empty(shape, dtype=info['dtype'])
+            else:
+                self._arrays[name] = np.memmap(self.path, dtype=info['dtype'], mode='r',
+                                               offset=self._data_start + info['offset'], shape=shape)
+        return self._arrays[name]
+
+    @property
+    def names(self):
+        return list(self.header['arrays'])
+
+    def is_current(self, database=None):
+        """원본 DB 가 고정 이후 바뀌지 않았는지 (파일 크기/수정 시각 기준)"""
+        source = connections.resolve(database or self.header['source'])
+        if not source.exists():
+            return False
+        stat = source.stat()
+        return stat.st_size == self.header['source_size'] and stat.st_mtime == self.header['source_mtime']
+
+    def option_text(self, question):
+        return {int(number): text for number, text in self.header['options'][str(question)].items()}
+
+    def decode(self, column):
+        """사전 코드 열 -> 문자열 배열 (NULL 은 None)"""
+        # Code -1 indexes the appended None
+        values = np.append(np.asarray(self[f'{column}_values']).astype(object), None)
+        return values[np.asarray(self[column])]
+
+    def option_matrix(self, question, rows=slice(None)):
+        """선택지 1..12 선택 여부 (행 x 12 bool)"""
+        masks = np.asarray(self[f'q{question}'][rows])
+        return ((masks[:, None] >> np.arange(N_OPTIONS, dtype=np.uint16)) & 1).astype(bool)
+
+    def option_counts(self, question, codes=None, n_codes=None):
+        """선택지별 선택 수 (codes 지정 시 코드 x 선택지, 코드 -1 행 제외)"""
+        masks = np.asarray(self[f'q{question}'])
+        if codes is None:
+            bits = np.unpackbits(masks.view(np.uint8).reshape(-1, 2), axis=1, bitorder='little')
+            return bits.sum(axis=0, dtype=np.int64)[:N_OPTIONS]
+        codes = np.asarray(codes)
+        keep = codes >= 0
+        n_codes = n_codes or int(codes.max(initial=-1)) + 1
+        return np.stack([np.bincount(codes[keep], weights=(masks[keep] >> bit) & 1, minlength=n_codes)
+                         for bit in range(N_OPTIONS)], axis=1).astype(np.int64)
+
+    def responses(self):
+        """load_responses 와 같은 열의 DataFrame (다중선택은 선택지 번호 오름차순 문자열)"""
+        frame = pd.DataFrame({'corporate_id': np.asarray(self['corporate_id']).astype(object)})
+        for column in ['biz_unit', 'rank', 'tenure']:
+            frame[column] = self.decode(column)
+        frame = pd.concat([frame, pd.DataFrame(np.asarray(self['likert'], dtype=np.float64),
+                                               columns=LIKERT_COLUMNS)], axis=1)
+        for question, column in MULTI_SELECT.items():
+            matrix = self.option_matrix(question)
+            answered = np.asarray(self[f'q{question}_answered'])
+            text = [' '.join(str(option + 1) for option in np.flatnonzero(row)) for row in matrix]
+            frame[column] = np.where(answered, np.array(text, dtype=object), None)
+        frame['tenure_years'] = np.asarray(self['tenure_years'], dtype=np.float64)
+        frame['tenure_category'] = self.decode('tenure_category')
+        return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='마감된 웨이브를 memmap 스냅샷으로 고정 / 스냅샷 정보')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('freeze', help='DB -> 스냅샷 파일')
+    p.add_argument('out', help='스냅샷 파일 경로 (예: PMIK_2025.snap)')
+    p.add_argument('--db', default=None, help='SQLite DB 경로 (기본: PMIK_DB 또는 PMIK_2025.db)')
+    p.add_argument('--chunksize', type=int, default=50_000)
+    p = sub.add_parser('info', help='스냅샷 배열 목록과 Q75/Q76 빈도')
+    p.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'freeze':
+        started = time.perf_counter()
+        rows = freeze(args.db, args.out, args.chunksize)
+        size = Path(args.out).stat().st_size
+        print(f"✓ {args.out} 고정 완료: 응답 {rows:,}행, {size / 1024 / 1024:.1f}MB, "
+              f"{time.perf_counter() - started:.2f}초")
+        return
+
+    started = time.perf_counter()
+    snap = Snapshot(args.path)
+    counts = {question: snap.option_counts(question) for question in MULTI_SELECT}
+    elapsed = time.perf_counter() - started
+    print(f"{snap.path} | 응답 {len(snap):,}행 | 고정 {snap.header['frozen_at']} | "
+          f"원본 {'변경 없음' if snap.is_current() else '변경됨/없음'}")
+    for name in snap.names:
+        info = snap.header['arrays'][name]
+        print(f"  {name:24s} {info['dtype']:>8s} {tuple(info['shape'])}")
+    for question, values in counts.items():
+        answered = int(np.asarray(snap[f'q{question}_answered']).sum())
+        text = snap.option_text(question)
+        top = np.argsort(-values, kind='stable')[:3]
+        print(f"\nQ{question} 상위 선택지 (응답 {answered:,}명)")
+        for option in top:
+            print(f"  [{option + 1:>2}] {text.get(option + 1, ''):35s} {values[option]:>8,}명 "
+                  f"({values[option] / max(answered, 1) * 100:5.1f}%)")
+    print(f"\n열기 + 빈도 계산: {elapsed * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,236 @@
+# Aggregate reports computed entirely inside SQLite (no pandas/numpy).
+# Multi-select answers are split with json_each, rankings use window functions,
+# and only the final summary rows are streamed back to Python.
+import sqlite3
+
+from queries import MULTI_SELECT, completion_sql, quality_filter, top_combinations_sql
+
+LIKERT_COLUMNS = [f'r{i:03d}' for i in range(1, 75)]
+
+# Segment name -> SQL expression over pmik_raw_data r (and pmik_member m for tenure)
+TENURE_MONTHS_SQL = """
+    (CASE WHEN instr(m.근속기간, '년') > 0
+          THEN CAST(substr(m.근속기간, 1, instr(m.근속기간, '년') - 1) AS INTEGER) * 12 ELSE 0 END
+     + CASE WHEN instr(m.근속기간, '개월') > 0
+          THEN CAST(substr(m.근속기간, instr(m.근속기간, '년') + 1,
+                           instr(m.근속기간, '개월') - instr(m.근속기간, '년') - 1) AS INTEGER) ELSE 0 END)
+"""
+
+# Scalar subquery so the tenure string is parsed once per row
+TENURE_CATEGORY_SQL = f"""
+    CASE WHEN m.근속기간 IS NULL THEN 'N/A' ELSE (
+        SELECT CASE
+            WHEN months < 12 THEN '1년 미만'
+            WHEN months < 36 THEN '1-3년'
+            WHEN months < 60 THEN '3-5년'
+            WHEN months < 120 THEN '5-10년'
+            ELSE '10년 이상'
+        END
+        FROM (SELECT {TENURE_MONTHS_SQL} AS months)
+    ) END
+"""
+
+SEGMENT_SQL = {
+    'biz_unit': 'r.etc1',
+    'department': 'r.etc2',
+    'team': 'r.etc3',
+    'rank': 'r.rank',
+    'tenure_category': TENURE_CATEGORY_SQL,
+}
+
+
+def json_options(answer):
+    """다중선택 응답 식('4 11 10')을 json_each 테이블 함수로 분해 (선택지 번호는 option_value 로 읽음)
+
+    정상 응답은 숫자 JSON 배열로 바로 읽고, 연속 공백('4  11')/앞자리 0('04 11')/숫자가 아닌 토큰처럼
+    그 형식이 깨지는 응답만 공백 기준 문자열 배열로 나눔 (survey.option_indicators 와 같은 결과)
+    """
+    numbers = f"'[' || REPLACE(TRIM({answer}), ' ', ',') || ']'"
+    text = answer
+    # Tabs/newlines split like spaces; quotes and backslashes would break the JSON string
+    for char, replacement in (('char(9)', "' '"), ('char(10)', "' '"), ('char(13)', "' '"),
+                              ("'\"'", "'x'"), ("'\\'", "'x'")):
+        text = f"REPLACE({text}, {char}, {replacement})"
+    tokens = f"""'["' || REPLACE(TRIM({text}), ' ', '","') || '"]'"""
+    return f"json_each(CASE WHEN json_valid({numbers}) THEN {numbers} ELSE {tokens} END)"
+
+
+def option_value(alias='j'):
+    """json_options 원소 -> 선택지 번호 (정수 또는 숫자로만 된 토큰, 그 외는 NULL)"""
+    value = f'{alias}.value'
+    return (f"CASE WHEN {alias}.type = 'integer' THEN {value} "
+            f"WHEN {value} GLOB '[0-9]*' AND NOT {value} GLOB '*[^0-9]*' THEN CAST({value} AS INTEGER) END")
+
+
+# Per-connection weights loaded by load_weights (corporate_id -> weight)
+WEIGHTS_TABLE = 'temp.pmik_weights'
+
+
+def _weight(weighted):
+    """(가중치 식, 조인 절) - 가중 집계는 가중치가 적재된 응답자만 포함"""
+    if not weighted:
+        return '1', ''
+    return 'w.weight', f'JOIN {WEIGHTS_TABLE} w ON w.corporate_id = r.corporate_id'
+
+
+def _count(weighted, column='*'):
+    """응답자 수 식 (가중이면 가중치 합)"""
+    if not weighted:
+        return f'COUNT({column})'
+    return 'TOTAL(weight)' if column == '*' else f'TOTAL(CASE WHEN {column} IS NOT NULL THEN w.weight END)'
+
+
+def load_weights(conn, weights):
+    """corporate_id -> 가중치(dict / Series)를 연결 전용 임시 테이블에 적재"""
+    conn.execute(f'CREATE TABLE IF NOT EXISTS {WEIGHTS_TABLE} (corporate_id TEXT PRIMARY KEY, weight REAL)')
+    conn.execute(f'DELETE FROM {WEIGHTS_TABLE}')
+    # OR REPLACE: a weights mapping built elsewhere may repeat an id (one weight per person is kept)
+    conn.executemany(f'INSERT OR REPLACE INTO {WEIGHTS_TABLE} VALUES (?, ?)',
+                     ((k, float(v)) for k, v in weights.items()))
+
+
+def _base_cte(question, segment=None, weighted=False, exclude=0):
+    """완료 응답 중 해당 문항 응답자 (respondent, value, answer, weight)"""
+    column = MULTI_SELECT[question]
+    value = SEGMENT_SQL[segment] if segment else "'전체'"
+    join = 'LEFT JOIN pmik_member m ON r.corporate_id = m."ID(new)"' if segment == 'tenure_category' else ''
+    weight, weight_join = _weight(weighted)
+    return f"""
+    base AS MATERIALIZED (
+        SELECT r.rowid AS respondent, {value} AS value, r.{column} AS answer, {weight} AS weight
+        FROM pmik_raw_data r
+        {join}
+        {weight_join}
+        WHERE r.completed = 1 AND r.{column} IS NOT NULL {quality_filter(exclude)}
+    ),
+    selections AS (
+        -- DISTINCT keeps one count per respondent, like the scripts' LIKE join
+        SELECT DISTINCT b.respondent, b.value, {option_value()} AS option_number, b.weight
+        FROM base b, {json_options('b.answer')} j
+        WHERE b.value IS NOT NULL AND {option_value()} IS NOT NULL
+    )"""
+
+
+def option_frequency_sql(question, weighted=False, exclude=0):
+    """선택지별 빈도 (파라미터: 문항 번호, weighted 면 선택 수/비율이 가중치 합 기준)"""
+    return f"""
+    WITH {_base_cte(question, weighted=weighted, exclude=exclude)},
+    counts AS (
+        SELECT option_number, {_count(weighted)} AS selection_count FROM selections GROUP BY option_number
+    )
+    SELECT
+        e.비고 as option_number,
+        e."선택(보기)" as option_text,
+        c.selection_count,
+        ROUND(c.selection_count * 100.0 / (SELECT {_count(weighted)} FROM base), 1) as percentage
+    FROM counts c
+    JOIN pmik_eos e ON e."No." = ? AND CAST(e.비고 AS INTEGER) = c.option_number
+    ORDER BY c.selection_count DESC, c.option_number
+    """
+
+
+def segment_top_n_sql(question, segment, weighted=False, exclude=0):
+    """세그먼트별 Top N 선택지 (파라미터: 문항 번호, N)"""
+    return f"""
+    WITH {_base_cte(question, segment, weighted, exclude)},
+    sizes AS (
+        SELECT value, {_count(weighted)} AS respondents FROM base WHERE value IS NOT NULL GROUP BY value
+    ),
+    counts AS (
+        SELECT value, option_number, {_count(weighted)} AS count
+        FROM selections
+        WHERE option_number BETWEEN 1 AND 12
+        GROUP BY value, option_number
+    ),
+    ranked AS (
+        SELECT c.*, ROW_NUMBER() OVER (PARTITION BY value ORDER BY count DESC, option_number) AS rank
+        FROM counts c
+    )
+    SELECT
+        ranked.value,
+        ranked.rank,
+        ranked.option_number,
+        e."선택(보기)" AS option_text,
+        ranked.count,
+        sizes.respondents,
+        ranked.count * 100.0 / sizes.respondents AS percentage
+    FROM ranked
+    JOIN sizes USING (value)
+    LEFT JOIN pmik_eos e ON e."No." = ? AND CAST(e.비고 AS INTEGER) = ranked.option_number
+    WHERE ranked.rank <= ?
+    ORDER BY ranked.value, ranked.rank
+    """
+
+
+def likert_means_sql(segment, weighted=False, exclude=0):
+    """세그먼트 값별 Likert 문항 응답 수/평균 (값 하나당 한 행, weighted 면 가중 평균)"""
+    value = SEGMENT_SQL[segment]
+    join = 'LEFT JOIN pmik_member m ON r.corporate_id = m."ID(new)"' if segment == 'tenure_category' else ''
+    _, weight_join = _weight(weighted)
+    if weighted:
+        means = [f"TOTAL(r.{col} * w.weight) / {_count(True, f'r.{col}')}" for col in LIKERT_COLUMNS]
+    else:
+        means = [f"AVG(r.{col})" for col in LIKERT_COLUMNS]
+    aggregates = ",\n        ".join(f"COUNT(r.{col}), {mean}" for col, mean in zip(LIKERT_COLUMNS, means))
+    return f"""
+    SELECT
+        {value} AS value,
+        {aggregates}
+    FROM pmik_raw_data r
+    {join}
+    {weight_join}
+    WHERE r.completed = 1 AND {value} IS NOT NULL {quality_filter(exclude)}
+    GROUP BY 1
+    ORDER BY 1
+    """
+
+
+def _stream(conn, sql, params=()):
+    """결과 행을 하나씩 전달 (sqlite3.Row: 이름/위치로 접근)"""
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    try:
+        yield from cursor.execute(sql, params)
+    finally:
+        cursor.close()
+
+
+def completion_by(conn, level='biz_unit'):
+    """조직 단위별 대상/완료/미완료/미응답 집계"""
+    return _stream(conn, completion_sql(level))
+
+
+def _weighted(conn, weights):
+    if weights is None:
+        return False
+    load_weights(conn, weights)
+    return True
+
+
+def option_frequency(conn, question, weights=None, exclude=0):
+    """선택지별 빈도 (option_number, option_text, selection_count, percentage)
+
+    weights(corporate_id -> 가중치) 지정 시 가중 선택 수/비율 (weighting.rake_weights),
+    exclude 지정 시 해당 품질 플래그 행 제외 (validate.py)
+    """
+    return _stream(conn, option_frequency_sql(question, _weighted(conn, weights), exclude), (float(question),))
+
+
+def top_combinations(conn, question, n=10):
+    """가장 많이 선택된 조합 Top N"""
+    return _stream(conn, top_combinations_sql(question), (n,))
+
+
+def segment_top_n(conn, question, segment, n=3, weights=None, exclude=0):
+    """세그먼트별 Top N 선택지 (value, rank, option_number, option_text, count, respondents, percentage)"""
+    return _stream(conn, segment_top_n_sql(question, segment, _weighted(conn, weights), exclude),
+                   (float(question), n))
+
+
+def likert_means(conn, segment, weights=None, exclude=0):
+    """세그먼트 값 x Likert 문항별 (value, item, n, mean). weights 지정 시 가중 평균 (n 은 응답 수)"""
+    for row in _stream(conn, likert_means_sql(segment, _weighted(conn, weights), exclude)):
+        for i, item in enumerate(LIKERT_COLUMNS):
+            n, mean = row[1 + 2 * i], row[2 + 2 * i]
+            if n:
+                yield row['value'], item, n, mean
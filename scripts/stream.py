@@ -0,0 +1,199 @@
+# Streaming output for long reports. Each section is written and flushed as soon
+# as its result is ready, and long steps (k-means search, key-driver fits, report
+# rendering) report progress with an ETA. On a terminal, progress is one redrawn
+# line on stderr and stdout carries only the report text. When stdout is a pipe
+# or a file, every event is one JSON object per line with no ANSI codes, so another
+# program can consume results while the run is still going.
+# Ctrl+C cancels: worker pools are terminated and a final 'cancelled' event is written.
+# Standard library only.
+import contextlib
+import json
+import math
+import os
+import signal
+import sys
+import time
+
+MODES = ('auto', 'text', 'json')
+
+# Minimum seconds between progress redraws (terminal) and progress events (JSON lines)
+REDRAW_INTERVAL = 0.1
+EVENT_INTERVAL = 1.0
+
+BAR_WIDTH = 24
+
+
+def ignore_interrupt():
+    """워커 프로세스 initializer: Ctrl+C 는 부모 프로세스만 처리 (워커마다 traceback 이 찍히지 않도록)"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def format_duration(seconds):
+    """초 -> 'MM:SS' 또는 'H:MM:SS' (모르면 '--:--')"""
+    if seconds is None or not math.isfinite(seconds):
+        return '--:--'
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02d}:{seconds:02d}' if hours else f'{minutes:02d}:{seconds:02d}'
+
+
+def _jsonable(value):
+    # numpy scalars and arrays
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+class Progress:
+    """진행률 (완료 수 / 전체, 경과 시간, 남은 시간 추정)"""
+
+    def __init__(self, stream, task, total=None, unit=''):
+        self.stream = stream
+        self.task = task
+        self.total = total
+        self.unit = unit
+        self.done = 0
+        self.started = time.perf_counter()
+        self._shown = None
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def eta(self):
+        """남은 시간 추정 (지금까지의 평균 속도 기준, 모르면 None)"""
+        if not self.total or not self.done:
+            return None
+        return self.elapsed / self.done * max(self.total - self.done, 0)
+
+    def update(self, done, total=None):
+        if total is not None:
+            self.total = total
+        self.done = done
+        now = time.perf_counter()
+        interval = EVENT_INTERVAL if self.stream.json else REDRAW_INTERVAL
+        # The terminal bar is redrawn at completion; JSON gets a single 'finished' event from __exit__
+        final = done == self.total and not self.stream.json
+        if self._shown is None or now - self._shown >= interval or final:
+            self._shown = now
+            self.stream._show(self)
+
+    def advance(self, n=1):
+        self.update(self.done + n)
+
+    def __call__(self, done, total=None):
+        # Usable directly as a progress(done, total) callback
+        self.update(done, total)
+
+    def __enter__(self):
+        self._shown = time.perf_counter()
+        self.stream._show(self)
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.stream._finish(self)
+        else:
+            self.stream._clear()
+        return False
+
+
+class Stream:
+    """섹션 단위 즉시 출력 (mode: auto = 터미널이면 text, 파이프/파일이면 json lines)"""
+
+    def __init__(self, mode='auto', out=None, err=None):
+        self.out = out or sys.stdout
+        self.err = err or sys.stderr
+        if mode == 'auto':
+            mode = 'text' if self.out.isatty() else 'json'
+        self.json = mode == 'json'
+        # A redrawn progress line only makes sense when someone is watching stderr
+        self.live = not self.json and self.err.isatty()
+        self.started = time.perf_counter()
+        self._line = False
+
+    def _emit(self, event, **fields):
+        self.out.write(json.dumps({'event': event, **fields}, ensure_ascii=False, default=_jsonable) + '\n')
+        self.out.flush()
+
+    def _clear(self):
+        if self._line:
+            self.err.write('\r\x1b[K')
+            self.err.flush()
+            self._line = False
+
+    def section(self, heading, lines=(), data=None):
+        """섹션 하나를 바로 출력 (json: {"event": "section", "title", "data" 또는 "lines"})"""
+        if self.json:
+            fields = {'data': data} if data is not None else {'lines': list(lines)}
+            self._emit('section', title=heading.strip(), **fields)
+            return
+        self._clear()
+        self.out.write('\n'.join([heading, *lines]) + '\n')
+        self.out.flush()
+
+    def message(self, text):
+        """한 줄 메시지"""
+        if self.json:
+            self._emit('message', text=text.strip())
+        else:
+            self.section(text)
+
+    def progress(self, task, total=None, unit=''):
+        """with stream.progress('k-means', total) as progress: ... progress.advance()"""
+        return Progress(self, task, total, unit)
+
+    def _status(self, progress):
+        done = f'{progress.done:,}{progress.unit}'
+        if progress.total:
+            filled = int(BAR_WIDTH * min(progress.done / progress.total, 1))
+            bar = '#' * filled + '.' * (BAR_WIDTH - filled)
+            return (f'{progress.task} [{bar}] {done}/{progress.total:,}{progress.unit} '
+                    f'{progress.done / progress.total * 100:3.0f}% | 경과 {format_duration(progress.elapsed)} '
+                    f'| 남은 시간 {format_duration(progress.eta())}')
+        return f'{progress.task} {done} | 경과 {format_duration(progress.elapsed)}'
+
+    def _show(self, progress):
+        if self.json:
+            eta = progress.eta()
+            self._emit('progress', task=progress.task, done=progress.done, total=progress.total,
+                       elapsed=round(progress.elapsed, 2), eta=None if eta is None else round(eta, 2))
+        elif self.live:
+            self.err.write('\r\x1b[K' + self._status(progress))
+            self.err.flush()
+            self._line = True
+
+    def _finish(self, progress):
+        if self.json:
+            self._emit('progress', task=progress.task, done=progress.done, total=progress.total,
+                       elapsed=round(progress.elapsed, 2), eta=0.0, finished=True)
+        elif self.live:
+            # Leave the completed bar on screen as a timing record
+            self.err.write('\r\x1b[K' + self._status(progress) + '\n')
+            self.err.flush()
+            self._line = False
+
+    @contextlib.contextmanager
+    def cancellable(self):
+        """실행 전체를 감싸 Ctrl+C 를 정리된 종료(코드 130)로 바꿈. 파이프를 읽는 쪽이 닫히면 조용히 종료"""
+        try:
+            yield self
+        except KeyboardInterrupt:
+            self._clear()
+            if self.json:
+                self._emit('cancelled', elapsed=round(time.perf_counter() - self.started, 2))
+            else:
+                self.err.write('\n중단됨 (Ctrl+C)\n')
+            raise SystemExit(130)
+        except BrokenPipeError:
+            # e.g. `| head`: point stdout at /dev/null so the interpreter's final flush does not fail again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), self.out.fileno())
+            raise SystemExit(1)
+        if self.json:
+            self._emit('done', elapsed=round(time.perf_counter() - self.started, 2))
+
+
+def add_argument(parser):
+    """--output auto|text|json 옵션 추가"""
+    parser.add_argument('--output', choices=MODES, default='auto',
+                        help='출력 형식 (auto: 터미널이면 text, 파이프/파일이면 json lines)')
@@ -0,0 +1,159 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from queries import MULTI_SELECT, quality_filter
+
+# Segments shared by the analysis scripts (column name in load_responses frame)
+SEGMENTS = ['biz_unit', 'rank', 'tenure_category']
+
+TENURE_ORDER = ['1년 미만', '1-3년', '3-5년', '5-10년', '10년 이상']
+
+LIKERT_COLUMNS = [f'r{i:03d}' for i in range(1, 75)]
+
+N_OPTIONS = 12
+
+
+def parse_tenure_years(tenure_str):
+    """근속기간 문자열에서 년수 추출 (예: '7년 5개월' -> 7.4)"""
+    if pd.isna(tenure_str):
+        return None
+
+    years = 0
+    months = 0
+
+    # '년' 추출
+    year_match = re.search(r'(\d+)년', str(tenure_str))
+    if year_match:
+        years = int(year_match.group(1))
+
+    # '개월' 추출
+    month_match = re.search(r'(\d+)개월', str(tenure_str))
+    if month_match:
+        months = int(month_match.group(1))
+
+    return years + months / 12
+
+
+def categorize_tenure(years):
+    """근속기간을 구간으로 분류"""
+    if pd.isna(years):
+        return 'N/A'
+    elif years < 1:
+        return '1년 미만'
+    elif years < 3:
+        return '1-3년'
+    elif years < 5:
+        return '3-5년'
+    elif years < 10:
+        return '5-10년'
+    else:
+        return '10년 이상'
+
+
+def responses_query(company=None, company_column='company', exclude=0):
+    """load_responses 쿼리와 파라미터 (exclude: 제외할 품질 플래그 비트, validate.py 참고)"""
+    likert = ", ".join(f"r.{col}" for col in LIKERT_COLUMNS)
+    query = f"""
+    SELECT
+        r.corporate_id,
+        r.etc1 as biz_unit,
+        r.rank,
+        m.근속기간 as tenure,
+        {likert},
+        r.r075,
+        r.r076
+    FROM pmik_raw_data r
+    LEFT JOIN pmik_member m ON r.corporate_id = m."ID(new)"
+    WHERE r.completed = 1 {quality_filter(exclude)}
+    """
+    params = ()
+    if company is not None:
+        query += f' AND r."{company_column}" = ?'
+        params = (company,)
+    return query, params
+
+
+def add_tenure(df):
+    """tenure 문자열 열로 tenure_years / tenure_category 추가"""
+    df['tenure_years'] = df['tenure'].apply(parse_tenure_years)
+    df['tenure_category'] = df['tenure_years'].apply(categorize_tenure)
+    return df
+
+
+def load_responses(conn, company=None, company_column='company', exclude=0):
+    """완료된 응답 + 근속기간 구간 로드 (company 지정 시 해당 회사만)"""
+    query, params = responses_query(company, company_column, exclude)
+    return add_tenure(pd.read_sql_query(query, conn, params=params))
+
+
+def iter_responses(conn, chunksize=50_000, company=None, company_column='company', exclude=0):
+    """load_responses 와 같은 열을 chunksize 행씩 나눠 전달 (커서 단위 fetch)"""
+    query, params = responses_query(company, company_column, exclude)
+    for chunk in pd.read_sql_query(query, conn, params=params, chunksize=chunksize):
+        yield add_tenure(chunk)
+
+
+def option_indicators(series, question, n_options=N_OPTIONS):
+    """다중선택 응답('4 11 10')을 선택지별 0/1 행렬로 변환 (열: q75_01 ...)"""
+    columns = [f'q{question}_{opt:02d}' for opt in range(1, n_options + 1)]
+    matrix = np.zeros((len(series), n_options), dtype=np.float64)
+    answered = series.notna() & (series.astype(str).str.strip() != '')
+    if answered.any():
+        # Explode once into (row, option) pairs and scatter into the matrix
+        exploded = series[answered].astype(str).str.split().explode()
+        rows = series.index.get_indexer(exploded.index)
+        opts = pd.to_numeric(exploded, errors='coerce').to_numpy()
+        valid = (opts >= 1) & (opts <= n_options)
+        matrix[rows[valid], opts[valid].astype(int) - 1] = 1.0
+    matrix[~answered.to_numpy()] = np.nan
+    return pd.DataFrame(matrix, index=series.index, columns=columns)
+
+
+def item_matrix(df):
+    """Likert 문항 + Q75/Q76 선택지 지표를 하나의 문항 행렬로 결합"""
+    parts = [df[LIKERT_COLUMNS].astype(float)]
+    for question, column in MULTI_SELECT.items():
+        parts.append(option_indicators(df[column], question))
+    return pd.concat(parts, axis=1)
+
+
+def segment_item_table(df, segments=SEGMENTS, weights=None):
+    """세그먼트 값 x 문항별 응답 수/평균 (long format)
+
+    weights(corporate_id -> 가중치) 지정 시 평균은 가중 평균, n 은 그대로 응답 수
+    """
+    items = item_matrix(df)
+    frames = []
+    if weights is None:
+        def means_by(key):
+            return items.groupby(key).mean()
+    else:
+        weight = df['corporate_id'].map(weights).fillna(0.0)
+        weighted = items.mul(weight, axis=0)
+        answered = items.notna().mul(weight, axis=0)
+
+        def means_by(key):
+            return weighted.groupby(key).sum() / answered.groupby(key).sum().where(lambda w: w > 0)
+
+    # Whole population as its own segment so trends include a company baseline
+    total = pd.DataFrame({
+        'segment': '전체',
+        'value': '전체',
+        'item': items.columns,
+        'n': items.count().to_numpy(),
+        'mean': means_by(pd.Series('전체', index=df.index)).iloc[0].to_numpy(),
+    })
+    frames.append(total)
+
+    for segment in segments:
+        grouped = items.groupby(df[segment])
+        means = means_by(df[segment]).stack()
+        counts = grouped.count().stack()
+        frame = pd.DataFrame({'n': counts, 'mean': means}).reset_index()
+        frame.columns = ['value', 'item', 'n', 'mean']
+        frame.insert(0, 'segment', segment)
+        frames.append(frame)
+
+    return pd.concat(frames, ignore_index=True)
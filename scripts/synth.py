@@ -0,0 +1,187 @@
+import argparse
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from survey import LIKERT_COLUMNS, N_OPTIONS
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATE_DB = PROJECT_ROOT / 'PMIK_2025.db'
+
+TABLES = ['pmik_member', 'pmik_raw_data', 'pmik_eos']
+
+SURNAMES = list('김이박최정강조윤장임한오서신권황안송류홍')
+GIVEN = list('민서지현수영준우진하은도윤예성연재승태동경희')
+
+# Option popularity (relative weights) used when no template responses exist
+DEFAULT_WEIGHTS = {
+    75: [24, 60, 29, 51, 14, 4, 12, 20, 19, 58, 31, 18],
+    76: [83, 48, 50, 39, 25, 36, 4, 7, 33, 16, 12, 11],
+}
+
+REFERENCE_DATE = datetime(2025, 10, 1)
+CHUNK_SIZE = 50_000
+
+
+def _template_profile(template):
+    """템플릿 DB에서 스키마, 문항 은행, 조직/직급 분포, 선택지 인기도 추출"""
+    conn = sqlite3.connect(template)
+    ddl = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'table'"
+    ).fetchall())
+    eos = pd.read_sql_query('SELECT * FROM pmik_eos', conn)
+    structure = pd.read_sql_query("""
+    SELECT "Biz Unit." as biz_unit, Department, Team, COUNT(*) as n
+    FROM pmik_member
+    WHERE "Biz Unit." IS NOT NULL
+    GROUP BY "Biz Unit.", Department, Team
+    """, conn)
+    ranks = pd.read_sql_query("""
+    SELECT "Job Title" as rank, COUNT(*) as n
+    FROM pmik_member
+    WHERE "Job Title" IS NOT NULL
+    GROUP BY "Job Title"
+    """, conn)
+
+    weights = {}
+    for question, column in (75, 'r075'), (76, 'r076'):
+        counts = np.ones(N_OPTIONS)
+        for (value,) in conn.execute(f'SELECT {column} FROM pmik_raw_data WHERE {column} IS NOT NULL'):
+            for opt in str(value).split():
+                if opt.isdigit() and 1 <= int(opt) <= N_OPTIONS:
+                    counts[int(opt) - 1] += 1
+        weights[question] = counts if counts.sum() > N_OPTIONS else np.array(DEFAULT_WEIGHTS[question], float)
+    conn.close()
+    return ddl, eos, structure, ranks, weights
+
+
+def _choose_three(rng, weights, n):
+    """가중치 기반 비복원 3개 선택 (Gumbel top-k), '4 11 10' 형식 문자열"""
+    logits = np.log(weights / weights.sum())
+    keys = logits + rng.gumbel(size=(n, len(weights)))
+    picks = np.argsort(-keys, axis=1)[:, :3] + 1
+    return pd.Series([' '.join(map(str, row)) for row in picks.tolist()])
+
+
+def _tenure_strings(months):
+    """개월 수 -> '7년 5개월' 형식"""
+    years, rest = np.divmod(months, 12)
+    return pd.Series([f'{y}년 {m}개월' for y, m in zip(years.tolist(), rest.tolist())])
+
+
+def _chunk(rng, start, n, structure, ranks, weights, columns):
+    """start 번째 직원부터 n명의 (member, raw_data) 프레임 생성"""
+    ids = [f'KR{idx:07d}' for idx in range(start, start + n)]
+
+    org = structure.iloc[rng.choice(len(structure), size=n, p=structure['n'] / structure['n'].sum())]
+    rank = ranks['rank'].to_numpy()[rng.choice(len(ranks), size=n, p=ranks['n'] / ranks['n'].sum())]
+    names = [a + b + c for a, b, c in zip(rng.choice(SURNAMES, n), rng.choice(GIVEN, n), rng.choice(GIVEN, n))]
+
+    # Long-tailed tenure: most staff under 3 years, a few past 10
+    months = np.minimum(rng.gamma(1.4, 22, size=n).astype(int), 30 * 12)
+    hired = [(REFERENCE_DATE - timedelta(days=int(m * 30.4))).strftime('%Y-%m-%d 00:00:00') for m in months]
+
+    member = pd.DataFrame({
+        'ID(new)': ids,
+        'Name(Kor.)': names,
+        'Contract': '정규직',
+        'Temperory': np.nan,
+        'Job Title': rank,
+        '입사일': hired,
+        '근속기간': _tenure_strings(months),
+        'Email': [f'user{idx}@example.com' for idx in range(start, start + n)],
+        '근로시간': 40,
+        'Biz Unit.': org['biz_unit'].to_numpy(),
+        'Department': org['Department'].to_numpy(),
+        'Team': org['Team'].to_numpy(),
+    })
+
+    # ~1% never open the survey, ~4% of the rest leave it incomplete
+    responded = rng.random(n) > 0.01
+    raw = member[responded].reset_index(drop=True)
+    m = len(raw)
+    completed = (rng.random(m) > 0.04).astype(int)
+
+    data = pd.DataFrame(index=range(m), columns=columns)
+    data['id'] = np.arange(start, start + n)[responded]
+    data['surveys_id'] = 468
+    data['name'] = raw['Name(Kor.)']
+    data['corporate_id'] = raw['ID(new)']
+    data['email'] = raw['Email']
+    data['rank'] = raw['Job Title']
+    data['etc1'] = raw['Biz Unit.']
+    data['etc2'] = raw['Department']
+    data['etc3'] = raw['Team']
+    data['etc4'] = '정규직'
+    data['created_at'] = '2025-10-19 23:07:18'
+    data['completed'] = completed
+    data['completed_at'] = np.where(completed == 1, '2025-10-28 10:41:48', None)
+    data['sent01'] = 1
+    data['sent02'] = 0
+
+    # Likert: respondent-level leniency plus item noise, rounded to 1..5
+    leniency = rng.normal(3.5, 0.5, size=(m, 1))
+    likert = np.clip(np.rint(leniency + rng.normal(0, 0.8, size=(m, len(LIKERT_COLUMNS)))), 1, 5)
+    likert[completed == 0] = np.nan
+    data[LIKERT_COLUMNS] = likert
+
+    for question, column in (75, 'r075'), (76, 'r076'):
+        choices = _choose_three(rng, weights[question], m)
+        data[column] = choices.where(completed == 1, None)
+
+    return member, data
+
+
+def generate(path, n_respondents, seed=0, template=TEMPLATE_DB, chunk_size=CHUNK_SIZE):
+    """템플릿과 동일한 스키마로 n명 규모의 합성 DB 생성"""
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+
+    ddl, eos, structure, ranks, weights = _template_profile(template)
+    rng = np.random.default_rng(seed)
+
+    conn = sqlite3.connect(path)
+    for table in TABLES:
+        conn.execute(ddl[table])
+    eos.to_sql('pmik_eos', conn, if_exists='append', index=False)
+
+    member_columns = [row[1] for row in conn.execute('PRAGMA table_info(pmik_member)')]
+    raw_columns = [row[1] for row in conn.execute('PRAGMA table_info(pmik_raw_data)')]
+
+    for start in range(0, n_respondents, chunk_size):
+        n = min(chunk_size, n_respondents - start)
+        member, raw = _chunk(rng, start, n, structure, ranks, weights, raw_columns)
+        member = member.reindex(columns=member_columns)
+        member.to_sql('pmik_member', conn, if_exists='append', index=False)
+        raw.to_sql('pmik_raw_data', conn, if_exists='append', index=False)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='합성 EOS 설문 DB 생성')
+    parser.add_argument('out', help='생성할 DB 경로')
+    parser.add_argument('-n', '--respondents', type=int, default=1000, help='직원 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--template', default=str(TEMPLATE_DB), help='스키마/문항 은행 템플릿 DB')
+    parser.add_argument('--no-validate', action='store_true', help='생성 후 품질 검증(validate.py) 생략')
+    args = parser.parse_args(argv)
+
+    path = generate(args.out, args.respondents, args.seed, args.template)
+    print(f"✓ {path} 생성 완료 ({args.respondents:,}명)")
+    if not args.no_validate:
+        import validate
+
+        flagged, checked, _ = validate.run(path)
+        print(f"✓ 품질 검증: {checked:,}행 중 {len(flagged):,}행 플래그 (pmik_quality)")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
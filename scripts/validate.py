@@ -0,0 +1,220 @@
+# Row-level data-quality validation of completed responses. Every check is a
+# vectorized pass over a chunk (or one SQL query for the cross-row checks), and
+# each row gets a bit mask of queries.QUALITY_FLAGS. Flagged rows are stored in
+# pmik_quality so the engines can exclude them by rowid without re-validating.
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from queries import ALL_QUALITY_FLAGS, MULTI_SELECT, QUALITY_FLAGS
+from survey import LIKERT_COLUMNS, N_OPTIONS
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB = PROJECT_ROOT / 'PMIK_2025.db'
+
+N_CHOICES = 3
+LIKERT_VALUES = np.arange(1, 6)
+
+QUALITY_TABLES = """
+CREATE TABLE IF NOT EXISTS pmik_quality (
+    raw_rowid INTEGER PRIMARY KEY,
+    corporate_id TEXT,
+    flags INTEGER,
+    q75_options INTEGER,
+    q76_options INTEGER,
+    likert_invalid INTEGER,
+    likert_missing INTEGER,
+    modal_share REAL,
+    duration_sec REAL
+);
+CREATE TABLE IF NOT EXISTS pmik_quality_meta (
+    checked_at TEXT,
+    rows_checked INTEGER,
+    rows_flagged INTEGER,
+    settings TEXT
+);
+"""
+
+# There is no start timestamp: the last save -> submit gap is the only duration available
+DURATION_SQL = "(julianday(r.completed_at) - julianday(r.updated_at)) * 86400"
+
+ROWS_SQL = f"""
+SELECT
+    r.rowid AS raw_rowid,
+    r.corporate_id,
+    {DURATION_SQL} AS duration_sec,
+    r.corporate_id IS NULL
+        OR r.corporate_id NOT IN (SELECT "ID(new)" FROM pmik_member WHERE "ID(new)" IS NOT NULL) AS orphan,
+    {", ".join(f"r.{col}" for col in LIKERT_COLUMNS)},
+    {", ".join(f"r.{column}" for column in MULTI_SELECT.values())}
+FROM pmik_raw_data r
+WHERE r.completed = 1
+"""
+
+# Every completed row of a repeated corporate_id except the latest submission
+DUPLICATES_SQL = """
+SELECT rowid FROM (
+    SELECT rowid, ROW_NUMBER() OVER (
+        PARTITION BY corporate_id ORDER BY completed_at DESC, rowid DESC
+    ) AS n
+    FROM pmik_raw_data
+    WHERE completed = 1 AND corporate_id IS NOT NULL
+)
+WHERE n > 1
+"""
+
+
+def option_counts(series):
+    """다중선택 응답별 (유효 고유 선택지 수, 전체 토큰 수)"""
+    tokens = series.fillna('').astype(str).str.split().explode()
+    values = pd.to_numeric(tokens, errors='coerce')
+    valid = values.between(1, N_OPTIONS) & (values % 1 == 0)
+    total = tokens.notna().groupby(level=0).sum().reindex(series.index, fill_value=0)
+    unique = values[valid].groupby(level=0).nunique().reindex(series.index, fill_value=0)
+    return unique.to_numpy(), total.to_numpy()
+
+
+def likert_checks(likert):
+    """Likert 행렬 -> (범위 밖 답 수, 결측 수, 최빈 답 비율)"""
+    answered = ~np.isnan(likert)
+    valid = answered & np.isin(likert, LIKERT_VALUES)
+    invalid = (answered & ~valid).sum(axis=1)
+    missing = (~answered).sum(axis=1)
+    modal = np.stack([(likert == value).sum(axis=1) for value in LIKERT_VALUES]).max(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = np.where(answered.any(axis=1), modal / answered.sum(axis=1), np.nan)
+    return invalid, missing, share
+
+
+def check_chunk(chunk, duplicates, speed_limit, straight_line=0.9, min_answers=20):
+    """청크의 행별 플래그와 진단 값 (DataFrame, raw_rowid 순)"""
+    flags = np.zeros(len(chunk), dtype=np.int64)
+    result = pd.DataFrame({'raw_rowid': chunk['raw_rowid'], 'corporate_id': chunk['corporate_id']})
+
+    for question, column in MULTI_SELECT.items():
+        unique, total = option_counts(chunk[column])
+        flags |= np.where((unique != N_CHOICES) | (total != N_CHOICES), QUALITY_FLAGS[f'q{question}_options'], 0)
+        result[f'q{question}_options'] = unique
+
+    invalid, missing, share = likert_checks(chunk[LIKERT_COLUMNS].to_numpy(dtype=np.float64))
+    answered = len(LIKERT_COLUMNS) - missing
+    flags |= np.where(invalid > 0, QUALITY_FLAGS['likert_range'], 0)
+    flags |= np.where(missing > 0, QUALITY_FLAGS['likert_missing'], 0)
+    flags |= np.where((answered >= min_answers) & (share >= straight_line), QUALITY_FLAGS['straight_line'], 0)
+    result['likert_invalid'] = invalid
+    result['likert_missing'] = missing
+    result['modal_share'] = share
+
+    duration = chunk['duration_sec'].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        flags |= np.where(duration < speed_limit, QUALITY_FLAGS['speeder'], 0)
+    result['duration_sec'] = duration
+
+    flags |= np.where(np.isin(chunk['raw_rowid'].to_numpy(), duplicates), QUALITY_FLAGS['duplicate_id'], 0)
+    flags |= np.where(chunk['orphan'].to_numpy(dtype=bool), QUALITY_FLAGS['orphan'], 0)
+    result.insert(2, 'flags', flags)
+    return result
+
+
+def validate(conn, chunksize=50_000, straight_line=0.9, speed_ratio=0.3, min_answers=20):
+    """완료 응답 전체 검증 -> (플래그가 있는 행 DataFrame, 검사한 행 수, 설정 dict)"""
+    durations = np.array([row[0] for row in conn.execute(
+        f'SELECT {DURATION_SQL} FROM pmik_raw_data r WHERE r.completed = 1')], dtype=np.float64)
+    median = float(np.nanmedian(durations)) if np.isfinite(durations).any() else float('nan')
+    settings = {
+        'straight_line': straight_line,
+        'min_answers': min_answers,
+        'speed_ratio': speed_ratio,
+        'median_duration_sec': median,
+        'speed_limit_sec': median * speed_ratio,
+    }
+    duplicates = np.array([row[0] for row in conn.execute(DUPLICATES_SQL)], dtype=np.int64)
+
+    flagged = []
+    checked = 0
+    for chunk in pd.read_sql_query(ROWS_SQL, conn, chunksize=chunksize):
+        result = check_chunk(chunk, duplicates, settings['speed_limit_sec'], straight_line, min_answers)
+        flagged.append(result[result['flags'] != 0])
+        checked += len(chunk)
+    columns = ['raw_rowid', 'corporate_id', 'flags']
+    flagged = pd.concat(flagged, ignore_index=True) if flagged else pd.DataFrame(columns=columns)
+    return flagged, checked, settings
+
+
+def save(conn, flagged, checked, settings):
+    """pmik_quality / pmik_quality_meta 교체 저장 (한 트랜잭션)"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for statement in QUALITY_TABLES.split(';'):
+            if statement.strip():
+                conn.execute(statement)
+        conn.execute('DELETE FROM pmik_quality')
+        conn.execute('DELETE FROM pmik_quality_meta')
+        columns = ['raw_rowid', 'corporate_id', 'flags', 'q75_options', 'q76_options', 'likert_invalid',
+                   'likert_missing', 'modal_share', 'duration_sec']
+        rows = flagged.reindex(columns=columns).astype(object).where(flagged.notna(), None)
+        conn.executemany(f'INSERT INTO pmik_quality VALUES ({", ".join("?" * len(columns))})',
+                         rows.itertuples(index=False, name=None))
+        conn.execute("INSERT INTO pmik_quality_meta VALUES (datetime('now', 'localtime'), ?, ?, ?)",
+                     (checked, len(flagged), json.dumps(settings)))
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def summary(flagged):
+    """플래그별 행 수 {이름: 수}"""
+    flags = flagged['flags'].to_numpy(dtype=np.int64)
+    return {name: int(((flags & bit) != 0).sum()) for name, bit in QUALITY_FLAGS.items()}
+
+
+def run(database, chunksize=50_000, dry_run=False, **options):
+    """DB 검증 후 pmik_quality 저장 (dry_run 이면 저장 생략) -> (flagged, checked, settings)"""
+    conn = sqlite3.connect(database, isolation_level=None)
+    try:
+        flagged, checked, settings = validate(conn, chunksize, **options)
+        if not dry_run:
+            save(conn, flagged, checked, settings)
+    finally:
+        conn.close()
+    return flagged, checked, settings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='응답 데이터 품질 검증 (행 단위 플래그 -> pmik_quality)')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite DB 경로')
+    parser.add_argument('--straight-line', type=float, default=0.9,
+                        help='같은 Likert 답 비율이 이 값 이상이면 일자 응답')
+    parser.add_argument('--speed-ratio', type=float, default=0.3, help='응답 시간이 중앙값 x 이 값 미만이면 과속 응답')
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    parser.add_argument('--dry-run', action='store_true', help='DB 에 저장하지 않고 결과만 출력')
+    parser.add_argument('--show', type=int, default=10, help='출력할 플래그 행 수')
+    args = parser.parse_args(argv)
+
+    flagged, checked, settings = run(args.db, args.chunksize, args.dry_run,
+                                     straight_line=args.straight_line, speed_ratio=args.speed_ratio)
+    print(f"검사: 완료 응답 {checked:,}행 | 플래그 {len(flagged):,}행 ({len(flagged) / max(checked, 1) * 100:.1f}%)")
+    if np.isfinite(settings['median_duration_sec']):
+        print(f"응답 시간(마지막 저장 -> 제출) 중앙값 {settings['median_duration_sec']:.0f}초, "
+              f"과속 기준 {settings['speed_limit_sec']:.0f}초 미만")
+    for name, count in summary(flagged).items():
+        print(f"  {name:16s} {count:>8,}행")
+
+    if args.show and len(flagged):
+        print()
+        for row in flagged.head(args.show).itertuples(index=False):
+            names = [name for name, bit in QUALITY_FLAGS.items() if row.flags & bit]
+            print(f"  rowid {row.raw_rowid:>8} {str(row.corporate_id):12s} {', '.join(names)}")
+    if not args.dry_run:
+        print(f"\n✓ pmik_quality 저장 (분석에서 제외: exclude={ALL_QUALITY_FLAGS} 또는 pmik --clean)")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
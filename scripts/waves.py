@@ -0,0 +1,161 @@
+import re
+from pathlib import Path
+
+import pandas as pd
+
+import connections
+from chunked import SegmentAggregate
+from survey import MULTI_SELECT, SEGMENTS, iter_responses
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# One SQLite file per survey wave: PMIK_2025.db, PMIK_2026.db, ...
+WAVE_PATTERN = re.compile(r'PMIK_(\d{4})\.db$')
+
+# Rows per chunk when aggregating a wave (memory is bounded by the chunk, not the wave)
+CHUNKSIZE = 50_000
+
+
+def _normalize_text(text):
+    """공백/줄바꿈 차이를 무시하도록 문항 텍스트 정규화"""
+    if pd.isna(text):
+        return ''
+    return re.sub(r'\s+', ' ', str(text)).strip()
+
+
+class Wave:
+    """단일 웨이브(연도) 파티션. 연결과 데이터는 처음 접근할 때 로드"""
+
+    def __init__(self, year, path, chunksize=CHUNKSIZE):
+        self.year = year
+        self.path = Path(path)
+        self.chunksize = chunksize
+        self._conn = None
+        self._question_bank = None
+        self._tables = {}
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = connections.connect(self.path, readonly=True)
+        return self._conn
+
+    def respondent_ids(self):
+        """완료 응답자 corporate_id 집합"""
+        rows = self.conn.execute("""
+        SELECT DISTINCT corporate_id FROM pmik_raw_data
+        WHERE completed = 1 AND corporate_id IS NOT NULL
+        """)
+        return {corporate_id for corporate_id, in rows}
+
+    @property
+    def question_bank(self):
+        """문항 은행: item 열 이름 <-> 문항/선택지 텍스트"""
+        if self._question_bank is None:
+            df = pd.read_sql_query("""
+            SELECT "No." as question_id, 문항 as question_text,
+                   "선택(보기)" as option_text, 비고 as option_id
+            FROM pmik_eos
+            """, self.conn)
+            df['question_id'] = pd.to_numeric(df['question_id'], errors='coerce')
+            df = df.dropna(subset=['question_id'])
+            df['question_id'] = df['question_id'].astype(int)
+
+            multi = df['question_id'].isin(list(MULTI_SELECT))
+            likert = df[~multi & (df['question_id'] < min(MULTI_SELECT))].copy()
+            likert['item'] = likert['question_id'].map(lambda q: f'r{q:03d}')
+            likert['key'] = likert['question_text'].map(_normalize_text)
+
+            options = df[multi].copy()
+            option_ids = pd.to_numeric(options['option_id'], errors='coerce').astype(int)
+            options['item'] = [f'q{q}_{o:02d}' for q, o in zip(options['question_id'], option_ids)]
+            options['key'] = (options['question_text'].map(_normalize_text) + ' | '
+                              + options['option_text'].map(_normalize_text))
+
+            columns = ['item', 'question_id', 'key']
+            self._question_bank = pd.concat([likert[columns], options[columns]], ignore_index=True)
+        return self._question_bank
+
+    def segment_items(self, segments=SEGMENTS, respondents=None):
+        """세그먼트 x 문항 집계 (chunksize 행씩 누적 집계, 웨이브 단위로 캐시)"""
+        cache_key = (tuple(segments), None if respondents is None else frozenset(respondents))
+        if cache_key not in self._tables:
+            result = SegmentAggregate(segments)
+            for chunk in iter_responses(self.conn, self.chunksize):
+                if respondents is not None:
+                    chunk = chunk[chunk['corporate_id'].isin(respondents)]
+                result.update(chunk)
+            self._tables[cache_key] = result.segment_item_table()
+        return self._tables[cache_key]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class WaveStore:
+    """연도별 웨이브 파일 모음. 웨이브를 추가해도 기존 웨이브 조회에는 영향 없음"""
+
+    def __init__(self, root=PROJECT_ROOT, chunksize=CHUNKSIZE):
+        self.root = Path(root)
+        self.waves = {}
+        for path in sorted(self.root.glob('PMIK_*.db')):
+            match = WAVE_PATTERN.search(path.name)
+            if match:
+                year = int(match.group(1))
+                self.waves[year] = Wave(year, path, chunksize)
+
+    @property
+    def years(self):
+        return sorted(self.waves)
+
+    def __getitem__(self, year):
+        return self.waves[year]
+
+    def crosswalk(self, base_year, year):
+        """year 웨이브의 item -> base_year 웨이브의 item 매핑 (문항 텍스트 기준)"""
+        base = self[base_year].question_bank[['key', 'item']].drop_duplicates('key')
+        other = self[year].question_bank[['key', 'item']].drop_duplicates('key')
+        merged = other.merge(base, on='key', suffixes=('', '_base'))
+        return dict(zip(merged['item'], merged['item_base']))
+
+    def panel(self, years=None):
+        """모든 웨이브에 응답한 corporate_id 집합"""
+        years = years or self.years
+        ids = None
+        for year in years:
+            wave_ids = self[year].respondent_ids()
+            ids = wave_ids if ids is None else ids & wave_ids
+        return ids or set()
+
+    def trend(self, years=None, segments=SEGMENTS, linked=False):
+        """세그먼트 x 문항별 연도 간 변화량 (직전 웨이브 대비)"""
+        years = years or self.years
+        base_year = years[-1]
+        respondents = self.panel(years) if linked else None
+
+        frames = []
+        for year in years:
+            table = self[year].segment_items(segments, respondents).copy()
+            # Express every wave in the latest wave's item ids; unmatched items drop out
+            mapping = self.crosswalk(base_year, year)
+            table['item'] = table['item'].map(mapping)
+            table = table.dropna(subset=['item'])
+            table.insert(0, 'year', year)
+            frames.append(table)
+
+        df = pd.concat(frames, ignore_index=True)
+        df = df.sort_values(['segment', 'value', 'item', 'year'], kind='stable')
+
+        keys = ['segment', 'value', 'item']
+        previous = df.groupby(keys, sort=False)[['year', 'mean', 'n']].shift()
+        df['prev_year'] = previous['year']
+        df['prev_mean'] = previous['mean']
+        df['prev_n'] = previous['n']
+        df['delta'] = df['mean'] - df['prev_mean']
+        return df.reset_index(drop=True)
+
+    def close(self):
+        for wave in self.waves.values():
+            wave.close()
@@ -0,0 +1,166 @@
+# Raking (iterative proportional fitting) of completed responses to the member
+# population margins, so Q75/Q76 shares and Likert means are not biased by
+# uneven response rates. Respondents are collapsed into their distinct margin
+# cells first: each IPF sweep is one bincount per margin over cells, not rows.
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from queries import quality_filter
+from sql_backend import TENURE_CATEGORY_SQL
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB = PROJECT_ROOT / 'PMIK_2025.db'
+
+# Margin name -> (population expression over pmik_member m, respondent expression over pmik_raw_data r)
+MARGINS = {
+    'biz_unit': ('m."Biz Unit."', 'r.etc1'),
+    'rank': ('m."Job Title"', 'r.rank'),
+    'tenure_category': (TENURE_CATEGORY_SQL, TENURE_CATEGORY_SQL),
+}
+
+
+def population_sql(margin):
+    return f"""
+    SELECT COALESCE({MARGINS[margin][0]}, 'N/A'), COUNT(*)
+    FROM pmik_member m
+    WHERE m."ID(new)" IS NOT NULL
+    GROUP BY 1
+    """
+
+
+def respondents_sql(margins, exclude=0):
+    """완료 응답자 (사람마다 가장 최근 완료 제출 한 건, 중복 제출은 validate.py 의 duplicate_id)
+
+    exclude: 제외할 품질 플래그 비트 (survey.responses_query 와 같은 응답자 집합)
+    """
+    columns = ", ".join(f"COALESCE({MARGINS[margin][1]}, 'N/A')" for margin in margins)
+    return f"""
+    SELECT r.corporate_id, {columns}
+    FROM (
+        SELECT r.*, ROW_NUMBER() OVER (
+            PARTITION BY r.corporate_id ORDER BY r.completed_at DESC, r.rowid DESC
+        ) AS submission
+        FROM pmik_raw_data r
+        WHERE r.completed = 1 {quality_filter(exclude)}
+    ) r
+    LEFT JOIN pmik_member m ON r.corporate_id = m."ID(new)"
+    WHERE r.submission = 1
+    """
+
+
+def rake(codes, targets, tol=1e-6, max_iter=100):
+    """범주 코드(행 x 차원)와 차원별 목표 합계로 IPF -> (행별 가중치, 반복 수, 최대 오차)
+
+    목표 합계는 모든 차원에서 같아야 하며, 오차는 목표 합계 대비 최대 차이 비율
+    """
+    targets = [np.asarray(target, dtype=np.float64) for target in targets]
+    # One integer key per cell (mixed radix), much faster to unique than rows of a 2-D array
+    shape = tuple(len(target) for target in targets)
+    keys, inverse, counts = np.unique(np.ravel_multi_index(np.asarray(codes).T, shape),
+                                      return_inverse=True, return_counts=True)
+    cells = np.column_stack(np.unravel_index(keys, shape))
+    total = targets[0].sum()
+    weighted = counts.astype(np.float64)
+    error = np.inf
+    for iteration in range(1, max_iter + 1):
+        for d, target in enumerate(targets):
+            current = np.bincount(cells[:, d], weights=weighted, minlength=len(target))
+            factor = np.divide(target, current, out=np.ones_like(target), where=current > 0)
+            weighted *= factor[cells[:, d]]
+        # The last margin is exact after its sweep; the others show how far the fit is off
+        error = max(np.abs(np.bincount(cells[:, d], weights=weighted, minlength=len(target)) - target).max()
+                    for d, target in enumerate(targets)) / total
+        if error < tol:
+            break
+    return (weighted / counts)[inverse.reshape(-1)], iteration, error
+
+
+def rake_weights(conn, margins=tuple(MARGINS), tol=1e-6, max_iter=100, exclude=0):
+    """완료 응답자별 가중치 (corporate_id 인덱스(중복 없음), 평균 1)
+
+    구성원 모집단의 margins 분포에 맞춤. 응답자가 없는 모집단 범주는 제외하고 나머지 비율로 맞추며,
+    모집단에 없는 응답자 범주는 가중치를 조정하지 않음. 진단 값은 weights.attrs 에 기록.
+    exclude: 품질 플래그 행 제외 비트 (가중 집계의 exclude 와 같게 지정)
+    """
+    margins = list(margins)
+    frame = pd.DataFrame(conn.execute(respondents_sql(margins, exclude)).fetchall(),
+                         columns=['corporate_id'] + margins)
+    n = len(frame)
+    if n == 0:
+        return pd.Series(dtype='float64', name='weight')
+
+    codes, targets, empty = [], [], {}
+    for margin in margins:
+        population = dict(conn.execute(population_sql(margin)).fetchall())
+        column, categories = pd.factorize(frame[margin])
+        observed = np.bincount(column, minlength=len(categories)).astype(np.float64)
+        matched = np.array([value in population for value in categories])
+        # Unmatched respondent categories keep their own size; the rest share what is left
+        shares = np.array([population.get(value, 0) for value in categories], dtype=np.float64)
+        target = np.where(matched, 0.0, observed)
+        target[matched] = shares[matched] / shares[matched].sum() * (n - target.sum())
+        codes.append(column)
+        targets.append(target)
+        empty[margin] = sorted(set(population) - set(categories))
+
+    weights, iterations, error = rake(np.column_stack(codes), targets, tol, max_iter)
+    weights = pd.Series(weights, index=frame['corporate_id'].to_numpy(), name='weight')
+    weights.attrs.update(
+        margins=margins,
+        iterations=iterations,
+        error=float(error),
+        converged=bool(error < tol),
+        effective_n=float(weights.sum() ** 2 / (weights ** 2).sum()),
+        empty_categories={margin: values for margin, values in empty.items() if values},
+    )
+    return weights
+
+
+def margin_table(conn, weights, margin, exclude=0):
+    """범주별 모집단/응답/가중 비율 비교표"""
+    population = pd.Series(dict(conn.execute(population_sql(margin)).fetchall()), dtype='float64')
+    frame = pd.DataFrame(conn.execute(respondents_sql([margin], exclude)).fetchall(), columns=['corporate_id', 'value'])
+    frame['weight'] = frame['corporate_id'].map(weights)
+    table = pd.DataFrame({
+        'population': population / population.sum() * 100,
+        'respondents': frame['value'].value_counts(normalize=True) * 100,
+        'weighted': frame.groupby('value')['weight'].sum() / frame['weight'].sum() * 100,
+    })
+    return table.fillna(0).sort_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='응답자 가중치 (구성원 분포 기준 레이킹)')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite DB 경로')
+    parser.add_argument('--margins', nargs='+', choices=list(MARGINS), default=list(MARGINS))
+    parser.add_argument('--out', default=None, help='가중치 CSV 저장 경로 (corporate_id, weight)')
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    weights = rake_weights(conn, args.margins)
+    info = weights.attrs
+    print(f"응답자 {len(weights):,}명 | 반복 {info['iterations']}회 | 최대 오차 {info['error']:.2e} | "
+          f"유효 표본 {info['effective_n']:,.1f}명")
+    print(f"가중치 범위: {weights.min():.3f} ~ {weights.max():.3f}")
+    for margin, values in info['empty_categories'].items():
+        print(f"  ! {margin}: 응답자 없는 범주 제외 ({', '.join(map(str, values))})")
+
+    for margin in args.margins:
+        print(f"\n[{margin}] 비율(%)  모집단 / 응답 / 가중")
+        for value, row in margin_table(conn, weights, margin).iterrows():
+            print(f"  {str(value):15s} {row['population']:6.1f} {row['respondents']:6.1f} {row['weighted']:6.1f}")
+    conn.close()
+
+    if args.out:
+        weights.rename_axis('corporate_id').to_csv(args.out)
+        print(f"\n✓ 저장: {args.out}")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,16 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+
+
+@pytest.fixture
+def pilot_db(tmp_path):
+    """PMIK_2025.db 복사본 경로 (원본은 건드리지 않음)"""
+    path = tmp_path / 'pilot.db'
+    shutil.copy(PROJECT_ROOT / 'PMIK_2025.db', path)
+    return path
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import async_queries
+from async_queries import QueryRunner
+
+SLOW_SQL = """
+WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+SELECT COUNT(*) AS total FROM n
+"""
+
+
+def test_cancel_running_query_leaves_the_next_one_alone(pilot_db):
+    async def scenario(runner):
+        slow = asyncio.ensure_future(runner.fetch(SLOW_SQL, (10 ** 9,)))
+        await asyncio.sleep(0.2)
+        started = time.perf_counter()
+        slow.cancel()
+        # Same worker thread and pooled connection as the cancelled statement
+        rows = await runner.fetch(SLOW_SQL, (1000,))
+        return rows[0]['total'], time.perf_counter() - started
+
+    with QueryRunner(pilot_db, workers=1) as runner:
+        total, elapsed = asyncio.run(scenario(runner))
+    assert total == 1000
+    assert elapsed < 5
+
+
+def test_cancel_after_finish_does_not_interrupt_another_caller(pilot_db):
+    async def scenario(runner):
+        done = asyncio.ensure_future(runner.fetch(SLOW_SQL, (10,)))
+        await asyncio.sleep(0)
+        time.sleep(0.2)  # its statement finishes; the await has not resumed yet
+        other = asyncio.ensure_future(runner.fetch(SLOW_SQL, (2_000_000,)))
+        await asyncio.sleep(0)
+        time.sleep(0.05)  # the other caller's statement is now running on the same connection
+        done.cancel()
+        return (await other)[0]['total']
+
+    with QueryRunner(pilot_db, workers=1) as runner:
+        assert asyncio.run(scenario(runner)) == 2_000_000
+
+
+def test_cancel_queued_query_does_not_interrupt_the_running_one(pilot_db):
+    async def scenario(runner):
+        running = asyncio.ensure_future(runner.fetch(SLOW_SQL, (300_000,)))
+        queued = asyncio.ensure_future(runner.fetch(SLOW_SQL, (10 ** 9,)))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        return (await running)[0]['total']
+
+    with QueryRunner(pilot_db, workers=1) as runner:
+        started = time.perf_counter()
+        assert asyncio.run(scenario(runner)) == 300_000
+    # The queued statement was skipped, not run to completion
+    assert time.perf_counter() - started < 5
+
+
+def test_run_queries_matches_sequential(pilot_db):
+    queries = async_queries.question_queries(76)
+    concurrent = async_queries.run_queries(queries, pilot_db, workers=2)
+    sequential = async_queries.run_sequential(pilot_db, queries)
+    assert {name: [tuple(row) for row in rows] for name, rows in concurrent.items()} == \
+        {name: [tuple(row) for row in rows] for name, rows in sequential.items()}
@@ -0,0 +1,56 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import incremental
+
+
+def _execute(path, *statements):
+    conn = sqlite3.connect(path)
+    for statement in statements:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+def _assert_matches_rebuild(report, path, tmp_path):
+    fresh, _ = incremental.refresh(str(path), str(tmp_path / 'fresh.pkl'), rebuild=True)
+    pd.testing.assert_frame_equal(report.responses.segment_item_table(), fresh.responses.segment_item_table())
+    for level in ('biz_unit', 'team'):
+        pd.testing.assert_frame_equal(report.completion.table(level), fresh.completion.table(level))
+
+
+NULL_IDS = ('UPDATE pmik_raw_data SET corporate_id = NULL '
+            'WHERE rowid IN (SELECT rowid FROM pmik_raw_data WHERE completed = 1 ORDER BY rowid LIMIT {n})')
+
+
+@pytest.mark.parametrize('track', [False, True])
+def test_refresh_twice_over_null_ids(pilot_db, tmp_path, track):
+    _execute(pilot_db, NULL_IDS.format(n=2))
+    state = str(tmp_path / 'state.pkl')
+    incremental.refresh(str(pilot_db), state, track)
+    report, stats = incremental.refresh(str(pilot_db), state)
+    assert stats['added'] == stats['removed'] == 0
+
+    # Change a NULL-id row and null one more id, then refresh from the saved state
+    _execute(pilot_db, 'UPDATE pmik_raw_data SET r001 = 1 WHERE corporate_id IS NULL', NULL_IDS.format(n=3))
+    report, stats = incremental.refresh(str(pilot_db), state)
+    assert stats['mode'] == ('log' if track else 'scan')
+    _assert_matches_rebuild(report, pilot_db, tmp_path)
+
+
+def test_refresh_over_duplicate_ids(pilot_db, tmp_path):
+    conn = sqlite3.connect(pilot_db)
+    columns = ', '.join(f'"{row[1]}"' for row in conn.execute('PRAGMA table_info(pmik_raw_data)'))
+    conn.close()
+    duplicate = f'INSERT INTO pmik_raw_data ({columns}) SELECT {columns} FROM pmik_raw_data WHERE rowid = 1'
+    _execute(pilot_db, duplicate)
+    state = str(tmp_path / 'state.pkl')
+    incremental.refresh(str(pilot_db), state)
+
+    _execute(pilot_db, duplicate, ('UPDATE pmik_raw_data SET r002 = 5 WHERE rowid = '
+             '(SELECT MIN(rowid) FROM pmik_raw_data WHERE completed = 1 AND r002 != 5)'))
+    report, stats = incremental.refresh(str(pilot_db), state)
+    assert stats['added'] and stats['removed']
+    _assert_matches_rebuild(report, pilot_db, tmp_path)
@@ -0,0 +1,23 @@
+import hashlib
+
+import pytest
+
+import pmik
+
+COMMANDS = [['schema'], ['completion'], ['q76'], ['q76', '--by', 'rank', '--weighted'], ['drill', '--rank', 'B2'],
+            ['xtab', 'q76', '--where', 'rank=B2'], ['tree', '--depth', '1']]
+
+
+@pytest.mark.parametrize('command', COMMANDS)
+def test_missing_db_is_an_error_not_an_empty_db(tmp_path, capsys, command):
+    path = tmp_path / 'typo.db'
+    assert pmik.main(['--db', str(path)] + command) == 1
+    assert not path.exists()
+    assert 'DB 파일이 없습니다' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('command', COMMANDS)
+def test_read_commands_leave_the_db_unchanged(pilot_db, command):
+    before = hashlib.md5(pilot_db.read_bytes()).hexdigest()
+    assert pmik.main(['--db', str(pilot_db)] + command) == 0
+    assert hashlib.md5(pilot_db.read_bytes()).hexdigest() == before
@@ -0,0 +1,52 @@
+import itertools
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from respondent_index import ATTRIBUTES, RespondentIndex
+
+
+@pytest.fixture
+def index(pilot_db):
+    conn = sqlite3.connect(pilot_db)
+    yield RespondentIndex.build(conn)
+    conn.close()
+
+
+@pytest.fixture
+def roster(index):
+    return pd.DataFrame({'id': index.ids, **{name: index.columns[name] for name in ATTRIBUTES}})
+
+
+def test_single_value_filters_match_masks(index, roster):
+    for attribute in ATTRIBUTES:
+        for value in index.values(attribute):
+            assert index.select(**{attribute: value}) == roster.loc[roster[attribute] == value, 'id'].tolist()
+
+
+def test_multi_filters_match_masks(index, roster):
+    ranks = index.values('rank')
+    statuses = [['미완료', '미응답'], ['완료']]
+    for biz_unit, rank_pair, status in itertools.product(index.values('biz_unit'), zip(ranks, ranks[1:]), statuses):
+        mask = (roster['biz_unit'] == biz_unit) & roster['rank'].isin(rank_pair) & roster['status'].isin(status)
+        positions = index.positions(biz_unit=biz_unit, rank=list(rank_pair), status=status)
+        np.testing.assert_array_equal(positions, np.flatnonzero(mask))
+
+
+def test_counts_by_matches_value_counts(index, roster):
+    positions = index.positions(status=['미완료', '미응답'])
+    expected = roster.iloc[positions]['rank'].value_counts().to_dict()
+    assert index.counts_by('rank', positions) == expected
+
+
+def test_from_frame_matches_masks():
+    df = pd.DataFrame({'tenure_category': ['1-3년', 'N/A', '1-3년', '10년 이상', '1-3년'],
+                       'response_status': ['완료', '미응답', '미완료', '완료', '미응답']},
+                      index=[10, 11, 12, 13, 14])
+    index = RespondentIndex.from_frame(df, ['tenure_category', 'response_status'])
+    mask = (df['tenure_category'] == '1-3년') & df['response_status'].isin(['미완료', '미응답'])
+    positions = index.positions(tenure_category='1-3년', response_status=['미완료', '미응답'])
+    pd.testing.assert_frame_equal(df.iloc[positions], df[mask])
+    assert index.count(tenure_category='5-10년') == 0
@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+import report
+import sql_backend
+import survey
+
+# Whitespace variants the scripts' LIKE join (report.option_frequency) also splits
+SPACING = ['4  11 10', ' 3 8 9 ', '1 2  5', '6 x 12']
+# Tokens only the pandas path (survey.option_indicators) reads as options: leading zeros, tabs
+PADDED = ['04 11 10', '4\t6 10', '09 05 11']
+
+
+def _malformed(path, answers):
+    """완료 응답 몇 건의 Q75/Q76 를 주어진 문자열로 바꾼 연결"""
+    conn = sqlite3.connect(path)
+    rowids = [row[0] for row in conn.execute(
+        'SELECT rowid FROM pmik_raw_data WHERE completed = 1 ORDER BY rowid LIMIT ?', (2 * len(answers),))]
+    for rowid, answer in zip(rowids, answers + answers):
+        conn.execute('UPDATE pmik_raw_data SET r075 = ?, r076 = ? WHERE rowid = ?', (answer, answer, rowid))
+    conn.commit()
+    return conn
+
+
+def _frequency(rows):
+    return sorted((str(row['option_number']), int(row['selection_count']), float(row['percentage'])) for row in rows)
+
+
+@pytest.mark.parametrize('question', [75, 76])
+def test_option_frequency_matches_report_on_malformed_spacing(pilot_db, question):
+    conn = _malformed(pilot_db, SPACING)
+    expected = report.option_frequency(conn, question).to_dict('records')
+    assert _frequency(sql_backend.option_frequency(conn, question)) == _frequency(expected)
+
+
+@pytest.mark.parametrize('question', [75, 76])
+@pytest.mark.parametrize('segment', ['biz_unit', 'rank', 'tenure_category'])
+def test_segment_top_n_matches_pandas_on_malformed_answers(pilot_db, question, segment):
+    conn = _malformed(pilot_db, SPACING + PADDED)
+    expected = report.segment_top_n(survey.load_responses(conn), question, segment, n=12)
+    rows = sql_backend.segment_top_n(conn, question, segment, 12)
+    assert [(row['value'], row['rank'], row['option_number'], row['count'], row['respondents']) for row in rows] == \
+        list(expected[['value', 'rank', 'option_number', 'count', 'respondents']].itertuples(index=False, name=None))
+
+
+@pytest.mark.parametrize('answer, options', [
+    ('4  11', [4, 11]), ('04 11', [4, 11]), ('4\t6', [4, 6]), (' 9 ', [9]), ('4x 9', [9]), ('4"5 7', [7]), ('', []),
+])
+def test_json_options_splits_like_option_indicators(answer, options):
+    sql = (f'SELECT {sql_backend.option_value()} FROM {sql_backend.json_options(":answer")} j '
+           f'WHERE {sql_backend.option_value()} IS NOT NULL')
+    assert [row[0] for row in sqlite3.connect(':memory:').execute(sql, {'answer': answer})] == options
@@ -0,0 +1,39 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from survey import load_responses, segment_item_table
+from waves import WaveStore
+
+
+@pytest.fixture
+def store(pilot_db, tmp_path):
+    """같은 파일럿 DB 를 두 웨이브로 둔 WaveStore (작은 청크로 누적 집계)"""
+    root = tmp_path / 'waves'
+    root.mkdir()
+    for year in (2025, 2026):
+        shutil.copy(pilot_db, root / f'PMIK_{year}.db')
+    store = WaveStore(root, chunksize=7)
+    yield store
+    store.close()
+
+
+def test_segment_items_match_in_memory_table(store):
+    wave = store[2025]
+    df = load_responses(wave.conn)
+    pd.testing.assert_frame_equal(wave.segment_items(), segment_item_table(df))
+
+
+def test_segment_items_for_panel_respondents(store):
+    wave = store[2025]
+    df = load_responses(wave.conn)
+    # Every other respondent, so each 7-row chunk is filtered before it is folded in
+    respondents = set(df['corporate_id'].dropna().sort_values().iloc[::2])
+    expected = segment_item_table(df[df['corporate_id'].isin(respondents)])
+    pd.testing.assert_frame_equal(wave.segment_items(respondents=respondents), expected)
+
+
+def test_panel_reads_completed_ids(store):
+    df = load_responses(store[2025].conn)
+    assert store.panel() == set(df['corporate_id'].dropna())
@@ -0,0 +1,50 @@
+import sqlite3
+
+import pytest
+
+import report
+import sql_backend
+import survey
+import weighting
+from queries import ALL_QUALITY_FLAGS
+
+
+@pytest.fixture
+def duplicated_db(pilot_db):
+    """PMIK_2025.db 복사본 + 같은 사람의 완료 응답 한 건 중복 (validate.py 의 duplicate_id)"""
+    conn = sqlite3.connect(pilot_db)
+    columns = ', '.join(f'"{row[1]}"' for row in conn.execute('PRAGMA table_info(pmik_raw_data)'))
+    conn.execute(f'INSERT INTO pmik_raw_data ({columns}) SELECT {columns} FROM pmik_raw_data WHERE rowid = 1')
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_rake_weights_one_weight_per_respondent(duplicated_db):
+    weights = weighting.rake_weights(duplicated_db)
+    distinct, = duplicated_db.execute(
+        'SELECT COUNT(DISTINCT corporate_id) FROM pmik_raw_data WHERE completed = 1').fetchone()
+    assert weights.index.is_unique
+    assert len(weights) == distinct
+    assert weights.mean() == pytest.approx(1.0)
+
+
+def test_weighted_reports_with_duplicate_submission(duplicated_db):
+    weights = weighting.rake_weights(duplicated_db)
+    assert list(sql_backend.option_frequency(duplicated_db, 76, weights))
+    assert list(sql_backend.segment_top_n(duplicated_db, 76, 'rank', 3, weights))
+    df = survey.load_responses(duplicated_db)
+    assert not survey.segment_item_table(df, weights=weights).empty
+    assert not report.segment_top_n(df, 76, 'rank', weights=weights).empty
+    assert not weighting.margin_table(duplicated_db, weights, 'rank').empty
+
+
+def test_rake_weights_over_cleaned_respondents(duplicated_db):
+    duplicated_db.execute('CREATE TABLE pmik_quality (raw_rowid INTEGER PRIMARY KEY, flags INTEGER)')
+    duplicated_db.execute('INSERT INTO pmik_quality SELECT rowid, 1 FROM pmik_raw_data WHERE completed = 1 AND rowid > 1 LIMIT 5')
+    flagged = {row[0] for row in duplicated_db.execute(
+        'SELECT corporate_id FROM pmik_raw_data r JOIN pmik_quality q ON r.rowid = q.raw_rowid')}
+    weights = weighting.rake_weights(duplicated_db, exclude=ALL_QUALITY_FLAGS)
+    assert flagged.isdisjoint(weights.index)
+    assert weights.mean() == pytest.approx(1.0)
+    assert not weighting.margin_table(duplicated_db, weights, 'rank', ALL_QUALITY_FLAGS).empty